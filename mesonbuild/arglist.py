@@ -100,12 +100,25 @@ class CompilerArgs(T.MutableSequence[str]):
         self._container: T.List[str] = list(iterable) if iterable is not None else []
         self.pre: T.Deque[str] = collections.deque()
         self.post: T.Deque[str] = collections.deque()
+        # Indexes of the args in _container, and in pre and post, so that
+        # checking whether an arg is already present does not need a linear
+        # scan. The index of _container is built lazily, and dropped whenever
+        # _container is modified.
+        self._container_index: T.Optional[T.Set[str]] = None
+        self._pre_post_index: T.Set[str] = set()
+
+    def _contains(self, arg: str) -> bool:
+        if self._container_index is None:
+            self._container_index = set(self._container)
+        return arg in self._container_index or arg in self._pre_post_index
 
     # Flush the saved pre and post list into the _container list
     #
     # This correctly deduplicates the entries after _can_dedup definition
     # Note: This function is designed to work without delete operations, as deletions are worsening the performance a lot.
     def flush_pre_post(self) -> None:
+        if not self.pre and not self.post:
+            return
         new: T.List[str] = []
         pre_flush_set: T.Set[str] = set()
         post_flush: T.Deque[str] = collections.deque()
@@ -136,6 +149,8 @@ class CompilerArgs(T.MutableSequence[str]):
         new.extend(post_flush)
 
         self._container = new
+        self._container_index = None
+        self._pre_post_index.clear()
         self.pre.clear()
         self.post.clear()
 
@@ -166,10 +181,12 @@ class CompilerArgs(T.MutableSequence[str]):
     def __setitem__(self, index: T.Union[int, slice], value: T.Union[str, T.Iterable[str]]) -> None:  # noqa: F811
         self.flush_pre_post()
         self._container[index] = value  # type: ignore  # TODO: fix 'Invalid index type' and 'Incompatible types in assignment' errors
+        self._container_index = None
 
     def __delitem__(self, index: T.Union[int, slice]) -> None:
         self.flush_pre_post()
         del self._container[index]
+        self._container_index = None
 
     def __len__(self) -> int:
         return len(self._container) + len(self.pre) + len(self.post)
@@ -177,6 +194,8 @@ class CompilerArgs(T.MutableSequence[str]):
     def insert(self, index: int, value: str) -> None:
         self.flush_pre_post()
         self._container.insert(index, value)
+        if self._container_index is not None:
+            self._container_index.add(value)
 
     def copy(self) -> 'CompilerArgs':
         self.flush_pre_post()
@@ -242,6 +261,8 @@ class CompilerArgs(T.MutableSequence[str]):
             self.append(arg)
         else:
             self._container.append(arg)
+            if self._container_index is not None:
+                self._container_index.add(arg)
 
     def extend_direct(self, iterable: T.Iterable[str]) -> None:
         '''
@@ -285,13 +306,15 @@ class CompilerArgs(T.MutableSequence[str]):
             dedup = self._can_dedup(arg)
             if dedup is Dedup.UNIQUE:
                 # Argument already exists and adding a new instance is useless
-                if arg in self._container or arg in self.pre or arg in self.post:
+                if self._contains(arg):
                     continue
             if self._should_prepend(arg):
                 tmp_pre.appendleft(arg)
             else:
                 self.post.append(arg)
+                self._pre_post_index.add(arg)
         self.pre.extendleft(tmp_pre)
+        self._pre_post_index.update(tmp_pre)
         #pre and post is going to be merged later before a iter call
         return self
 
@@ -4,7 +4,7 @@
 from __future__ import annotations
 
 from collections import OrderedDict
-from dataclasses import dataclass, InitVar
+from dataclasses import dataclass, field, InitVar
 from functools import lru_cache
 from itertools import chain
 from pathlib import Path
@@ -24,6 +24,7 @@ from .. import dependencies
 from .. import programs
 from .. import mesonlib
 from .. import mlog
+from .. import mparser
 from ..compilers import LANGUAGES_USING_LDFLAGS, detect
 from ..mesonlib import (
     File, MachineChoice, MesonException, OrderedSet,
@@ -62,6 +63,36 @@ class RegenInfo:
     source_dir: str
     build_dir: str
     depfiles: T.List[str]
+    # Digests of the build definition files in depfiles, only recorded when
+    # the regen_skip_unchanged option is enabled
+    digests: T.Dict[str, str] = field(default_factory=dict)
+
+BUILD_DEFINITION_FILES = frozenset({'meson.build', 'meson.options', 'meson_options.txt'})
+
+def get_regen_digest(fname: str) -> T.Optional[str]:
+    """Compute a digest of a build definition file that ignores formatting.
+
+    The file is tokenized and comments, whitespace and blank lines are left
+    out, so that touching a file or only editing its comments does not change
+    the digest. Returns None if the file can not be read or tokenized.
+    """
+    try:
+        with open(fname, encoding='utf-8') as f:
+            code = f.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+    h = hashlib.sha256()
+    prev = 'eol'
+    try:
+        with mlog.no_logging():
+            for tok in mparser.Lexer(code).lex(fname):
+                if tok.tid in {'whitespace', 'comment'} or (tok.tid == 'eol' and prev == 'eol'):
+                    continue
+                prev = tok.tid
+                h.update(f'{tok.tid}\0{tok.value!r}\0'.encode('utf-8'))
+    except MesonException:
+        return None
+    return h.hexdigest()
 
 class TestProtocol(enum.Enum):
 
@@ -206,6 +237,8 @@ class TestSerialisation:
     depends: T.List[str]
     version: str
     verbose: bool
+    cpus: int
+    memory: int
 
     def __post_init__(self) -> None:
         if self.exe_wrapper is not None:
@@ -1281,7 +1314,7 @@ class Backend:
                                    isinstance(exe, build.Executable),
                                    [x.get_id() for x in depends],
                                    self.environment.coredata.version,
-                                   t.verbose)
+                                   t.verbose, t.cpus, t.memory)
             arr.append(ts)
         return arr
 
@@ -1352,6 +1385,12 @@ class Backend:
         regeninfo = RegenInfo(self.environment.get_source_dir(),
                               self.environment.get_build_dir(),
                               deps)
+        if self.environment.coredata.get_option(OptionKey('regen_skip_unchanged')):
+            for dep in deps:
+                if os.path.basename(dep) in BUILD_DEFINITION_FILES:
+                    digest = get_regen_digest(os.path.join(self.environment.get_build_dir(), dep))
+                    if digest is not None:
+                        regeninfo.digests[dep] = digest
         filename = os.path.join(self.environment.get_scratch_dir(),
                                 'regeninfo.dump')
         with open(filename, 'wb') as f:
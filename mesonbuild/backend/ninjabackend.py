@@ -10,12 +10,14 @@ from enum import Enum, unique
 from functools import lru_cache
 from pathlib import PurePath, Path
 from textwrap import dedent
+import io
 import itertools
 import json
 import os
 import pickle
 import re
 import subprocess
+import sys
 import typing as T
 
 from . import backends
@@ -115,6 +117,11 @@ rsp_threshold = get_rsp_threshold()
 # from, etc.), so it must not be shell quoted.
 raw_names = {'DEPFILE_UNQUOTED', 'DESC', 'pool', 'description', 'targetdep', 'dyndep'}
 
+def quote_item(i: str, qf: T.Callable[[str], str]) -> str:
+    if i == '&&': # Hackety hack hack
+        return ninja_quote(i)
+    return ninja_quote(qf(i))
+
 NINJA_QUOTE_BUILD_PAT = re.compile(r"[$ :\n]")
 NINJA_QUOTE_VAR_PAT = re.compile(r"[$ \n]")
 
@@ -161,6 +168,9 @@ class Quoting(Enum):
     none = 3
 
 class NinjaCommandArg:
+
+    __slots__ = ('s', 'quoting')
+
     def __init__(self, s: str, quoting: Quoting = Quoting.both) -> None:
         self.s = s
         self.quoting = quoting
@@ -172,6 +182,16 @@ class NinjaCommandArg:
     def list(l: T.List[str], q: Quoting) -> T.List[NinjaCommandArg]:
         return [NinjaCommandArg(i, q) for i in l]
 
+@dataclass
+class NinjaVariable:
+    name: str
+    value: T.Tuple[str, ...]
+
+    def write(self, outfile: T.TextIO) -> None:
+        outfile.write(f'{self.name} = ')
+        outfile.write(' '.join(quote_item(i, quote_func) for i in self.value))
+        outfile.write('\n\n')
+
 @dataclass
 class NinjaComment:
     comment: str
@@ -303,7 +323,20 @@ class NinjaRule:
         # determine command length
         return estimate
 
+# Build elements are not shared between targets, but all the sources of a
+# target usually have the same compiler arguments. Keep a single copy of them.
+SHARED_ITEM_NAMES = frozenset({'ARGS', 'LINK_ARGS'})
+
+@lru_cache(maxsize=4096)
+def _share_item(elems: T.Tuple[str, ...]) -> T.Tuple[str, ...]:
+    return elems
+
 class NinjaBuildElement:
+
+    # There is one of these per source file, keep them small
+    __slots__ = ('implicit_outfilenames', 'outfilenames', 'rulename', 'infilenames',
+                 'deps', 'orderdeps', 'elems', 'item_vars', 'all_outputs', 'output_errors', 'rule')
+
     def __init__(self, all_outputs: T.Set[str], outfilenames, rulename, infilenames, implicit_outs=None):
         self.implicit_outfilenames = implicit_outs or []
         if isinstance(outfilenames, str):
@@ -311,7 +344,7 @@ class NinjaBuildElement:
         else:
             self.outfilenames = outfilenames
         assert isinstance(rulename, str)
-        self.rulename = rulename
+        self.rulename = sys.intern(rulename)
         if isinstance(infilenames, str):
             self.infilenames = [infilenames]
         else:
@@ -319,6 +352,8 @@ class NinjaBuildElement:
         self.deps = OrderedSet()
         self.orderdeps = OrderedSet()
         self.elems = []
+        # Items whose value starts with the value of a variable
+        self.item_vars: T.Optional[T.Dict[str, NinjaVariable]] = None
         self.all_outputs = all_outputs
         self.output_errors = ''
 
@@ -341,11 +376,24 @@ class NinjaBuildElement:
             elems = elems.to_native()
         if isinstance(elems, str):
             elems = [elems]
+        elif name in SHARED_ITEM_NAMES:
+            elems = _share_item(tuple(elems))
         self.elems.append((name, elems))
 
         if name == 'DEPFILE':
             self.elems.append((name + '_UNQUOTED', elems))
 
+    def use_variable(self, name: str, var: NinjaVariable) -> None:
+        '''Refer to var instead of repeating its value in item name, if the
+        value of the item starts with it.'''
+        for n, elems in self.elems:
+            if n == name:
+                if tuple(elems[:len(var.value)]) == var.value:
+                    if self.item_vars is None:
+                        self.item_vars = {}
+                    self.item_vars[name] = var
+                return
+
     def _should_use_rspfile(self):
         # 'phony' is a rule built-in to ninja
         if self.rulename == 'phony':
@@ -417,11 +465,17 @@ class NinjaBuildElement:
             should_quote = name not in raw_names
             line = f' {name} = '
             newelems = []
+            # Variables are always quoted for the command line, not for
+            # response files
+            var = self.item_vars.get(name) if self.item_vars and not use_rspfile else None
+            if var is not None:
+                newelems.append('$' + var.name)
+                elems = elems[len(var.value):]
             for i in elems:
-                if not should_quote or i == '&&': # Hackety hack hack
+                if not should_quote:
                     newelems.append(ninja_quote(i))
                 else:
-                    newelems.append(ninja_quote(qf(i)))
+                    newelems.append(quote_item(i, qf))
             line += ' '.join(newelems)
             line += '\n'
             outfile.write(line)
@@ -496,6 +550,16 @@ class NinjaBackend(backends.Backend):
         self.rust_crates: T.Dict[str, RustCrate] = {}
         self.implicit_meson_outs = []
         self._uses_dyndeps = False
+        # Build elements of targets, per subdir, when writing them to
+        # subninja files. The subdir of the target being generated is
+        # current_shard.
+        self.shard_elements: T.Optional[T.Dict[str, T.List[NinjaBuildElement]]] = None
+        self.shard_contents: T.Dict[str, io.StringIO] = {}
+        self.current_shard: T.Optional[str] = None
+        # Variables holding the compiler arguments shared by all the sources
+        # of a target
+        self.target_compile_args: T.Dict[T.Tuple[str, str], NinjaVariable] = {}
+        self.ninja_variable_names: T.Set[str] = set()
         # nvcc chokes on thin archives:
         #   nvlink fatal   : Could not open input file 'libfoo.a.p'
         #   nvlink fatal   : elfLink internal error
@@ -634,6 +698,9 @@ class NinjaBackend(backends.Backend):
             self.generate_rules()
 
             self.build_elements = []
+            key = OptionKey('backend_subninja')
+            if key in self.environment.coredata.options and self.environment.coredata.options[key].value:
+                self.shard_elements = {}
             self.generate_phony()
             self.add_build_comment(NinjaComment('Build rules for targets'))
 
@@ -646,6 +713,7 @@ class NinjaBackend(backends.Backend):
 
             for t in ProgressBar(self.build.get_targets().values(), desc='Generating targets'):
                 self.generate_target(t)
+                self.flush_shards()
             mlog.log_timestamp("Targets generated")
             self.add_build_comment(NinjaComment('Test rules'))
             self.generate_tests()
@@ -675,6 +743,7 @@ class NinjaBackend(backends.Backend):
 
             self.write_rules(outfile)
             self.write_builds(outfile)
+            self.write_shards(outfile)
 
             default = 'default all\n\n'
             outfile.write(default)
@@ -864,6 +933,14 @@ class NinjaBackend(backends.Backend):
             tgt[lnk_hash] = lnk_block
 
     def generate_target(self, target):
+        prev_shard = self.current_shard
+        self.current_shard = target.get_subdir()
+        try:
+            self._generate_target(target)
+        finally:
+            self.current_shard = prev_shard
+
+    def _generate_target(self, target):
         try:
             if isinstance(target, build.BuildTarget):
                 os.makedirs(self.get_target_private_dir_abs(target))
@@ -1365,6 +1442,14 @@ class NinjaBackend(backends.Backend):
                                 c, [],
                                 'Regenerating build files.',
                                 extra='generator = 1'))
+        if self.environment.coredata.get_option(OptionKey('regen_skip_unchanged')):
+            # Compare the digests of the build definition files first, and
+            # only regenerate if they actually changed.
+            c = self.environment.get_build_command() + ['--internal', 'regencheck', 'meson-private']
+            self.add_rule(NinjaRule('REGENERATE_BUILD_IF_CHANGED',
+                                    c, [],
+                                    'Checking whether build files need to be regenerated.',
+                                    extra='generator = 1'))
 
     def add_rule_comment(self, comment: NinjaComment) -> None:
         self.rules.append(comment)
@@ -1378,9 +1463,18 @@ class NinjaBackend(backends.Backend):
         self.rules.append(rule)
         self.ruledict[rule.name] = rule
 
+    def _add_element(self, element: T.Union[NinjaBuildElement, NinjaVariable]) -> None:
+        if self.shard_elements is not None and self.current_shard is not None:
+            self.shard_elements.setdefault(self.current_shard, []).append(element)
+        else:
+            self.build_elements.append(element)
+
+    def add_variable(self, var: NinjaVariable) -> None:
+        self._add_element(var)
+
     def add_build(self, build: NinjaBuildElement) -> None:
         build.check_outputs()
-        self.build_elements.append(build)
+        self._add_element(build)
 
         if build.rulename != 'phony':
             # reference rule
@@ -1402,6 +1496,68 @@ class NinjaBackend(backends.Backend):
             b.write(outfile)
         mlog.log_timestamp("build.ninja generated")
 
+    @staticmethod
+    def get_shard_filename(subdir: str) -> str:
+        return os.path.join('meson-private', 'ninja', subdir, 'build.ninja')
+
+    def flush_shards(self) -> None:
+        '''Convert the build elements of the targets generated so far to text.
+
+        This is done after each target, so that we don't have to keep all
+        build elements of the project in memory at the same time.
+        '''
+        if not self.shard_elements:
+            return
+        for subdir, elements in self.shard_elements.items():
+            content = self.shard_contents.get(subdir)
+            if content is None:
+                content = self.shard_contents[subdir] = io.StringIO()
+            for b in elements:
+                if isinstance(b, NinjaBuildElement):
+                    b.count_rule_references()
+                b.write(content)
+        self.shard_elements.clear()
+
+    def write_shards(self, outfile: T.TextIO) -> None:
+        '''Write the subninja files, and include them from build.ninja.
+
+        Files whose content did not change are not rewritten, and files of
+        subdirs that no longer have any targets are removed.
+        '''
+        build_dir = self.environment.get_build_dir()
+        shard_dir = os.path.join(build_dir, 'meson-private', 'ninja')
+        if self.shard_elements is None:
+            if os.path.exists(shard_dir):
+                mesonlib.windows_proof_rmtree(shard_dir)
+            return
+        self.flush_shards()
+        shard_files: T.Set[str] = set()
+        for subdir, content in sorted(self.shard_contents.items()):
+            fname = self.get_shard_filename(subdir)
+            outfile.write(f'subninja {ninja_quote(fname.replace(os.sep, "/"), True)}\n')
+            abs_fname = os.path.join(build_dir, fname)
+            shard_files.add(os.path.normpath(abs_fname))
+            new_content = content.getvalue()
+            try:
+                with open(abs_fname, encoding='utf-8') as f:
+                    if f.read() == new_content:
+                        continue
+            except FileNotFoundError:
+                pass
+            os.makedirs(os.path.dirname(abs_fname), exist_ok=True)
+            tempfilename = abs_fname + '~'
+            with open(tempfilename, 'w', encoding='utf-8') as f:
+                f.write(new_content)
+            os.replace(tempfilename, abs_fname)
+        outfile.write('\n')
+        for root, _, files in os.walk(shard_dir):
+            for f in files:
+                fname = os.path.normpath(os.path.join(root, f))
+                if fname not in shard_files:
+                    os.unlink(fname)
+        self.shard_contents.clear()
+        mlog.log_timestamp("subninja files generated")
+
     def generate_phony(self) -> None:
         self.add_build_comment(NinjaComment('Phony build target, always out of date'))
         elem = NinjaBuildElement(self.all_outputs, 'PHONY', 'phony', '')
@@ -2973,6 +3129,7 @@ https://gcc.gnu.org/bugzilla/show_bug.cgi?id=47485'''))
             commands += self.get_pch_include_args(compiler, target)
 
         commands = commands.compiler.compiler_args(commands)
+        shared_args = self.get_target_compile_args_variable(target, compiler, commands)
 
         # Create introspection information
         if is_generated is False:
@@ -3081,6 +3238,8 @@ https://gcc.gnu.org/bugzilla/show_bug.cgi?id=47485'''))
                 return result
             element.add_item('CUDA_ESCAPED_TARGET', quote_make_target(rel_obj))
         element.add_item('ARGS', commands)
+        if shared_args is not None:
+            element.use_variable('ARGS', shared_args)
 
         self.add_dependency_scanner_entries_to_element(target, compiler, element, src)
         self.add_build(element)
@@ -3088,6 +3247,24 @@ https://gcc.gnu.org/bugzilla/show_bug.cgi?id=47485'''))
         assert isinstance(rel_src, str)
         return (rel_obj, rel_src.replace('\\', '/'))
 
+    def get_target_compile_args_variable(self, target: build.BuildTarget, compiler: Compiler,
+                                         commands: CompilerArgs) -> T.Optional[NinjaVariable]:
+        '''Get the variable holding the compiler arguments common to all the
+        sources of a target, so that they are not repeated for every source.'''
+        if len(target.sources) + len(target.generated) < 2:
+            return None
+        key = (target.get_id(), compiler.get_language())
+        var = self.target_compile_args.get(key)
+        if var is None:
+            name = re.sub(r'[^\w]', '_', f'ARGS_{compiler.get_language()}_{target.get_id()}')
+            while name in self.ninja_variable_names:
+                name += '_'
+            self.ninja_variable_names.add(name)
+            var = NinjaVariable(name, _share_item(tuple(commands.to_native(copy=True))))
+            self.add_variable(var)
+            self.target_compile_args[key] = var
+        return var
+
     def add_dependency_scanner_entries_to_element(self, target: build.BuildTarget, compiler, element, src):
         if not self.should_use_dyndeps_for_target(target):
             return
@@ -3734,7 +3911,12 @@ https://gcc.gnu.org/bugzilla/show_bug.cgi?id=47485'''))
         self.add_build(elem)
 
         deps = self.get_regen_filelist()
-        elem = NinjaBuildElement(self.all_outputs, 'build.ninja', 'REGENERATE_BUILD', deps)
+        if self.environment.coredata.get_option(OptionKey('regen_skip_unchanged')):
+            self.generate_regen_info()
+            regen_rule = 'REGENERATE_BUILD_IF_CHANGED'
+        else:
+            regen_rule = 'REGENERATE_BUILD'
+        elem = NinjaBuildElement(self.all_outputs, 'build.ninja', regen_rule, deps)
         elem.add_item('pool', 'console')
         self.add_build(elem)
 
@@ -9,7 +9,6 @@ import abc
 import hashlib
 import itertools, pathlib
 import os
-import pickle
 import re
 import textwrap
 import typing as T
@@ -24,7 +23,7 @@ from .mesonlib import (
     extract_as_list, typeslistify, stringlistify, classify_unity_sources,
     get_filenames_templates_dict, substitute_values, has_path_sep,
     OptionKey, PerMachineDefaultable,
-    MesonBugException, EnvironmentVariables, pickle_load,
+    MesonBugException, EnvironmentVariables, pickle_dump_sections, pickle_load_section,
 )
 from .compilers import (
     is_header, is_object, is_source, clink_langs, sort_clink, all_languages,
@@ -3081,7 +3080,7 @@ def get_sources_string_names(sources, backend):
 def load(build_dir: str) -> Build:
     filename = os.path.join(build_dir, 'meson-private', 'build.dat')
     try:
-        b = pickle_load(filename, 'Build data', Build)
+        b = pickle_load_section(filename, 'build', 'Build data', Build)
         # We excluded coredata when saving Build object, load it separately
         b.environment.coredata = coredata.load(build_dir)
         return b
@@ -3089,12 +3088,26 @@ def load(build_dir: str) -> Build:
         raise MesonException(f'No such build data file as {filename!r}.')
 
 
+def load_test_setups(build_dir: str) -> T.Tuple[T.Optional[str], T.Dict[str, TestSetup]]:
+    """Load the name of the default test setup and the test setups.
+
+    This only loads them, which is much faster than loading the whole build.
+    """
+    filename = os.path.join(build_dir, 'meson-private', 'build.dat')
+    try:
+        return pickle_load_section(filename, 'test_setups', 'Build data', tuple)
+    except FileNotFoundError:
+        raise MesonException(f'No such build data file as {filename!r}.')
+
+
 def save(obj: Build, filename: str) -> None:
     # Exclude coredata because we pickle it separately already
     cdata = obj.environment.coredata
     obj.environment.coredata = None
     try:
-        with open(filename, 'wb') as f:
-            pickle.dump(obj, f)
+        pickle_dump_sections(filename, {
+            'build': obj,
+            'test_setups': (obj.test_setup_default_name, obj.test_setups),
+        })
     finally:
         obj.environment.coredata = cdata
@@ -0,0 +1,274 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2026 The Meson development team
+
+"""A persistent, content addressed cache for compiler checks.
+
+The in-memory cache in CoreData only lives as long as a single build
+directory. When the ``MESON_COMPILER_CHECK_CACHE_DIR`` environment variable
+is set, the results of compiler checks are additionally stored on disk so
+that they can be shared between build directories (and between invocations
+of Meson).
+
+Entries are keyed on everything that can influence the result of a check:
+the compiler (and linker) command line, the identity of the compiler binary,
+the code being compiled, the extra arguments and the check mode. The headers
+and libraries a check finds are outside of the build, hashing them all is
+too costly; instead the key includes the modification time of the include
+and library directories that are searched, which changes when files are
+added, removed or replaced by a package manager. The cache is bounded in
+size, least recently used entries are evicted first.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import typing as T
+
+from .. import mlog
+from ..mesonlib import MesonException
+
+if T.TYPE_CHECKING:
+    from .compilers import Compiler, CompileCheckMode, CompileResult
+    from ..mesonlib import FileOrString
+
+# Bump this if the layout of cache entries changes
+CACHE_FORMAT_VERSION = 1
+
+# Default maximum size of the cache, in MiB
+DEFAULT_MAX_SIZE = 100
+
+# Entries are stored as <first 2 digits of the key>/<key>.json, and are
+# first written to <key>.<random>.tmp in the same directory
+_SUBDIR_RE = re.compile(r'[0-9a-f]{2}')
+_FILE_RE = re.compile(r'([0-9a-f]{64})(?:\.json|\.[a-z0-9_]+\.tmp)')
+
+# Environment variables that influence how a compiler driver behaves, and
+# therefore the outcome of a check
+_RELEVANT_ENV = ('PATH', 'CPATH', 'C_INCLUDE_PATH', 'CPLUS_INCLUDE_PATH',
+                 'OBJC_INCLUDE_PATH', 'LIBRARY_PATH', 'INCLUDE', 'LIB',
+                 'SDKROOT', 'MACOSX_DEPLOYMENT_TARGET')
+
+
+@functools.lru_cache(maxsize=None)
+def _executable_identity(exelist: T.Tuple[str, ...]) -> T.Tuple[T.Tuple[str, int, int], ...]:
+    """Identify the binaries of a command line by path, size and mtime.
+
+    Hashing the whole binary is too costly for large compilers, this is the
+    same tradeoff ccache makes by default.
+    """
+    ident: T.List[T.Tuple[str, int, int]] = []
+    for exe in exelist:
+        path = shutil.which(exe)
+        if path is None:
+            continue
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        ident.append((os.path.realpath(path), st.st_size, st.st_mtime_ns))
+    return tuple(ident)
+
+
+# Arguments that add a directory to the header or library search path, with
+# the directory either attached or as the next argument. Longer prefixes
+# come first.
+_SEARCH_DIR_ARGS = ('-isystem', '-idirafter', '-iquote', '-I', '/I', '/LIBPATH:', '-LIBPATH:', '-L')
+
+
+def _search_dirs(compiler: Compiler, args: T.Tuple[str, ...]) -> T.List[str]:
+    """Get the directories in which a check looks for headers and libraries."""
+    dirs: T.List[str] = []
+    it = iter(args)
+    for arg in it:
+        for prefix in _SEARCH_DIR_ARGS:
+            if arg == prefix:
+                dirs.append(next(it, ''))
+                break
+            if arg.startswith(prefix):
+                dirs.append(arg[len(prefix):])
+                break
+    try:
+        dirs.extend(compiler.get_default_include_dirs())
+    except (OSError, MesonException):
+        pass
+    return dirs
+
+
+def _directory_identity(dirs: T.List[str]) -> T.List[T.Tuple[str, T.Optional[int]]]:
+    ident: T.List[T.Tuple[str, T.Optional[int]]] = []
+    for d in dict.fromkeys(os.path.abspath(d) for d in dirs if d):
+        try:
+            ident.append((d, os.stat(d).st_mtime_ns))
+        except OSError:
+            ident.append((d, None))
+    return ident
+
+
+class CompilerCheckCache:
+
+    def __init__(self, cachedir: str, max_size: int):
+        self.cachedir = cachedir
+        self.max_size = max_size
+        self._added = 0
+        self._trimmed = False
+
+    def make_key(self, compiler: Compiler, code: FileOrString,
+                 extra_args: T.Tuple[str, ...], mode: CompileCheckMode) -> T.Optional[str]:
+        """Compute the key of a check, or None if it cannot be cached.
+
+        Checks compiling a File are not stored, as their content can change
+        behind our back.
+        """
+        if not isinstance(code, str):
+            return None
+        linker = compiler.linker
+        linker_exelist = tuple(linker.exelist) if linker is not None else ()
+        data = {
+            'format': CACHE_FORMAT_VERSION,
+            'language': compiler.language,
+            'id': compiler.get_id(),
+            'version': compiler.version,
+            'full_version': compiler.full_version,
+            'exelist': compiler.get_exelist(),
+            'identity': _executable_identity(tuple(compiler.get_exelist())),
+            'linker': linker.id if linker is not None else None,
+            'linker_exelist': linker_exelist,
+            'linker_identity': _executable_identity(linker_exelist),
+            'env': {k: os.environ.get(k) for k in _RELEVANT_ENV},
+            'search_dirs': _directory_identity(_search_dirs(compiler, extra_args)),
+            'code': code,
+            'args': extra_args,
+            'mode': mode.value,
+        }
+        return hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cachedir, key[:2], key + '.json')
+
+    def get(self, key: str) -> T.Optional[CompileResult]:
+        from .compilers import CompileResult
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            # Refresh the entry so that it is evicted last
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return CompileResult(data['stdout'], data['stderr'], data['command'],
+                             data['returncode'], cached=True)
+
+    def put(self, key: str, result: CompileResult) -> None:
+        path = self._path(key)
+        data = {
+            'stdout': result.stdout,
+            'stderr': result.stderr,
+            'command': result.command,
+            'returncode': result.returncode,
+        }
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write atomically, other Meson processes may be reading this
+            # cache at the same time.
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=key + '.', suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp, path)
+            self._added += os.path.getsize(path)
+        except OSError as e:
+            mlog.debug(f'Could not store compiler check in {self.cachedir}: {e}')
+            return
+        if not self._trimmed or self._added > self.max_size // 10:
+            self.trim()
+
+    def _files(self) -> T.Iterator[str]:
+        """Iterate over the entries and temporary files written by the cache.
+
+        The cache directory is given by the user and may hold other files,
+        those are never touched.
+        """
+        try:
+            subdirs = os.listdir(self.cachedir)
+        except OSError:
+            return
+        for subdir in subdirs:
+            if not _SUBDIR_RE.fullmatch(subdir):
+                continue
+            try:
+                files = os.listdir(os.path.join(self.cachedir, subdir))
+            except OSError:
+                continue
+            for f in files:
+                m = _FILE_RE.fullmatch(f)
+                if m and m.group(1).startswith(subdir):
+                    yield os.path.join(self.cachedir, subdir, f)
+
+    def clear(self) -> None:
+        """Remove all entries, for instance after system headers or libraries changed."""
+        for path in list(self._files()):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        try:
+            subdirs = os.listdir(self.cachedir)
+        except OSError:
+            return
+        for subdir in subdirs:
+            if _SUBDIR_RE.fullmatch(subdir):
+                try:
+                    os.rmdir(os.path.join(self.cachedir, subdir))
+                except OSError:
+                    # Not empty
+                    pass
+
+    def trim(self) -> None:
+        """Evict least recently used entries until the cache fits its size limit."""
+        self._trimmed = True
+        self._added = 0
+        entries: T.List[T.Tuple[int, int, str]] = []
+        total = 0
+        for path in self._files():
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, path))
+            total += st.st_size
+        if total <= self.max_size:
+            return
+        # Leave some headroom so we don't trim again on the next store
+        target = self.max_size * 9 // 10
+        for _, size, path in sorted(entries):
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= target:
+                break
+
+
+@functools.lru_cache(maxsize=None)
+def _get_cache(cachedir: str, max_size: str) -> CompilerCheckCache:
+    try:
+        size = int(max_size) * 1024 * 1024
+    except ValueError:
+        mlog.warning(f'Invalid MESON_COMPILER_CHECK_CACHE_MAX_SIZE {max_size!r}, using the default', once=True)
+        size = DEFAULT_MAX_SIZE * 1024 * 1024
+    return CompilerCheckCache(cachedir, size)
+
+
+def get_compiler_check_cache() -> T.Optional[CompilerCheckCache]:
+    """Get the persistent compiler check cache, if it is enabled."""
+    cachedir = os.environ.get('MESON_COMPILER_CHECK_CACHE_DIR')
+    if not cachedir:
+        return None
+    max_size = os.environ.get('MESON_COMPILER_CHECK_CACHE_MAX_SIZE', str(DEFAULT_MAX_SIZE))
+    return _get_cache(os.path.abspath(cachedir), max_size)
@@ -0,0 +1,69 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2026 The Meson development team
+
+"""Run independent compiler checks concurrently.
+
+Most of the time of a compiler check is spent waiting for the compiler
+process, so checks that don't depend on each other can be run from a pool
+of threads. The output of each check is deferred and replayed in submission
+order, so the console and meson-log.txt look exactly the same as if the
+checks had been run one after the other.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+import typing as T
+
+from .. import mlog
+
+_T = T.TypeVar('_T')
+
+if T.TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    _Outcome = T.Tuple[T.List[T.Callable[[], None]], T.Optional[_T], T.Optional[BaseException]]
+
+
+def _check_worker_count() -> int:
+    try:
+        # Fails in some weird environments such as Debian
+        # reproducible build.
+        return multiprocessing.cpu_count()
+    except Exception:
+        return 1
+
+
+def _run_deferred(check: T.Callable[[], _T]) -> _Outcome[_T]:
+    with mlog.deferred() as queue:
+        try:
+            return queue, check(), None
+        except BaseException as e:
+            return queue, None, e
+
+
+def run_checks(checks: T.Sequence[T.Callable[[], _T]]) -> T.List[_T]:
+    """Run checks concurrently and return their results, in order.
+
+    The checks must not depend on each other, nor modify interpreter state.
+    If a check raises, the output of all previous checks is written and the
+    exception is raised again.
+    """
+    if len(checks) < 2:
+        return [c() for c in checks]
+
+    results: T.List[_T] = []
+    with ThreadPoolExecutor(min(_check_worker_count(), len(checks))) as executor:
+        futures: T.List[Future[_Outcome[_T]]] = [executor.submit(_run_deferred, c) for c in checks]
+        try:
+            for f in futures:
+                queue, result, exc = f.result()
+                mlog.replay(queue)
+                if exc is not None:
+                    raise exc
+                results.append(T.cast('_T', result))
+        finally:
+            for f in futures:
+                f.cancel()
+    return results
@@ -7,7 +7,9 @@ from __future__ import annotations
 import abc
 import contextlib, os.path, re
 import enum
+import functools
 import itertools
+import threading
 import typing as T
 from dataclasses import dataclass
 from functools import lru_cache
@@ -209,6 +211,9 @@ clike_debug_args: T.Dict[bool, T.List[str]] = {
 
 MSCRT_VALS = ['none', 'md', 'mdd', 'mt', 'mtd']
 
+# Checks may be run from several threads, see checkpool.run_checks()
+_check_cache_lock = threading.Lock()
+
 @dataclass
 class BaseOption(T.Generic[options._T, options._U]):
     opt_type: T.Type[options._U]
@@ -765,6 +770,34 @@ class Compiler(HoldableObject, metaclass=abc.ABCMeta):
         """
         return self.linker.has_multi_arguments(args, env)
 
+    def has_each_argument(self, args: T.List[str], env: 'Environment', link: bool = False) -> T.List[T.Tuple[bool, bool]]:
+        """Checks which of the arguments are supported, each on its own.
+
+        All of the arguments are first tried in a single check, which is what
+        usually happens when most of them are supported. Only when that fails
+        is the set split in halves, which are checked concurrently, until the
+        unsupported arguments are found.
+
+        :returns:
+            A list with a tuple of (bool, bool) for each argument, see
+            has_multi_arguments()
+        """
+        from .checkpool import run_checks
+        test = self.has_multi_link_arguments if link else self.has_multi_arguments
+
+        def bisect(chunk: T.List[str]) -> T.List[T.Tuple[bool, bool]]:
+            result, cached = test(chunk, env)
+            if result or len(chunk) == 1:
+                return [(result, cached)] * len(chunk)
+            mid = len(chunk) // 2
+            left, right = run_checks([functools.partial(bisect, chunk[:mid]),
+                                      functools.partial(bisect, chunk[mid:])])
+            return left + right
+
+        if not args:
+            return []
+        return bisect(args)
+
     def _get_compile_output(self, dirname: str, mode: CompileCheckMode) -> str:
         assert mode != CompileCheckMode.PREPROCESS, 'In pre-processor mode, the output is sent to stdout and discarded'
         # Extension only matters if running results; '.exe' is
@@ -860,8 +893,9 @@ class Compiler(HoldableObject, metaclass=abc.ABCMeta):
         key: coredata.CompilerCheckCacheKey = (tuple(self.exelist), self.version, code, textra_args, mode)
 
         # Check if not cached, and generate, otherwise get from the cache
-        if key in cdata.compiler_check_cache:
-            p = cdata.compiler_check_cache[key]
+        with _check_cache_lock:
+            p = cdata.compiler_check_cache.get(key)
+        if p is not None:
             p.cached = True
             mlog.debug('Using cached compile:')
             mlog.debug('Cached command line: ', ' '.join(p.command), '\n')
@@ -869,10 +903,31 @@ class Compiler(HoldableObject, metaclass=abc.ABCMeta):
             mlog.debug('Cached compiler stdout:\n', p.stdout)
             mlog.debug('Cached compiler stderr:\n', p.stderr)
             yield p
-        else:
-            with self.compile(code, extra_args=extra_args, mode=mode, want_output=False, temp_dir=temp_dir) as p:
-                cdata.compiler_check_cache[key] = p
+            return
+
+        # Then try the persistent cache shared between build directories, if enabled
+        from .checkcache import get_compiler_check_cache
+        persistent = get_compiler_check_cache()
+        pkey = persistent.make_key(self, code, textra_args, mode) if persistent else None
+        if persistent is not None and pkey is not None:
+            p = persistent.get(pkey)
+            if p is not None:
+                mlog.debug('Using compile from the persistent check cache:')
+                mlog.debug('Cached command line: ', ' '.join(p.command), '\n')
+                mlog.debug('Code:\n', code)
+                mlog.debug('Cached compiler stdout:\n', p.stdout)
+                mlog.debug('Cached compiler stderr:\n', p.stderr)
+                with _check_cache_lock:
+                    cdata.compiler_check_cache[key] = p
                 yield p
+                return
+
+        with self.compile(code, extra_args=extra_args, mode=mode, want_output=False, temp_dir=temp_dir) as p:
+            with _check_cache_lock:
+                cdata.compiler_check_cache[key] = p
+            if persistent is not None and pkey is not None:
+                persistent.put(pkey, p)
+            yield p
 
     def get_colorout_args(self, colortype: str) -> T.List[str]:
         # TODO: colortype can probably be an emum
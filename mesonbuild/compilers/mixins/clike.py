@@ -467,10 +467,76 @@ class CLikeCompiler(Compiler):
         return self.compiles(t, env, extra_args=extra_args,
                              dependencies=dependencies)[0]
 
+    _EXTRACT_INT_START = 'MESON_INT_START'
+    _EXTRACT_INT_END = 'MESON_INT_END'
+    _EXTRACT_INT_REGEX = re.compile(rb'MESON_INT_START([+-][0-9]{20})MESON_INT_END')
+
+    def _extract_int(self, expression: str, prefix: str, env: 'Environment',
+                     extra_args: T.Union[None, T.List[str], T.Callable[[CompileCheckMode], T.List[str]]],
+                     dependencies: T.Optional[T.List['Dependency']]) -> T.Optional[int]:
+        """Compute a constant integer expression with a single compilation.
+
+        The value is stored as decimal digits, between two markers, in a
+        character array of an object file, which we then read back. This
+        cannot work if the object file does not contain machine code, for
+        instance with LTO, in which case None is returned.
+        """
+        value = f'((long long)({expression}))'
+        # The magnitude is computed like this so LLONG_MIN doesn't overflow
+        magnitude = f'((unsigned long long)({value} < 0 ? -({value} + 1) : {value}) + ({value} < 0 ? 1ULL : 0ULL))'
+        digits = ', '.join(f"(char)('0' + ({magnitude} / {10 ** i}ULL) % 10)" for i in reversed(range(20)))
+        start = ', '.join(f"'{c}'" for c in self._EXTRACT_INT_START)
+        end = ', '.join(f"'{c}'" for c in self._EXTRACT_INT_END)
+        code = f'''{prefix}
+        #include <stddef.h>
+        extern char meson_extract_int[];
+        char meson_extract_int[] = {{
+            {start},
+            (char)({value} < 0 ? '-' : '+'),
+            {digits},
+            {end}
+        }};'''
+        args = self.build_wrapper_args(env, extra_args, dependencies, CompileCheckMode.COMPILE)
+        key = (tuple(self.exelist), self.version, code, tuple(args), CompileCheckMode.COMPILE)
+        with compilers._check_cache_lock:
+            cached = env.coredata.compiler_check_cache.get(key)
+        if cached is not None:
+            mlog.debug('Using cached value of', expression, ':', cached.stdout)
+            return int(cached.stdout) if cached.stdout else None
+
+        result: T.Optional[int] = None
+        with self.compile(code, extra_args=args, mode=CompileCheckMode.COMPILE,
+                          want_output=True, temp_dir=env.scratch_dir) as p:
+            if p.returncode == 0:
+                try:
+                    with open(p.output_name, 'rb') as f:
+                        m = self._EXTRACT_INT_REGEX.search(f.read())
+                except OSError:
+                    m = None
+                if m:
+                    result = int(m.group(1))
+                    mlog.debug('Extracted value of', expression, 'from object file:', str(result))
+            # Store the extracted value in place of the compiler output
+            p.stdout = str(result) if result is not None else ''
+            with compilers._check_cache_lock:
+                env.coredata.compiler_check_cache[key] = p
+        return result
+
     def cross_compute_int(self, expression: str, low: T.Optional[int], high: T.Optional[int],
                           guess: T.Optional[int], prefix: str, env: 'Environment',
                           extra_args: T.Union[None, T.List[str], T.Callable[[CompileCheckMode], T.List[str]]] = None,
                           dependencies: T.Optional[T.List['Dependency']] = None) -> int:
+        # Reading the value from an object file only needs a single compilation
+        value = self._extract_int(expression, prefix, env, extra_args, dependencies)
+        if value is not None:
+            if isinstance(low, int) and isinstance(high, int):
+                if high < low:
+                    raise mesonlib.EnvironmentException('high limit smaller than low limit')
+                if not low <= value <= high:
+                    raise mesonlib.EnvironmentException('Value out of given range')
+            return value
+
+        # Otherwise fall back to a search with compile-time assertions.
         # Try user's guess first
         if isinstance(guess, int):
             if self._compile_int(f'{expression} == {guess}', prefix, env, extra_args, dependencies):
@@ -40,6 +40,7 @@ if T.TYPE_CHECKING:
     from .mesonlib import FileOrString
     from .cmake.traceparser import CMakeCacheEntry
     from .interpreterbase import SubProject
+    from .programs import ProgramVersionCacheKey
 
     class SharedCMDOptions(Protocol):
 
@@ -277,6 +278,7 @@ class CoreData:
 
         self.compiler_check_cache: T.Dict['CompilerCheckCacheKey', 'CompileResult'] = OrderedDict()
         self.run_check_cache: T.Dict['RunCheckCacheKey', 'RunResult'] = OrderedDict()
+        self.program_version_cache: T.Dict['ProgramVersionCacheKey', str] = {}
 
         # CMake cache
         self.cmake_cache: PerMachine[CMakeStateCache] = PerMachine(CMakeStateCache(), CMakeStateCache())
@@ -427,6 +429,10 @@ class CoreData:
                 'Maximum number of linker processes to run or 0 for no '
                 'limit',
                 (0, None, 0))
+            self.options[OptionKey('backend_subninja')] = options.UserBooleanOption(
+                'backend_subninja',
+                'Write the build rules of each subdir to a separate subninja file',
+                False)
         elif backend_name.startswith('vs'):
             self.options[OptionKey('backend_startup_project')] = options.UserStringOption(
                 'backend_startup_project',
@@ -507,6 +513,11 @@ class CoreData:
         self.deps.build.clear()
         self.compiler_check_cache.clear()
         self.run_check_cache.clear()
+        self.program_version_cache.clear()
+        from .compilers.checkcache import get_compiler_check_cache
+        persistent = get_compiler_check_cache()
+        if persistent is not None:
+            persistent.clear()
 
     def get_nondefault_buildtype_args(self) -> T.List[T.Union[T.Tuple[str, str, str], T.Tuple[str, bool, bool]]]:
         result: T.List[T.Union[T.Tuple[str, str, str], T.Tuple[str, bool, bool]]] = []
@@ -11,9 +11,12 @@ from ..programs import find_external_program, ExternalProgram
 from .. import mlog
 from pathlib import PurePath
 from functools import lru_cache
+import hashlib
+import json
 import re
 import os
 import shlex
+import tempfile
 import typing as T
 
 if T.TYPE_CHECKING:
@@ -112,6 +115,11 @@ class PkgConfigInterface:
 class PkgConfigCLI(PkgConfigInterface):
     '''pkg-config CLI implementation'''
 
+    # Results of pkg-config invocations, keyed by command line and
+    # PKG_CONFIG* environment variables. Shared by all instances, so that
+    # each query is only run once per configuration.
+    call_cache: T.Dict[T.Tuple[T.Tuple[str, ...], T.Tuple[T.Tuple[str, str], ...]], T.Tuple[int, str, str]] = {}
+
     def __init__(self, env: Environment, for_machine: MachineChoice, silent: bool) -> None:
         super().__init__(env, for_machine)
         self._detect_pkgbin()
@@ -267,8 +275,89 @@ class PkgConfigCLI(PkgConfigInterface):
         env = env or os.environ
         env = self._setup_env(env)
         cmd = self.pkgbin.get_command() + args
-        p, out, err = Popen_safe_logged(cmd, env=env)
-        return p.returncode, out.strip(), err.strip()
+        key = (tuple(cmd), tuple(sorted((k, v) for k, v in env.items() if k.startswith('PKG_CONFIG'))))
+        result = self.call_cache.get(key)
+        if result is not None:
+            mlog.debug(f'Using cached result of `{join_args(cmd)}` -> {result[0]}')
+            return result
+
+        cachedir = os.environ.get('MESON_PKG_CONFIG_CACHE_DIR')
+        cachefile = self._persistent_cache_file(cachedir, key, env) if cachedir else None
+        if cachefile:
+            result = self._load_persistent(cachefile)
+            if result is not None:
+                mlog.debug(f'Using result of `{join_args(cmd)}` -> {result[0]} from {cachedir}')
+        if result is None:
+            p, out, err = Popen_safe_logged(cmd, env=env)
+            result = (p.returncode, out.strip(), err.strip())
+            if cachefile:
+                self._store_persistent(cachefile, result)
+        self.call_cache[key] = result
+        return result
+
+    @lru_cache(maxsize=None)
+    def _default_search_path(self) -> T.Optional[str]:
+        assert isinstance(self.pkgbin, ExternalProgram)
+        p, out = Popen_safe(self.pkgbin.get_command() + ['--variable=pc_path', 'pkg-config'])[0:2]
+        if p.returncode != 0:
+            return None
+        return out.strip()
+
+    @lru_cache(maxsize=None)
+    def _search_path_digest(self, pkg_config_path: str, pkg_config_libdir: T.Optional[str]) -> T.Optional[str]:
+        '''Digest of the names, sizes and mtimes of all .pc files that
+        pkg-config can find, or None if the search path is unknown.'''
+        if pkg_config_libdir is None:
+            pkg_config_libdir = self._default_search_path()
+            if pkg_config_libdir is None:
+                return None
+        h = hashlib.sha256()
+        for d in pkg_config_path.split(os.pathsep) + pkg_config_libdir.split(os.pathsep):
+            try:
+                entries = sorted(e.path for e in os.scandir(d) if e.name.endswith('.pc'))
+            except OSError:
+                continue
+            for e in entries:
+                try:
+                    st = os.stat(e)
+                except OSError:
+                    continue
+                h.update(f'{e}\0{st.st_size}\0{st.st_mtime_ns}\n'.encode('utf-8'))
+        return h.hexdigest()
+
+    def _persistent_cache_file(self, cachedir: str, key: T.Tuple[T.Tuple[str, ...], T.Tuple[T.Tuple[str, str], ...]],
+                               env: T.Mapping[str, str]) -> T.Optional[str]:
+        # The .pc files can change behind our back, so entries are only
+        # valid as long as none of them changed.
+        digest = self._search_path_digest(env.get('PKG_CONFIG_PATH', ''), env.get('PKG_CONFIG_LIBDIR'))
+        if digest is None:
+            return None
+        assert isinstance(self.pkgbin, ExternalProgram)
+        data = json.dumps([key, self.pkgbin_version, digest])
+        name = hashlib.sha256(data.encode('utf-8')).hexdigest()
+        return os.path.join(cachedir, name[:2], name + '.json')
+
+    @staticmethod
+    def _load_persistent(cachefile: str) -> T.Optional[T.Tuple[int, str, str]]:
+        try:
+            with open(cachefile, encoding='utf-8') as f:
+                data = json.load(f)
+            return data['returncode'], data['stdout'], data['stderr']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    @staticmethod
+    def _store_persistent(cachefile: str, result: T.Tuple[int, str, str]) -> None:
+        try:
+            os.makedirs(os.path.dirname(cachefile), exist_ok=True)
+            # Write atomically, other Meson processes may be reading this
+            # cache at the same time.
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(cachefile), suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'returncode': result[0], 'stdout': result[1], 'stderr': result[2]}, f)
+            os.replace(tmp, cachefile)
+        except OSError as e:
+            mlog.debug(f'Could not store pkg-config result in {cachefile}: {e}')
 
 
 class PkgConfigDependency(ExternalDependency):
@@ -201,9 +201,11 @@ class CompilerHolder(ObjectHolder['Compiler']):
                              'has_define': self.has_define_method,
                              'check_header': self.check_header_method,
                              'has_header': self.has_header_method,
+                             'has_headers': self.has_headers_method,
                              'has_header_symbol': self.has_header_symbol_method,
                              'run': self.run_method,
                              'has_function': self.has_function_method,
+                             'has_functions': self.has_functions_method,
                              'has_member': self.has_member_method,
                              'has_members': self.has_members_method,
                              'has_type': self.has_type_method,
@@ -422,6 +424,9 @@ class CompilerHolder(ObjectHolder['Compiler']):
         had, cached = self.compiler.has_function(funcname, kwargs['prefix'], self.environment,
                                                  extra_args=extra_args,
                                                  dependencies=deps)
+        return self._report_has_function(funcname, msg, had, cached, required)
+
+    def _report_has_function(self, funcname: str, msg: str, had: bool, cached: bool, required: bool) -> bool:
         cached_msg = mlog.blue('(cached)') if cached else ''
         if required and not had:
             raise InterpreterException(f'{self.compiler.get_display_language()} function {funcname!r} not usable')
@@ -432,6 +437,26 @@ class CompilerHolder(ObjectHolder['Compiler']):
         mlog.log('Checking for function', mlog.bold(funcname, True), msg, hadtxt, cached_msg)
         return had
 
+    @FeatureNew('compiler.has_functions', '1.5.0')
+    @typed_pos_args('compiler.has_functions', varargs=str, min_varargs=1)
+    @typed_kwargs('compiler.has_functions', _HAS_REQUIRED_KW, *_COMMON_KWS)
+    def has_functions_method(self, args: T.Tuple[T.List[str]], kwargs: 'HasKW') -> T.Dict[str, bool]:
+        funcnames = args[0]
+        disabled, required, feature = extract_required_kwarg(kwargs, self.subproject, default=False)
+        if disabled:
+            for funcname in funcnames:
+                mlog.log('Has function', mlog.bold(funcname, True), 'skipped: feature', mlog.bold(feature), 'disabled')
+            return {f: False for f in funcnames}
+        extra_args = self._determine_args(kwargs)
+        deps, msg = self._determine_dependencies(kwargs['dependencies'], compile_only=False)
+        from ..compilers.checkpool import run_checks
+        results = run_checks([
+            functools.partial(self.compiler.has_function, funcname, kwargs['prefix'], self.environment,
+                              extra_args=extra_args, dependencies=deps)
+            for funcname in funcnames])
+        return {funcname: self._report_has_function(funcname, msg, had, cached, required)
+                for funcname, (had, cached) in zip(funcnames, results)}
+
     @typed_pos_args('compiler.has_type', str)
     @typed_kwargs('compiler.has_type', _HAS_REQUIRED_KW, *_COMMON_KWS)
     def has_type_method(self, args: T.Tuple[str], kwargs: 'HasKW') -> bool:
@@ -637,6 +662,9 @@ class CompilerHolder(ObjectHolder['Compiler']):
         deps, msg = self._determine_dependencies(kwargs['dependencies'])
         haz, cached = self.compiler.has_header(hname, kwargs['prefix'], self.environment,
                                                extra_args=extra_args, dependencies=deps)
+        return self._report_has_header(hname, msg, haz, cached, required)
+
+    def _report_has_header(self, hname: str, msg: str, haz: bool, cached: bool, required: bool) -> bool:
         cached_msg = mlog.blue('(cached)') if cached else ''
         if required and not haz:
             raise InterpreterException(f'{self.compiler.get_display_language()} header {hname!r} not found')
@@ -652,6 +680,28 @@ class CompilerHolder(ObjectHolder['Compiler']):
     def has_header_method(self, args: T.Tuple[str], kwargs: 'HeaderKW') -> bool:
         return self._has_header_impl(args[0], kwargs)
 
+    @FeatureNew('compiler.has_headers', '1.5.0')
+    @typed_pos_args('compiler.has_headers', varargs=str, min_varargs=1)
+    @typed_kwargs('compiler.has_headers', *_HEADER_KWS)
+    def has_headers_method(self, args: T.Tuple[T.List[str]], kwargs: 'HeaderKW') -> T.Dict[str, bool]:
+        hnames = args[0]
+        disabled, required, feature = extract_required_kwarg(kwargs, self.subproject, default=False)
+        if disabled:
+            for hname in hnames:
+                mlog.log('Has header', mlog.bold(hname, True), 'skipped: feature', mlog.bold(feature), 'disabled')
+            return {h: False for h in hnames}
+        # Computed once for all the checks, like has_functions(). Header
+        # checks never get the link arguments.
+        extra_args = self._determine_args(kwargs, CompileCheckMode.COMPILE)
+        deps, msg = self._determine_dependencies(kwargs['dependencies'])
+        from ..compilers.checkpool import run_checks
+        results = run_checks([
+            functools.partial(self.compiler.has_header, hname, kwargs['prefix'], self.environment,
+                              extra_args=extra_args, dependencies=deps)
+            for hname in hnames])
+        return {hname: self._report_has_header(hname, msg, haz, cached, required)
+                for hname, (haz, cached) in zip(hnames, results)}
+
     @typed_pos_args('compiler.has_header_symbol', str, str)
     @typed_kwargs('compiler.has_header_symbol', *_HEADER_KWS)
     def has_header_symbol_method(self, args: T.Tuple[str, str], kwargs: 'HeaderKW') -> bool:
@@ -742,8 +792,13 @@ class CompilerHolder(ObjectHolder['Compiler']):
 
     def _has_argument_impl(self, arguments: T.Union[str, T.List[str]],
                            mode: _TestMode = _TestMode.COMPILER,
-                           kwargs: T.Optional['ExtractRequired'] = None) -> bool:
-        """Shared implementation for methods checking compiler and linker arguments."""
+                           kwargs: T.Optional['ExtractRequired'] = None,
+                           precomputed: T.Optional[T.Tuple[bool, bool]] = None) -> bool:
+        """Shared implementation for methods checking compiler and linker arguments.
+
+        :param precomputed: The result of the check, if it has already been
+            run, for instance by _run_argument_checks().
+        """
         # This simplifies the callers
         if isinstance(arguments, str):
             arguments = [arguments]
@@ -759,8 +814,10 @@ class CompilerHolder(ObjectHolder['Compiler']):
             logargs += ['skipped: feature', mlog.bold(feature), 'disabled']
             mlog.log(*logargs)
             return False
-        test = self.compiler.has_multi_link_arguments if mode is _TestMode.LINKER else self.compiler.has_multi_arguments
-        result, cached = test(arguments, self.environment)
+        if precomputed is None:
+            test = self.compiler.has_multi_link_arguments if mode is _TestMode.LINKER else self.compiler.has_multi_arguments
+            precomputed = test(arguments, self.environment)
+        result, cached = precomputed
         if required and not result:
             logargs += ['not usable']
             raise InterpreterException(*logargs)
@@ -771,6 +828,10 @@ class CompilerHolder(ObjectHolder['Compiler']):
         mlog.log(*logargs)
         return result
 
+    def _run_argument_checks(self, arguments: T.List[str], mode: _TestMode = _TestMode.COMPILER) -> T.List[T.Tuple[bool, bool]]:
+        """Check which of the arguments are supported, in as few checks as possible."""
+        return self.compiler.has_each_argument(arguments, self.environment, link=mode is _TestMode.LINKER)
+
     @typed_pos_args('compiler.has_argument', str)
     @typed_kwargs('compiler.has_argument', _HAS_REQUIRED_KW)
     def has_argument_method(self, args: T.Tuple[str], kwargs: 'HasArgumentKW') -> bool:
@@ -793,8 +854,8 @@ class CompilerHolder(ObjectHolder['Compiler']):
         supported_args: T.List[str] = []
         checked = kwargs['checked']
 
-        for arg in args[0]:
-            if not self._has_argument_impl([arg]):
+        for arg, res in zip(args[0], self._run_argument_checks(args[0])):
+            if not self._has_argument_impl([arg], precomputed=res):
                 msg = f'Compiler for {self.compiler.get_display_language()} does not support "{arg}"'
                 if checked == 'warn':
                     mlog.warning(msg)
@@ -831,8 +892,8 @@ class CompilerHolder(ObjectHolder['Compiler']):
     @typed_pos_args('compiler.get_supported_link_arguments', varargs=str)
     def get_supported_link_arguments_method(self, args: T.Tuple[T.List[str]], kwargs: 'TYPE_kwargs') -> T.List[str]:
         supported_args: T.List[str] = []
-        for arg in args[0]:
-            if self._has_argument_impl([arg], mode=_TestMode.LINKER):
+        for arg, res in zip(args[0], self._run_argument_checks(args[0], _TestMode.LINKER)):
+            if self._has_argument_impl([arg], mode=_TestMode.LINKER, precomputed=res):
                 supported_args.append(arg)
         return supported_args
 
@@ -285,6 +285,8 @@ class Interpreter(InterpreterBase, HoldableObject):
         self.subproject_directory_name = subdir.split(os.path.sep)[-1]
         self.subproject_dir = subproject_dir
         self.relaxations = relaxations or set()
+        if self.environment.get_scratch_dir():
+            self.ast_cache_dir = os.path.join(self.environment.get_scratch_dir(), 'ast-cache')
         if ast is None:
             self.load_root_meson_file()
         else:
@@ -1199,7 +1201,7 @@ class Interpreter(InterpreterBase, HoldableObject):
                 # see if the option file has changed
                 self.coredata.options_files[self.subproject] = (option_file, hashlib.sha1(f.read()).hexdigest())
             oi = optinterpreter.OptionInterpreter(self.subproject)
-            oi.process(option_file)
+            oi.process(option_file, self.ast_cache_dir)
             self.coredata.update_project_options(oi.options, self.subproject)
             self.add_build_def_file(option_file)
         else:
@@ -1304,6 +1306,8 @@ class Interpreter(InterpreterBase, HoldableObject):
                 self.environment.wrap_resolver.merge_wraps(r)
             else:
                 self.environment.wrap_resolver = r
+                if self.coredata.get_option(OptionKey('wrap_prefetch')) and wrap_mode != WrapMode.nodownload:
+                    r.prefetch()
 
         self.build.projects[self.subproject] = proj_name
         mlog.log('Project name:', mlog.bold(proj_name))
@@ -2259,7 +2263,9 @@ class Interpreter(InterpreterBase, HoldableObject):
                     kwargs['workdir'],
                     kwargs['protocol'],
                     kwargs['priority'],
-                    kwargs['verbose'])
+                    kwargs['verbose'],
+                    kwargs['cpus'],
+                    kwargs['memory'])
 
     def add_test(self, node: mparser.BaseNode,
                  args: T.Tuple[str, T.Union[build.Executable, build.Jar, ExternalProgram, mesonlib.File, build.CustomTarget, build.CustomTargetIndex]],
@@ -2449,7 +2455,7 @@ class Interpreter(InterpreterBase, HoldableObject):
             raise InterpreterException(f"Nonexistent build file '{buildfilename!s}'")
         code = self.read_buildfile(absname, buildfilename)
         try:
-            codeblock = mparser.Parser(code, absname).parse()
+            codeblock = mparser.parse_cached(code, absname, self.ast_cache_dir)
         except mesonlib.MesonException as me:
             me.file = absname
             raise me
@@ -762,7 +762,7 @@ class Test(MesonInterpreterObject):
                  cmd_args: T.List[T.Union[str, mesonlib.File, build.Target]],
                  env: mesonlib.EnvironmentVariables,
                  should_fail: bool, timeout: int, workdir: T.Optional[str], protocol: str,
-                 priority: int, verbose: bool):
+                 priority: int, verbose: bool, cpus: int, memory: int):
         super().__init__()
         self.name = name
         self.suite = listify(suite)
@@ -778,6 +778,8 @@ class Test(MesonInterpreterObject):
         self.protocol = TestProtocol.from_str(protocol)
         self.priority = priority
         self.verbose = verbose
+        self.cpus = cpus
+        self.memory = memory
 
     def get_exe(self) -> T.Union[ExternalProgram, build.Executable, build.CustomTarget, build.CustomTargetIndex]:
         return self.exe
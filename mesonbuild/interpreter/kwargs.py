@@ -45,6 +45,8 @@ class BaseTest(TypedDict):
     priority: int
     env: EnvironmentVariables
     suite: T.List[str]
+    cpus: int
+    memory: int
 
 
 class FuncBenchmark(BaseTest):
@@ -22,31 +22,27 @@ from ...interpreterbase import (
 from ...mparser import PlusAssignmentNode
 
 if T.TYPE_CHECKING:
-    # Object holders need the actual interpreter
-    from ...interpreter import Interpreter
     from ...interpreterbase import TYPE_kwargs
 
 class ArrayHolder(ObjectHolder[T.List[TYPE_var]], IterableObject):
-    def __init__(self, obj: T.List[TYPE_var], interpreter: 'Interpreter') -> None:
-        super().__init__(obj, interpreter)
-        self.methods.update({
-            'contains': self.contains_method,
-            'length': self.length_method,
-            'get': self.get_method,
-        })
-
-        self.trivial_operators.update({
-            MesonOperator.EQUALS: (list, lambda x: self.held_object == x),
-            MesonOperator.NOT_EQUALS: (list, lambda x: self.held_object != x),
-            MesonOperator.IN: (object, lambda x: x in self.held_object),
-            MesonOperator.NOT_IN: (object, lambda x: x not in self.held_object),
-        })
-
-        # Use actual methods for functions that require additional checks
-        self.operators.update({
-            MesonOperator.PLUS: self.op_plus,
-            MesonOperator.INDEX: self.op_index,
-        })
+    METHODS = {
+        'contains': 'contains_method',
+        'length': 'length_method',
+        'get': 'get_method',
+    }
+
+    TRIVIAL_OPERATORS = {
+        MesonOperator.EQUALS: (list, lambda self, x: self.held_object == x),
+        MesonOperator.NOT_EQUALS: (list, lambda self, x: self.held_object != x),
+        MesonOperator.IN: (object, lambda self, x: x in self.held_object),
+        MesonOperator.NOT_IN: (object, lambda self, x: x not in self.held_object),
+    }
+
+    # Use actual methods for functions that require additional checks
+    OPERATORS = {
+        MesonOperator.PLUS: 'op_plus',
+        MesonOperator.INDEX: 'op_index',
+    }
 
     def display_name(self) -> str:
         return 'array'
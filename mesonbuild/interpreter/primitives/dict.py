@@ -20,34 +20,30 @@ from ...interpreterbase import (
 )
 
 if T.TYPE_CHECKING:
-    # Object holders need the actual interpreter
-    from ...interpreter import Interpreter
     from ...interpreterbase import TYPE_kwargs
 
 class DictHolder(ObjectHolder[T.Dict[str, TYPE_var]], IterableObject):
-    def __init__(self, obj: T.Dict[str, TYPE_var], interpreter: 'Interpreter') -> None:
-        super().__init__(obj, interpreter)
-        self.methods.update({
-            'has_key': self.has_key_method,
-            'keys': self.keys_method,
-            'get': self.get_method,
-        })
-
-        self.trivial_operators.update({
-            # Arithmetic
-            MesonOperator.PLUS: (dict, lambda x: {**self.held_object, **x}),
-
-            # Comparison
-            MesonOperator.EQUALS: (dict, lambda x: self.held_object == x),
-            MesonOperator.NOT_EQUALS: (dict, lambda x: self.held_object != x),
-            MesonOperator.IN: (str, lambda x: x in self.held_object),
-            MesonOperator.NOT_IN: (str, lambda x: x not in self.held_object),
-        })
-
-        # Use actual methods for functions that require additional checks
-        self.operators.update({
-            MesonOperator.INDEX: self.op_index,
-        })
+    METHODS = {
+        'has_key': 'has_key_method',
+        'keys': 'keys_method',
+        'get': 'get_method',
+    }
+
+    TRIVIAL_OPERATORS = {
+        # Arithmetic
+        MesonOperator.PLUS: (dict, lambda self, x: {**self.held_object, **x}),
+
+        # Comparison
+        MesonOperator.EQUALS: (dict, lambda self, x: self.held_object == x),
+        MesonOperator.NOT_EQUALS: (dict, lambda self, x: self.held_object != x),
+        MesonOperator.IN: (str, lambda self, x: x in self.held_object),
+        MesonOperator.NOT_IN: (str, lambda self, x: x not in self.held_object),
+    }
+
+    # Use actual methods for functions that require additional checks
+    OPERATORS = {
+        MesonOperator.INDEX: 'op_index',
+    }
 
     def display_name(self) -> str:
         return 'dict'
@@ -10,40 +10,36 @@ from ...interpreterbase import (
 import typing as T
 
 if T.TYPE_CHECKING:
-    # Object holders need the actual interpreter
-    from ...interpreter import Interpreter
     from ...interpreterbase import TYPE_var, TYPE_kwargs
 
 class IntegerHolder(ObjectHolder[int]):
-    def __init__(self, obj: int, interpreter: 'Interpreter') -> None:
-        super().__init__(obj, interpreter)
-        self.methods.update({
-            'is_even': self.is_even_method,
-            'is_odd': self.is_odd_method,
-            'to_string': self.to_string_method,
-        })
+    METHODS = {
+        'is_even': 'is_even_method',
+        'is_odd': 'is_odd_method',
+        'to_string': 'to_string_method',
+    }
 
-        self.trivial_operators.update({
-            # Arithmetic
-            MesonOperator.UMINUS: (None, lambda x: -self.held_object),
-            MesonOperator.PLUS: (int, lambda x: self.held_object + x),
-            MesonOperator.MINUS: (int, lambda x: self.held_object - x),
-            MesonOperator.TIMES: (int, lambda x: self.held_object * x),
+    TRIVIAL_OPERATORS = {
+        # Arithmetic
+        MesonOperator.UMINUS: (None, lambda self, x: -self.held_object),
+        MesonOperator.PLUS: (int, lambda self, x: self.held_object + x),
+        MesonOperator.MINUS: (int, lambda self, x: self.held_object - x),
+        MesonOperator.TIMES: (int, lambda self, x: self.held_object * x),
 
-            # Comparison
-            MesonOperator.EQUALS: (int, lambda x: self.held_object == x),
-            MesonOperator.NOT_EQUALS: (int, lambda x: self.held_object != x),
-            MesonOperator.GREATER: (int, lambda x: self.held_object > x),
-            MesonOperator.LESS: (int, lambda x: self.held_object < x),
-            MesonOperator.GREATER_EQUALS: (int, lambda x: self.held_object >= x),
-            MesonOperator.LESS_EQUALS: (int, lambda x: self.held_object <= x),
-        })
+        # Comparison
+        MesonOperator.EQUALS: (int, lambda self, x: self.held_object == x),
+        MesonOperator.NOT_EQUALS: (int, lambda self, x: self.held_object != x),
+        MesonOperator.GREATER: (int, lambda self, x: self.held_object > x),
+        MesonOperator.LESS: (int, lambda self, x: self.held_object < x),
+        MesonOperator.GREATER_EQUALS: (int, lambda self, x: self.held_object >= x),
+        MesonOperator.LESS_EQUALS: (int, lambda self, x: self.held_object <= x),
+    }
 
-        # Use actual methods for functions that require additional checks
-        self.operators.update({
-            MesonOperator.DIV: self.op_div,
-            MesonOperator.MOD: self.op_mod,
-        })
+    # Use actual methods for functions that require additional checks
+    OPERATORS = {
+        MesonOperator.DIV: 'op_div',
+        MesonOperator.MOD: 'op_mod',
+    }
 
     def display_name(self) -> str:
         return 'int'
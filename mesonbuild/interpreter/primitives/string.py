@@ -24,51 +24,47 @@ from ...interpreterbase import (
 
 
 if T.TYPE_CHECKING:
-    # Object holders need the actual interpreter
-    from ...interpreter import Interpreter
     from ...interpreterbase import TYPE_var, TYPE_kwargs
 
 class StringHolder(ObjectHolder[str]):
-    def __init__(self, obj: str, interpreter: 'Interpreter') -> None:
-        super().__init__(obj, interpreter)
-        self.methods.update({
-            'contains': self.contains_method,
-            'startswith': self.startswith_method,
-            'endswith': self.endswith_method,
-            'format': self.format_method,
-            'join': self.join_method,
-            'replace': self.replace_method,
-            'split': self.split_method,
-            'splitlines': self.splitlines_method,
-            'strip': self.strip_method,
-            'substring': self.substring_method,
-            'to_int': self.to_int_method,
-            'to_lower': self.to_lower_method,
-            'to_upper': self.to_upper_method,
-            'underscorify': self.underscorify_method,
-            'version_compare': self.version_compare_method,
-        })
-
-        self.trivial_operators.update({
-            # Arithmetic
-            MesonOperator.PLUS: (str, lambda x: self.held_object + x),
-
-            # Comparison
-            MesonOperator.EQUALS: (str, lambda x: self.held_object == x),
-            MesonOperator.NOT_EQUALS: (str, lambda x: self.held_object != x),
-            MesonOperator.GREATER: (str, lambda x: self.held_object > x),
-            MesonOperator.LESS: (str, lambda x: self.held_object < x),
-            MesonOperator.GREATER_EQUALS: (str, lambda x: self.held_object >= x),
-            MesonOperator.LESS_EQUALS: (str, lambda x: self.held_object <= x),
-        })
-
-        # Use actual methods for functions that require additional checks
-        self.operators.update({
-            MesonOperator.DIV: self.op_div,
-            MesonOperator.INDEX: self.op_index,
-            MesonOperator.IN: self.op_in,
-            MesonOperator.NOT_IN: self.op_notin,
-        })
+    METHODS = {
+        'contains': 'contains_method',
+        'startswith': 'startswith_method',
+        'endswith': 'endswith_method',
+        'format': 'format_method',
+        'join': 'join_method',
+        'replace': 'replace_method',
+        'split': 'split_method',
+        'splitlines': 'splitlines_method',
+        'strip': 'strip_method',
+        'substring': 'substring_method',
+        'to_int': 'to_int_method',
+        'to_lower': 'to_lower_method',
+        'to_upper': 'to_upper_method',
+        'underscorify': 'underscorify_method',
+        'version_compare': 'version_compare_method',
+    }
+
+    TRIVIAL_OPERATORS = {
+        # Arithmetic
+        MesonOperator.PLUS: (str, lambda self, x: self.held_object + x),
+
+        # Comparison
+        MesonOperator.EQUALS: (str, lambda self, x: self.held_object == x),
+        MesonOperator.NOT_EQUALS: (str, lambda self, x: self.held_object != x),
+        MesonOperator.GREATER: (str, lambda self, x: self.held_object > x),
+        MesonOperator.LESS: (str, lambda self, x: self.held_object < x),
+        MesonOperator.GREATER_EQUALS: (str, lambda self, x: self.held_object >= x),
+        MesonOperator.LESS_EQUALS: (str, lambda self, x: self.held_object <= x),
+    }
+
+    # Use actual methods for functions that require additional checks
+    OPERATORS = {
+        MesonOperator.DIV: 'op_div',
+        MesonOperator.INDEX: 'op_index',
+        MesonOperator.IN: 'op_in',
+        MesonOperator.NOT_IN: 'op_notin',
+    }
 
     def display_name(self) -> str:
         return 'str'
@@ -500,6 +500,10 @@ TEST_KWS: T.List[KwargInfo] = [
     DEPENDS_KW.evolve(since='0.46.0'),
     KwargInfo('suite', ContainerTypeInfo(list, str), listify=True, default=['']),  # yes, a list of empty string
     KwargInfo('verbose', bool, default=False, since='0.62.0'),
+    KwargInfo('cpus', int, default=1, since='1.5.0',
+              validator=lambda x: 'must be at least 1' if x < 1 else None),
+    KwargInfo('memory', int, default=0, since='1.5.0',
+              validator=lambda x: 'must not be negative' if x < 0 else None),
 ]
 
 # Cannot have a default value because we need to check that rust_crate_type and
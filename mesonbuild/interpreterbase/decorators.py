@@ -475,68 +475,71 @@ def typed_kwargs(name: str, *types: KwargInfo, allow_unknown: bool = False) -> T
                 return 'dict[]'
             return type(t).__name__
 
-        def check_value_type(types_tuple: T.Tuple[T.Union[T.Type, ContainerTypeInfo], ...],
+        def check_value_type(plain_types: T.Tuple[T.Type, ...], containers: T.Tuple[ContainerTypeInfo, ...],
                              value: T.Any) -> bool:
-            for t in types_tuple:
-                if isinstance(t, ContainerTypeInfo):
-                    if t.check(value):
-                        return True
-                elif isinstance(value, t):
-                    return True
-            return False
+            return isinstance(value, plain_types) or any(t.check(value) for t in containers)
+
+        def emit_feature_change(values: T.Dict[_T, T.Union[str, T.Tuple[str, str]]], feature: T.Union[T.Type['FeatureDeprecated'], T.Type['FeatureNew']],
+                                info: KwargInfo, value: T.Any, subproject: SubProject, node: mparser.BaseNode) -> None:
+            for n, version in values.items():
+                if isinstance(version, tuple):
+                    version, msg = version
+                else:
+                    msg = None
+
+                warning: T.Optional[str] = None
+                if isinstance(n, ContainerTypeInfo):
+                    if n.check_any(value):
+                        warning = f'of type {n.description()}'
+                elif isinstance(n, type):
+                    if isinstance(value, n):
+                        warning = f'of type {n.__name__}'
+                elif isinstance(value, list):
+                    if n in value:
+                        warning = f'value "{n}" in list'
+                elif isinstance(value, dict):
+                    if n in value.keys():
+                        warning = f'value "{n}" in dict keys'
+                elif n == value:
+                    warning = f'value "{n}"'
+                if warning:
+                    feature.single_use(f'"{name}" keyword argument "{info.name}" {warning}', version, subproject, msg, location=node)
+
+        # Everything that only depends on the KwargInfo is computed once here,
+        # instead of for every call of the function
+        all_names = frozenset(t.name for t in types)
+        checks: T.List[T.Tuple[KwargInfo, T.Tuple[T.Union[T.Type, ContainerTypeInfo], ...], T.Tuple[T.Type, ...], T.Tuple[ContainerTypeInfo, ...], str, bool, bool]] = []
+        for info in types:
+            types_tuple = info.types if isinstance(info.types, tuple) else (info.types,)
+            plain_types = tuple(t for t in types_tuple if not isinstance(t, ContainerTypeInfo))
+            containers = tuple(t for t in types_tuple if isinstance(t, ContainerTypeInfo))
+            default_valid = check_value_type(plain_types, containers, info.default)
+            # Only mutable defaults have to be copied
+            copy_default = not isinstance(info.default, (str, int, float, tuple, frozenset, type(None)))
+            checks.append((info, types_tuple, plain_types, containers, info.name + ' arg in ' + name, default_valid, copy_default))
 
         @wraps(f)
         def wrapper(*wrapped_args: T.Any, **wrapped_kwargs: T.Any) -> T.Any:
-
-            def emit_feature_change(values: T.Dict[_T, T.Union[str, T.Tuple[str, str]]], feature: T.Union[T.Type['FeatureDeprecated'], T.Type['FeatureNew']]) -> None:
-                for n, version in values.items():
-                    if isinstance(version, tuple):
-                        version, msg = version
-                    else:
-                        msg = None
-
-                    warning: T.Optional[str] = None
-                    if isinstance(n, ContainerTypeInfo):
-                        if n.check_any(value):
-                            warning = f'of type {n.description()}'
-                    elif isinstance(n, type):
-                        if isinstance(value, n):
-                            warning = f'of type {n.__name__}'
-                    elif isinstance(value, list):
-                        if n in value:
-                            warning = f'value "{n}" in list'
-                    elif isinstance(value, dict):
-                        if n in value.keys():
-                            warning = f'value "{n}" in dict keys'
-                    elif n == value:
-                        warning = f'value "{n}"'
-                    if warning:
-                        feature.single_use(f'"{name}" keyword argument "{info.name}" {warning}', version, subproject, msg, location=node)
-
             node, _, _kwargs, subproject = get_callee_args(wrapped_args)
             # Cast here, as the convertor function may place something other than a TYPE_var in the kwargs
             kwargs = T.cast('T.Dict[str, object]', _kwargs)
 
             if not allow_unknown:
-                all_names = {t.name for t in types}
                 unknowns = set(kwargs).difference(all_names)
                 if unknowns:
                     ustr = ', '.join([f'"{u}"' for u in sorted(unknowns)])
                     raise InvalidArguments(f'{name} got unknown keyword arguments {ustr}')
 
-            for info in types:
-                types_tuple = info.types if isinstance(info.types, tuple) else (info.types,)
+            for info, types_tuple, plain_types, containers, feature_name, default_valid, copy_default in checks:
                 value = kwargs.get(info.name)
                 if value is not None:
                     if info.since:
-                        feature_name = info.name + ' arg in ' + name
                         FeatureNew.single_use(feature_name, info.since, subproject, info.since_message, location=node)
                     if info.deprecated:
-                        feature_name = info.name + ' arg in ' + name
                         FeatureDeprecated.single_use(feature_name, info.deprecated, subproject, info.deprecated_message, location=node)
                     if info.listify:
                         kwargs[info.name] = value = mesonlib.listify(value)
-                    if not check_value_type(types_tuple, value):
+                    if not check_value_type(plain_types, containers, value):
                         shouldbe = types_description(types_tuple)
                         raise InvalidArguments(f'{name} keyword argument {info.name!r} was of type {raw_description(value)} but should have been {shouldbe}')
 
@@ -546,20 +549,20 @@ def typed_kwargs(name: str, *types: KwargInfo, allow_unknown: bool = False) -> T
                             raise InvalidArguments(f'{name} keyword argument "{info.name}" {msg}')
 
                     if info.deprecated_values is not None:
-                        emit_feature_change(info.deprecated_values, FeatureDeprecated)
+                        emit_feature_change(info.deprecated_values, FeatureDeprecated, info, value, subproject, node)
 
                     if info.since_values is not None:
-                        emit_feature_change(info.since_values, FeatureNew)
+                        emit_feature_change(info.since_values, FeatureNew, info, value, subproject, node)
 
                 elif info.required:
                     raise InvalidArguments(f'{name} is missing required keyword argument "{info.name}"')
                 else:
                     # set the value to the default, this ensuring all kwargs are present
                     # This both simplifies the typing checking and the usage
-                    assert check_value_type(types_tuple, info.default), f'In function {name} default value of {info.name} is not a valid type, got {type(info.default)} expected {types_description(types_tuple)}'
+                    assert default_valid, f'In function {name} default value of {info.name} is not a valid type, got {type(info.default)} expected {types_description(types_tuple)}'
                     # Create a shallow copy of the container. This allows mutable
                     # types to be used safely as default values
-                    kwargs[info.name] = copy.copy(info.default)
+                    kwargs[info.name] = copy.copy(info.default) if copy_default else info.default
                     if info.not_set_warning:
                         mlog.warning(info.not_set_warning)
 
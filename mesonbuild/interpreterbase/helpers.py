@@ -18,13 +18,13 @@ def flatten(args: T.Union['TYPE_var', T.List['TYPE_var']]) -> T.List['TYPE_var']
     if isinstance(args, mparser.StringNode):
         assert isinstance(args.value, str)
         return [args.value]
-    if not isinstance(args, collections.abc.Sequence):
+    # Checking for the common case of a list first avoids a slow ABC check
+    if not isinstance(args, list) and not isinstance(args, collections.abc.Sequence):
         return [args]
     result: T.List['TYPE_var'] = []
     for a in args:
         if isinstance(a, list):
-            rest = flatten(a)
-            result = result + rest
+            result.extend(flatten(a))
         elif isinstance(a, mparser.StringNode):
             result.append(a.value)
         else:
@@ -88,6 +88,8 @@ class InterpreterBase:
         # If it was part of a if-clause, it is used to temporally override the
         # current meson version target within that if-block.
         self.tmp_meson_version: T.Optional[str] = None
+        # Where the ASTs of build files are cached, if anywhere
+        self.ast_cache_dir: T.Optional[str] = None
 
     def handle_meson_version_from_ast(self, strict: bool = True) -> None:
         # do nothing in an AST interpreter
@@ -110,7 +112,7 @@ class InterpreterBase:
             raise InvalidCode('Builder file is empty.')
         assert isinstance(code, str)
         try:
-            self.ast = mparser.Parser(code, mesonfile).parse()
+            self.ast = mparser.parse_cached(code, mesonfile, self.ast_cache_dir)
             self.handle_meson_version_from_ast()
         except mparser.ParseException as me:
             me.file = mesonfile
@@ -195,65 +197,66 @@ class InterpreterBase:
                 raise e
             i += 1 # In THE FUTURE jump over blocks and stuff.
 
+    # Names of the methods that evaluate each type of statement. Looking them
+    # up by the exact type of the node is much cheaper than a chain of
+    # isinstance() checks, and going through getattr() still picks up the
+    # overrides of subclasses.
+    statement_evaluators: T.Dict[T.Type[mparser.BaseNode], str] = {
+        mparser.FunctionNode: 'function_call',
+        mparser.PlusAssignmentNode: 'evaluate_plusassign',
+        mparser.AssignmentNode: 'assignment',
+        mparser.MethodNode: 'method_call',
+        mparser.StringNode: 'evaluate_string',
+        mparser.BooleanNode: 'evaluate_literal',
+        mparser.IfClauseNode: 'evaluate_if',
+        mparser.IdNode: 'evaluate_id',
+        mparser.ComparisonNode: 'evaluate_comparison',
+        mparser.ArrayNode: 'evaluate_arraystatement',
+        mparser.DictNode: 'evaluate_dictstatement',
+        mparser.NumberNode: 'evaluate_literal',
+        mparser.AndNode: 'evaluate_andstatement',
+        mparser.OrNode: 'evaluate_orstatement',
+        mparser.NotNode: 'evaluate_notstatement',
+        mparser.UMinusNode: 'evaluate_uminusstatement',
+        mparser.ArithmeticNode: 'evaluate_arithmeticstatement',
+        mparser.ForeachClauseNode: 'evaluate_foreach',
+        mparser.IndexNode: 'evaluate_indexing',
+        mparser.TernaryNode: 'evaluate_ternary',
+        mparser.ContinueNode: 'evaluate_continue',
+        mparser.BreakNode: 'evaluate_break',
+        mparser.ParenthesizedNode: 'evaluate_parenthesized',
+        mparser.TestCaseClauseNode: 'evaluate_testcase',
+    }
+
     def evaluate_statement(self, cur: mparser.BaseNode) -> T.Optional[InterpreterObject]:
         self.current_node = cur
-        if isinstance(cur, mparser.FunctionNode):
-            return self.function_call(cur)
-        elif isinstance(cur, mparser.PlusAssignmentNode):
-            self.evaluate_plusassign(cur)
-        elif isinstance(cur, mparser.AssignmentNode):
-            self.assignment(cur)
-        elif isinstance(cur, mparser.MethodNode):
-            return self.method_call(cur)
-        elif isinstance(cur, mparser.StringNode):
-            if cur.is_fstring:
-                if cur.is_multiline:
-                    return self.evaluate_multiline_fstring(cur)
-                else:
-                    return self.evaluate_fstring(cur)
-            else:
-                return self._holderify(cur.value)
-        elif isinstance(cur, mparser.BooleanNode):
-            return self._holderify(cur.value)
-        elif isinstance(cur, mparser.IfClauseNode):
-            return self.evaluate_if(cur)
-        elif isinstance(cur, mparser.IdNode):
-            return self.get_variable(cur.value)
-        elif isinstance(cur, mparser.ComparisonNode):
-            return self.evaluate_comparison(cur)
-        elif isinstance(cur, mparser.ArrayNode):
-            return self.evaluate_arraystatement(cur)
-        elif isinstance(cur, mparser.DictNode):
-            return self.evaluate_dictstatement(cur)
-        elif isinstance(cur, mparser.NumberNode):
-            return self._holderify(cur.value)
-        elif isinstance(cur, mparser.AndNode):
-            return self.evaluate_andstatement(cur)
-        elif isinstance(cur, mparser.OrNode):
-            return self.evaluate_orstatement(cur)
-        elif isinstance(cur, mparser.NotNode):
-            return self.evaluate_notstatement(cur)
-        elif isinstance(cur, mparser.UMinusNode):
-            return self.evaluate_uminusstatement(cur)
-        elif isinstance(cur, mparser.ArithmeticNode):
-            return self.evaluate_arithmeticstatement(cur)
-        elif isinstance(cur, mparser.ForeachClauseNode):
-            self.evaluate_foreach(cur)
-        elif isinstance(cur, mparser.IndexNode):
-            return self.evaluate_indexing(cur)
-        elif isinstance(cur, mparser.TernaryNode):
-            return self.evaluate_ternary(cur)
-        elif isinstance(cur, mparser.ContinueNode):
-            raise ContinueRequest()
-        elif isinstance(cur, mparser.BreakNode):
-            raise BreakRequest()
-        elif isinstance(cur, mparser.ParenthesizedNode):
-            return self.evaluate_statement(cur.inner)
-        elif isinstance(cur, mparser.TestCaseClauseNode):
-            return self.evaluate_testcase(cur)
-        else:
+        name = self.statement_evaluators.get(type(cur))
+        if name is None:
             raise InvalidCode("Unknown statement.")
-        return None
+        evaluator: T.Callable[[mparser.BaseNode], T.Optional[InterpreterObject]] = getattr(self, name)
+        return evaluator(cur)
+
+    def evaluate_string(self, cur: mparser.StringNode) -> InterpreterObject:
+        if cur.is_fstring:
+            if cur.is_multiline:
+                return self.evaluate_multiline_fstring(cur)
+            return self.evaluate_fstring(cur)
+        return self._holderify(cur.value)
+
+    def evaluate_literal(self, cur: T.Union[mparser.BooleanNode, mparser.NumberNode]) -> InterpreterObject:
+        return self._holderify(cur.value)
+
+    def evaluate_id(self, cur: mparser.IdNode) -> InterpreterObject:
+        return self.get_variable(cur.value)
+
+    def evaluate_parenthesized(self, cur: mparser.ParenthesizedNode) -> T.Optional[InterpreterObject]:
+        return self.evaluate_statement(cur.inner)
+
+    def evaluate_continue(self, cur: mparser.ContinueNode) -> T.NoReturn:
+        raise ContinueRequest()
+
+    def evaluate_break(self, cur: mparser.BreakNode) -> T.NoReturn:
+        raise BreakRequest()
 
     def evaluate_arraystatement(self, cur: mparser.ArrayNode) -> InterpreterObject:
         (arguments, kwargs) = self.reduce_arguments(cur.args)
@@ -3,6 +3,11 @@
 from enum import Enum
 
 class MesonOperator(Enum):
+    # Members are singletons, so hashing them by identity is correct, and much
+    # faster than hashing their name in Python code like Enum does. Operators
+    # are looked up in dicts for every operation the interpreter evaluates.
+    __hash__ = object.__hash__
+
     # Arithmetic
     PLUS = '+'
     MINUS = '-'
@@ -18,7 +18,7 @@ from . import mlog
 from . import mesonlib
 from .mesonlib import MesonException, RealPathAction, join_args, listify_array_value, setup_vsenv
 from mesonbuild.environment import detect_ninja
-from mesonbuild import build
+from mesonbuild import coredata
 
 if T.TYPE_CHECKING:
     import argparse
@@ -352,8 +352,7 @@ def run(options: 'argparse.Namespace') -> int:
     if options.targets and options.clean:
         raise MesonException('`TARGET` and `--clean` can\'t be used simultaneously')
 
-    b = build.load(options.wd)
-    cdata = b.environment.coredata
+    cdata = coredata.load(options.wd)
     need_vsenv = T.cast('bool', cdata.get_option(mesonlib.OptionKey('vsenv')))
     if setup_vsenv(need_vsenv):
         mlog.log(mlog.green('INFO:'), 'automatically activated MSVC compiler environment')
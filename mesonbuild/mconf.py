@@ -91,7 +91,7 @@ class Conf:
                         ophash = hashlib.sha1(f.read()).hexdigest()
                         if ophash != conf_options[1]:
                             oi = OptionInterpreter(sub)
-                            oi.process(opfile)
+                            oi.process(opfile, os.path.join(self.build_dir, 'meson-private', 'ast-cache'))
                             self.coredata.update_project_options(oi.options, sub)
                             self.coredata.options_files[sub] = (opfile, ophash)
                 else:
@@ -100,7 +100,7 @@ class Conf:
                         opfile = os.path.join(self.source_dir, 'meson_options.txt')
                     if os.path.exists(opfile):
                         oi = OptionInterpreter(sub)
-                        oi.process(opfile)
+                        oi.process(opfile, os.path.join(self.build_dir, 'meson-private', 'ast-cache'))
                         self.coredata.update_project_options(oi.options, sub)
                         with open(opfile, 'rb') as f:
                             ophash = hashlib.sha1(f.read()).hexdigest()
@@ -120,6 +120,7 @@ class Conf:
 
     def clear_cache(self) -> None:
         self.coredata.clear_cache()
+        mesonlib.windows_proof_rmtree(os.path.join(self.build_dir, 'meson-private', 'ast-cache'))
 
     def set_options(self, options: T.Dict[OptionKey, str]) -> bool:
         return self.coredata.set_options(options)
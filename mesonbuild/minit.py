@@ -15,7 +15,7 @@ import re
 from glob import glob
 import typing as T
 
-from mesonbuild import build, mesonlib, mlog
+from mesonbuild import coredata, mesonlib, mlog
 from mesonbuild.coredata import FORBIDDEN_TARGET_NAMES
 from mesonbuild.environment import detect_ninja
 from mesonbuild.templates.mesontemplates import create_meson_build
@@ -191,8 +191,8 @@ def run(options: Arguments) -> int:
         if ret.returncode:
             raise SystemExit
 
-        b = build.load(options.builddir)
-        need_vsenv = T.cast('bool', b.environment.coredata.get_option(mesonlib.OptionKey('vsenv')))
+        cdata = coredata.load(options.builddir)
+        need_vsenv = T.cast('bool', cdata.get_option(mesonlib.OptionKey('vsenv')))
         vsenv_active = mesonlib.setup_vsenv(need_vsenv)
         if vsenv_active:
             mlog.log(mlog.green('INFO:'), 'automatically activated MSVC compiler environment')
@@ -8,9 +8,11 @@ some to logging dir and some goes to both."""
 from __future__ import annotations
 
 import enum
+import functools
 import os
 import io
 import sys
+import threading
 import time
 import platform
 import shlex
@@ -97,6 +99,7 @@ class _Logger:
     logged_once: T.Set[T.Tuple[str, ...]] = field(default_factory=set)
     log_warnings_counter = 0
     log_pager: T.Optional['subprocess.Popen'] = None
+    log_deferred: threading.local = field(default_factory=threading.local)
 
     _LOG_FNAME: T.ClassVar[str] = 'meson-log.txt'
 
@@ -117,6 +120,32 @@ class _Logger:
         finally:
             self.log_disable_stdout = restore
 
+    @contextmanager
+    def deferred(self) -> T.Iterator[T.List[T.Callable[[], None]]]:
+        """Queue all output of the current thread instead of writing it.
+
+        This is used when running work in helper threads: the queue can later
+        be replayed from the main thread with replay(), so that the log is
+        written in a deterministic order whichever thread finishes first.
+        """
+        queue: T.List[T.Callable[[], None]] = []
+        self.log_deferred.queue = queue
+        try:
+            yield queue
+        finally:
+            self.log_deferred.queue = None
+
+    def _defer(self, func: T.Callable[..., None], *args: T.Any, **kwargs: T.Any) -> bool:
+        queue: T.Optional[T.List[T.Callable[[], None]]] = getattr(self.log_deferred, 'queue', None)
+        if queue is None:
+            return False
+        queue.append(functools.partial(func, *args, **kwargs))
+        return True
+
+    def replay(self, queue: T.List[T.Callable[[], None]]) -> None:
+        for func in queue:
+            func()
+
     def set_quiet(self) -> None:
         self.log_errors_only = True
 
@@ -230,6 +259,8 @@ class _Logger:
 
     def debug(self, *args: TV_Loggable, sep: T.Optional[str] = None,
               end: T.Optional[str] = None, display_timestamp: bool = True) -> None:
+        if self._defer(self.debug, *args, sep=sep, end=end, display_timestamp=display_timestamp):
+            return
         arr = process_markup(args, False, display_timestamp)
         if self.log_file is not None:
             print(*arr, file=self.log_file, sep=sep, end=end)
@@ -238,6 +269,9 @@ class _Logger:
     def _log(self, *args: TV_Loggable, is_error: bool = False,
              nested: bool = True, sep: T.Optional[str] = None,
              end: T.Optional[str] = None, display_timestamp: bool = True) -> None:
+        if self._defer(self._log, *args, is_error=is_error, nested=nested, sep=sep, end=end,
+                       display_timestamp=display_timestamp):
+            return
         arr = process_markup(args, False, display_timestamp)
         if self.log_file is not None:
             print(*arr, file=self.log_file, sep=sep, end=end)
@@ -404,6 +438,7 @@ class _Logger:
 _logger = _Logger()
 cmd_ci_include = _logger.cmd_ci_include
 debug = _logger.debug
+deferred = _logger.deferred
 deprecation = _logger.deprecation
 error = _logger.error
 exception = _logger.exception
@@ -419,6 +454,7 @@ nested_warnings = _logger.nested_warnings
 no_logging = _logger.no_logging
 notice = _logger.notice
 process_markup = _logger.process_markup
+replay = _logger.replay
 set_quiet = _logger.set_quiet
 set_timestamp_start = _logger.set_timestamp_start
 set_verbose = _logger.set_verbose
@@ -5,7 +5,10 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 import re
 import codecs
+import gc
+import hashlib
 import os
+import pickle
 import typing as T
 
 from .mesonlib import MesonException
@@ -95,6 +98,53 @@ class Token(T.Generic[TV_TokenTypes]):
         return NotImplemented
 
 class Lexer:
+    # Tried in order at each position, the first one that matches wins. They
+    # need to be sorted longest to shortest.
+    token_specification = [
+        ('whitespace', r'[ \t]+'),
+        ('multiline_fstring', r"f'''(?:.|\n)*?'''"),
+        ('fstring', r"f'(?:[^'\\]|\\.)*'"),
+        ('id', r'[_a-zA-Z][_0-9a-zA-Z]*'),
+        ('number', r'0[bB][01]+|0[oO][0-7]+|0[xX][0-9a-fA-F]+|0|[1-9]\d*'),
+        ('eol_cont', r'\\[ \t]*(?:#.*)?\n'),
+        ('eol', r'\n'),
+        ('multiline_string', r"'''(?:.|\n)*?'''"),
+        ('comment', r'#.*'),
+        ('lparen', r'\('),
+        ('rparen', r'\)'),
+        ('lbracket', r'\['),
+        ('rbracket', r'\]'),
+        ('lcurl', r'\{'),
+        ('rcurl', r'\}'),
+        ('dblquote', r'"'),
+        ('string', r"'(?:[^'\\]|\\.)*'"),
+        ('comma', r','),
+        ('plusassign', r'\+='),
+        ('dot', r'\.'),
+        ('plus', r'\+'),
+        ('dash', r'-'),
+        ('star', r'\*'),
+        ('percent', r'%'),
+        ('fslash', r'/'),
+        ('colon', r':'),
+        ('equal', r'=='),
+        ('nequal', r'!='),
+        ('assign', r'='),
+        ('le', r'<='),
+        ('lt', r'<'),
+        ('ge', r'>='),
+        ('gt', r'>'),
+        ('questionmark', r'\?'),
+    ]
+    # A single regex with a named group for each token, instead of trying
+    # each of them in turn. Alternatives are also tried in order, so this
+    # matches the same token as the list above would.
+    token_regex = re.compile('|'.join(f'(?P<{tid}>{reg})' for tid, reg in token_specification))
+    # Tokens that are yielded as they were matched
+    plain_tokens = frozenset(tid for tid, _ in token_specification) - {
+        'id', 'eol', 'eol_cont', 'string', 'fstring', 'multiline_string', 'multiline_fstring',
+        'lparen', 'rparen', 'lbracket', 'rbracket', 'lcurl', 'rcurl', 'dblquote'}
+
     def __init__(self, code: str):
         if code.startswith(codecs.BOM_UTF8.decode('utf-8')):
             line, *_ = code.split('\n', maxsplit=1)
@@ -108,48 +158,14 @@ class Lexer:
         self.in_unit_test = 'MESON_RUNNING_IN_PROJECT_TESTS' in os.environ
         if self.in_unit_test:
             self.keywords.update({'testcase', 'endtestcase'})
-        self.token_specification = [
-            # Need to be sorted longest to shortest.
-            ('whitespace', re.compile(r'[ \t]+')),
-            ('multiline_fstring', re.compile(r"f'''(.|\n)*?'''", re.M)),
-            ('fstring', re.compile(r"f'([^'\\]|(\\.))*'")),
-            ('id', re.compile('[_a-zA-Z][_0-9a-zA-Z]*')),
-            ('number', re.compile(r'0[bB][01]+|0[oO][0-7]+|0[xX][0-9a-fA-F]+|0|[1-9]\d*')),
-            ('eol_cont', re.compile(r'\\[ \t]*(#.*)?\n')),
-            ('eol', re.compile(r'\n')),
-            ('multiline_string', re.compile(r"'''(.|\n)*?'''", re.M)),
-            ('comment', re.compile(r'#.*')),
-            ('lparen', re.compile(r'\(')),
-            ('rparen', re.compile(r'\)')),
-            ('lbracket', re.compile(r'\[')),
-            ('rbracket', re.compile(r'\]')),
-            ('lcurl', re.compile(r'\{')),
-            ('rcurl', re.compile(r'\}')),
-            ('dblquote', re.compile(r'"')),
-            ('string', re.compile(r"'([^'\\]|(\\.))*'")),
-            ('comma', re.compile(r',')),
-            ('plusassign', re.compile(r'\+=')),
-            ('dot', re.compile(r'\.')),
-            ('plus', re.compile(r'\+')),
-            ('dash', re.compile(r'-')),
-            ('star', re.compile(r'\*')),
-            ('percent', re.compile(r'%')),
-            ('fslash', re.compile(r'/')),
-            ('colon', re.compile(r':')),
-            ('equal', re.compile(r'==')),
-            ('nequal', re.compile(r'!=')),
-            ('assign', re.compile(r'=')),
-            ('le', re.compile(r'<=')),
-            ('lt', re.compile(r'<')),
-            ('ge', re.compile(r'>=')),
-            ('gt', re.compile(r'>')),
-            ('questionmark', re.compile(r'\?')),
-        ]
 
     def getline(self, line_start: int) -> str:
         return self.code[line_start:self.code.find('\n', line_start)]
 
     def lex(self, filename: str) -> T.Generator[Token, None, None]:
+        code = self.code
+        match = self.token_regex.match
+        plain_tokens = self.plain_tokens
         line_start = 0
         lineno = 1
         loc = 0
@@ -157,68 +173,64 @@ class Lexer:
         bracket_count = 0
         curl_count = 0
         col = 0
-        while loc < len(self.code):
-            matched = False
-            value: str = ''
-            for (tid, reg) in self.token_specification:
-                mo = reg.match(self.code, loc)
-                if mo:
-                    curline = lineno
-                    curline_start = line_start
-                    col = mo.start() - line_start
-                    matched = True
-                    span_start = loc
-                    loc = mo.end()
-                    span_end = loc
-                    bytespan = (span_start, span_end)
-                    value = mo.group()
-                    if tid == 'lparen':
-                        par_count += 1
-                    elif tid == 'rparen':
-                        par_count -= 1
-                    elif tid == 'lbracket':
-                        bracket_count += 1
-                    elif tid == 'rbracket':
-                        bracket_count -= 1
-                    elif tid == 'lcurl':
-                        curl_count += 1
-                    elif tid == 'rcurl':
-                        curl_count -= 1
-                    elif tid == 'dblquote':
-                        raise ParseException('Double quotes are not supported. Use single quotes.', self.getline(line_start), lineno, col)
-                    elif tid in {'string', 'fstring'}:
-                        if value.find("\n") != -1:
-                            msg = ("Newline character in a string detected, use ''' (three single quotes) "
-                                   "for multiline strings instead.\n"
-                                   "This will become a hard error in a future Meson release.")
-                            mlog.warning(mlog.code_line(msg, self.getline(line_start), col), location=BaseNode(lineno, col, filename))
-                        value = value[2 if tid == 'fstring' else 1:-1]
-                    elif tid in {'multiline_string', 'multiline_fstring'}:
-                        value = value[4 if tid == 'multiline_fstring' else 3:-3]
-                        lines = value.split('\n')
-                        if len(lines) > 1:
-                            lineno += len(lines) - 1
-                            line_start = mo.end() - len(lines[-1])
-                    elif tid == 'eol_cont':
-                        lineno += 1
-                        line_start = loc
-                        tid = 'whitespace'
-                    elif tid == 'eol':
-                        lineno += 1
-                        line_start = loc
-                        if par_count > 0 or bracket_count > 0 or curl_count > 0:
-                            tid = 'whitespace'
-                    elif tid == 'id':
-                        if value in self.keywords:
-                            tid = value
-                        else:
-                            if value in self.future_keywords:
-                                mlog.warning(f"Identifier '{value}' will become a reserved keyword in a future release. Please rename it.",
-                                             location=BaseNode(lineno, col, filename))
-                    yield Token(tid, filename, curline_start, curline, col, bytespan, value)
-                    break
-            if not matched:
+        end = len(code)
+        while loc < end:
+            mo = match(code, loc)
+            if not mo:
                 raise ParseException('lexer', self.getline(line_start), lineno, col)
+            tid = mo.lastgroup
+            curline = lineno
+            curline_start = line_start
+            col = loc - line_start
+            span_start = loc
+            loc = mo.end()
+            bytespan = (span_start, loc)
+            value: str = mo.group()
+            if tid in plain_tokens:
+                pass
+            elif tid == 'id':
+                if value in self.keywords:
+                    tid = value
+                elif value in self.future_keywords:
+                    mlog.warning(f"Identifier '{value}' will become a reserved keyword in a future release. Please rename it.",
+                                 location=BaseNode(lineno, col, filename))
+            elif tid == 'eol':
+                lineno += 1
+                line_start = loc
+                if par_count > 0 or bracket_count > 0 or curl_count > 0:
+                    tid = 'whitespace'
+            elif tid in {'string', 'fstring'}:
+                if value.find("\n") != -1:
+                    msg = ("Newline character in a string detected, use ''' (three single quotes) "
+                           "for multiline strings instead.\n"
+                           "This will become a hard error in a future Meson release.")
+                    mlog.warning(mlog.code_line(msg, self.getline(line_start), col), location=BaseNode(lineno, col, filename))
+                value = value[2 if tid == 'fstring' else 1:-1]
+            elif tid == 'lparen':
+                par_count += 1
+            elif tid == 'rparen':
+                par_count -= 1
+            elif tid == 'lbracket':
+                bracket_count += 1
+            elif tid == 'rbracket':
+                bracket_count -= 1
+            elif tid == 'lcurl':
+                curl_count += 1
+            elif tid == 'rcurl':
+                curl_count -= 1
+            elif tid == 'dblquote':
+                raise ParseException('Double quotes are not supported. Use single quotes.', self.getline(line_start), lineno, col)
+            elif tid in {'multiline_string', 'multiline_fstring'}:
+                value = value[4 if tid == 'multiline_fstring' else 3:-3]
+                lines = value.split('\n')
+                if len(lines) > 1:
+                    lineno += len(lines) - 1
+                    line_start = loc - len(lines[-1])
+            elif tid == 'eol_cont':
+                lineno += 1
+                line_start = loc
+                tid = 'whitespace'
+            yield Token(tid, filename, curline_start, curline, col, bytespan, value)
 
 @dataclass
 class BaseNode:
@@ -1103,3 +1115,54 @@ class Parser:
         self.current_ws = []
 
         return block
+
+def parse_cached(code: str, filename: str, cache_dir: T.Optional[str]) -> CodeBlockNode:
+    """Parse a build file, reusing the AST stored in cache_dir if possible.
+
+    The cache has one entry per build file, which is only used if both the
+    content of the file and the version of Meson are unchanged. Files that
+    trigger warnings while being parsed are not cached, so that the warnings
+    keep being printed. Entries of files that are not used anymore are only
+    removed by `meson setup --wipe` and `--clearcache`.
+    """
+    if not cache_dir:
+        return Parser(code, filename).parse()
+
+    from .coredata import version
+    # The project tests have extra keywords
+    in_unit_test = 'MESON_RUNNING_IN_PROJECT_TESTS' in os.environ
+    key = hashlib.sha256(f'{version}\0{in_unit_test}\0{filename}\0{code}'.encode('utf-8', 'surrogateescape')).hexdigest().encode()
+    entry = os.path.join(cache_dir, hashlib.sha256(filename.encode('utf-8', 'surrogateescape')).hexdigest())
+    try:
+        with open(entry, 'rb') as f:
+            if f.read(len(key)) == key:
+                # Loading creates many objects at once, which would otherwise
+                # trigger full garbage collections of the whole heap
+                gc_enabled = gc.isenabled()
+                gc.disable()
+                try:
+                    cached = pickle.load(f)
+                finally:
+                    if gc_enabled:
+                        gc.enable()
+                if isinstance(cached, CodeBlockNode):
+                    return cached
+    except Exception:
+        # Missing or corrupted entries are not an error, parse the file again
+        pass
+
+    warnings = mlog.get_warning_count()
+    ast = Parser(code, filename).parse()
+    if mlog.get_warning_count() == warnings:
+        try:
+            data = pickle.dumps(ast)
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = f'{entry}.{os.getpid()}'
+            with open(tmp, 'wb') as f:
+                f.write(key)
+                f.write(data)
+            os.replace(tmp, entry)
+        except (OSError, RecursionError, pickle.PicklingError):
+            # Very deeply nested ASTs cannot be pickled
+            pass
+    return ast
@@ -183,6 +183,7 @@ class MesonApp:
             mlog.set_timestamp_start(time.monotonic())
         if self.options.clearcache:
             env.coredata.clear_cache()
+            mesonlib.windows_proof_rmtree(os.path.join(env.get_scratch_dir(), 'ast-cache'))
         with mesonlib.BuildDirLock(self.build_dir):
             return self._generate(env, capture, vslite_ctx)
 
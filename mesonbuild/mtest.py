@@ -13,29 +13,39 @@ import argparse
 import asyncio
 import datetime
 import enum
+import heapq
+import itertools
 import json
+import math
 import multiprocessing
 import os
 import pickle
 import platform
+import queue
 import random
 import re
 import signal
 import subprocess
 import shlex
+import shutil
 import sys
+import tempfile
 import textwrap
+import threading
 import time
 import typing as T
 import unicodedata
 import xml.etree.ElementTree as et
+import zlib
+from xml.sax.saxutils import quoteattr
 
 from . import build
+from . import coredata
 from . import environment
 from . import mlog
 from .coredata import MesonVersionMismatchException, major_versions_differ
 from .coredata import version as coredata_version
-from .mesonlib import (MesonException, OptionKey, OrderedSet, RealPathAction,
+from .mesonlib import (File, MesonException, OptionKey, OrderedSet, RealPathAction,
                        get_wine_shortpath, join_args, split_args, setup_vsenv)
 from .mintro import get_infodir, load_info_file
 from .programs import ExternalProgram
@@ -113,6 +123,22 @@ def determine_worker_count() -> int:
             num_workers = 1
     return num_workers
 
+def determine_memory_size() -> T.Optional[int]:
+    '''Return the size of the physical memory in MiB, if it can be found.'''
+    try:
+        return os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+def parse_shard(value: str) -> T.Tuple[int, int]:
+    try:
+        index, count = (int(x) for x in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'{value!r} is not of the form K/N')
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f'shard {index} does not exist, it must be between 1 and {count}')
+    return index, count
+
 # Note: when adding arguments, please also add them to the completion
 # scripts in $MESONSRC/data/shell-completions/
 def add_arguments(parser: argparse.ArgumentParser) -> None:
@@ -149,10 +175,20 @@ def add_arguments(parser: argparse.ArgumentParser) -> None:
                         help="Base name for log file.")
     parser.add_argument('-j', '--num-processes', default=determine_worker_count(), type=int,
                         help='How many parallel processes to use.')
+    parser.add_argument('--max-output-size', default=16, type=int, metavar='MIB',
+                        help='Output of a test that is kept in memory and written to the logs, per stream. '
+                        'Longer output is written to a separate file. (default: 16, 0 for no limit)')
+    parser.add_argument('--max-memory', default=determine_memory_size(), type=int, metavar='MIB',
+                        help='Memory in MiB that tests may reserve together. (default: size of the physical memory)')
     parser.add_argument('-v', '--verbose', default=False, action='store_true',
                         help='Do not redirect stdout and stderr')
     parser.add_argument('-q', '--quiet', default=False, action='store_true',
                         help='Produce less output to the terminal.')
+    parser.add_argument('--report-top', default=0, type=int, metavar='N',
+                        help='List the N tests that used the most CPU time, memory and block I/O.')
+    parser.add_argument('--bulk', default=False, action='store_true',
+                        help='Reduce the overhead of running many short tests: print results to the '
+                        'terminal in batches and report the time spent in the test harness.')
     parser.add_argument('-t', '--timeout-multiplier', type=float, default=None,
                         help='Define a multiplier for test timeout, for example '
                         ' when running tests in particular conditions they might take'
@@ -161,6 +197,24 @@ def add_arguments(parser: argparse.ArgumentParser) -> None:
                         help='Which test setup to use.')
     parser.add_argument('--test-args', default=[], type=split_args,
                         help='Arguments to pass to the specified test(s) or all tests')
+    parser.add_argument('--schedule', default='duration', choices=['duration', 'definition'],
+                        help='Start tests with the same priority in order of their duration in '
+                        'previous runs, longest first, or in order of definition. (default: duration)')
+    parser.add_argument('--failed-first', default=False, action='store_true',
+                        help='Start the tests that failed in the previous run first.')
+    parser.add_argument('--last-failed', default=False, action='store_true',
+                        help='Only run the tests that failed in the previous run, '
+                        'or all tests if none failed.')
+    parser.add_argument('--shard', default=None, type=parse_shard, metavar='K/N',
+                        help='Only run the K-th of N parts of the selected tests.')
+    parser.add_argument('--shard-history', default=None, metavar='LOGFILE',
+                        help='JSON test log of a previous run, used to balance shards by duration.')
+    parser.add_argument('--affected-by', default=[], action='append', metavar='FILE_OR_REV',
+                        help='Only run tests affected by changes to the given file, or by changes since '
+                        'the given git revision. Can be given multiple times.')
+    parser.add_argument('--merge-logs', default=[], nargs='+', metavar='LOGFILE',
+                        help='Merge the given JSON test logs, and the JUnit logs next to them, '
+                        'into the logs of this build directory instead of running tests.')
     parser.add_argument('args', nargs='*',
                         help='Optional list of test names to run. "testname" to run all tests with that name, '
                         '"subprojname:testname" to specifically run "testname" from "subprojname", '
@@ -467,6 +521,44 @@ class TAPParser:
                 else:
                     yield self.Error(f'Too many tests run (expected {self.plan.num_tests}, got {self.num_tests})')
 
+class LogWriter:
+
+    """Run the serialization and writing of a log file on a separate thread.
+
+    Work items are run in the order they are submitted. The queue is bounded,
+    so that a slow disk applies backpressure instead of buffering the output
+    of every test in memory. Errors are raised again by close().
+    """
+
+    def __init__(self, name: str) -> None:
+        self.queue: 'queue.Queue[T.Optional[T.Callable[[], object]]]' = queue.Queue(maxsize=1000)
+        self.error: T.Optional[BaseException] = None
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.thread.start()
+
+    def _run(self) -> None:
+        while True:
+            work = self.queue.get()
+            if work is None:
+                return
+            if self.error is None:
+                try:
+                    work()
+                except BaseException as e:
+                    self.error = e
+
+    def submit(self, work: T.Callable[[], object]) -> None:
+        self.queue.put(work)
+
+    def close(self) -> None:
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+
 class TestLogger:
     def flush(self) -> None:
         pass
@@ -494,11 +586,18 @@ class TestFileLogger(TestLogger):
     def __init__(self, filename: str, errors: str = 'replace') -> None:
         self.filename = filename
         self.file = open(filename, 'w', encoding='utf-8', errors=errors)
+        self.writer = LogWriter(os.path.basename(filename))
+
+    def write(self, s: str) -> None:
+        self.writer.submit(lambda: self.file.write(s))
 
     def close(self) -> None:
         if self.file:
-            self.file.close()
-            self.file = None
+            try:
+                self.writer.close()
+            finally:
+                self.file.close()
+                self.file = None
 
 
 class ConsoleLogger(TestLogger):
@@ -523,6 +622,8 @@ class ConsoleLogger(TestLogger):
         self.test_count = 0
         self.started_tests = 0
         self.spinner_index = 0
+        self.batch = False
+        self.pending_lines: T.List[str] = []
         try:
             self.cols, _ = os.get_terminal_size(1)
             self.is_tty = True
@@ -546,6 +647,19 @@ class ConsoleLogger(TestLogger):
         if self.should_erase_line:
             print(self.should_erase_line, end='')
             self.should_erase_line = ''
+        if self.pending_lines:
+            print('\n'.join(self.pending_lines), flush=True)
+            self.pending_lines = []
+
+    def print_batched(self, line: str) -> None:
+        if not self.pending_lines:
+            asyncio.get_running_loop().call_later(0.1, self.flush_batch)
+        self.pending_lines.append(line)
+
+    def flush_batch(self) -> None:
+        if self.pending_lines:
+            self.flush()
+            self.request_update()
 
     def print_progress(self, line: str) -> None:
         print(self.should_erase_line, line, sep='', end='\r')
@@ -614,10 +728,14 @@ class ConsoleLogger(TestLogger):
                     self.running_tests.add(self.progress_test)
 
                 self.emit_progress(harness)
+                if self.batch:
+                    # Redraw at most ten times per second
+                    await asyncio.sleep(0.1)
             self.flush()
 
         self.update = asyncio.Event()
         self.test_count = harness.test_count
+        self.batch = harness.options.bulk
         self.cols = max(self.cols, harness.max_left_width + 30)
 
         if self.is_tty and not harness.need_console:
@@ -689,22 +807,28 @@ class ConsoleLogger(TestLogger):
             print(f'{result.name} time out (After {result.timeout} seconds)')
 
         if not harness.options.quiet or not result.res.is_ok():
-            self.flush()
-            if result.cmdline and result.direct_stdout:
-                print(self.output_end)
-                print(harness.format(result, mlog.colorize_console(), max_left_width=self.max_left_width))
+            if self.batch and not result.verbose and not result.res.is_bad() and not result.warnings:
+                # Print the results of passing tests together, writing out
+                # each line on its own is too slow with many short tests
+                self.print_batched(harness.format(result, mlog.colorize_console(),
+                                                  max_left_width=self.max_left_width))
             else:
-                print(harness.format(result, mlog.colorize_console(), max_left_width=self.max_left_width),
-                      flush=True)
+                self.flush()
+                if result.direct_stdout and result.cmdline:
+                    print(self.output_end)
+                    print(harness.format(result, mlog.colorize_console(), max_left_width=self.max_left_width))
+                else:
+                    print(harness.format(result, mlog.colorize_console(), max_left_width=self.max_left_width),
+                          flush=True)
+                    if result.verbose or result.res.is_bad():
+                        self.print_log(harness, result)
+                if result.warnings:
+                    print(flush=True)
+                    for w in result.warnings:
+                        print(w, flush=True)
+                    print(flush=True)
                 if result.verbose or result.res.is_bad():
-                    self.print_log(harness, result)
-            if result.warnings:
-                print(flush=True)
-                for w in result.warnings:
-                    print(w, flush=True)
-                print(flush=True)
-            if result.verbose or result.res.is_bad():
-                print(flush=True)
+                    print(flush=True)
 
         self.request_update()
 
@@ -713,6 +837,7 @@ class ConsoleLogger(TestLogger):
         self.request_update()
         if self.progress_task:
             await self.progress_task
+        self.flush()
 
         if harness.collected_failures and \
                 (harness.options.print_errorlogs or harness.options.verbose):
@@ -720,17 +845,34 @@ class ConsoleLogger(TestLogger):
             for i, result in enumerate(harness.collected_failures, 1):
                 print(harness.format(result, mlog.colorize_console()))
 
+        if harness.options.report_top > 0:
+            print()
+            print(harness.format_report_top())
+
         print(harness.summary())
+        if harness.predicted_duration is not None and harness.actual_duration is not None:
+            print(f'Predicted duration: {harness.predicted_duration:.2f}s, '
+                  f'actual duration: {harness.actual_duration:.2f}s')
+        if self.batch and harness.harness_time is not None and harness.test_count:
+            per_test = harness.harness_time / harness.test_count * 1000
+            print(f'Time spent in tests: {harness.test_time:.2f}s, '
+                  f'harness overhead: {harness.harness_time:.2f}s of CPU time ({per_test:.2f} ms per test)')
 
 
 class TextLogfileBuilder(TestFileLogger):
     def start(self, harness: 'TestHarness') -> None:
-        self.file.write(f'Log of Meson test suite run on {datetime.datetime.now().isoformat()}\n\n')
+        self.write(f'Log of Meson test suite run on {datetime.datetime.now().isoformat()}\n\n')
         inherit_env = env_tuple_to_str(os.environ.items())
-        self.file.write(f'Inherited environment: {inherit_env}\n\n')
+        self.write(f'Inherited environment: {inherit_env}\n\n')
 
     def log(self, harness: 'TestHarness', result: 'TestRun') -> None:
         title = f'{result.num}/{harness.test_count}'
+        name = 'stdout' if harness.options.split else 'output'
+        self.writer.submit(lambda: self._write_result(title, name, result))
+
+    def _write_result(self, title: str, name: str, result: 'TestRun') -> None:
+        # Runs on the writer thread, the result is not modified anymore
+        # once it has been logged.
         self.file.write(dashes(title, '=', 78) + '\n')
         self.file.write('test:         ' + result.name + '\n')
         starttime_str = time.strftime("%H:%M:%S", time.gmtime(result.starttime))
@@ -740,7 +882,6 @@ class TextLogfileBuilder(TestFileLogger):
         if result.cmdline:
             self.file.write('command:      ' + result.cmdline + '\n')
         if result.stdo:
-            name = 'stdout' if harness.options.split else 'output'
             self.file.write(dashes(name, '-', 78) + '\n')
             self.file.write(result.stdo)
         if result.stde:
@@ -750,10 +891,10 @@ class TextLogfileBuilder(TestFileLogger):
 
     async def finish(self, harness: 'TestHarness') -> None:
         if harness.collected_failures:
-            self.file.write("\nSummary of Failures:\n\n")
+            self.write("\nSummary of Failures:\n\n")
             for i, result in enumerate(harness.collected_failures, 1):
-                self.file.write(harness.format(result, False) + '\n')
-        self.file.write(harness.summary())
+                self.write(harness.format(result, False) + '\n')
+        self.write(harness.summary())
 
         print(f'Full log written to {self.filename}')
 
@@ -772,17 +913,26 @@ class JsonLogfileBuilder(TestFileLogger):
         }
         if result.stde:
             jresult['stderr'] = result.stde
-        self.file.write(json.dumps(jresult) + '\n')
+        if result.stdo_file:
+            jresult['stdout_file'] = result.stdo_file
+        if result.stde_file:
+            jresult['stderr_file'] = result.stde_file
+        if result.resources is not None:
+            jresult['resources'] = result.resources
+        self.writer.submit(lambda: self.file.write(json.dumps(jresult) + '\n'))
 
 
 class JunitBuilder(TestLogger):
 
     """Builder for Junit test results.
 
-    Junit is impossible to stream out, it requires attributes counting the
-    total number of tests, failures, skips, and errors in the root element
-    and in each test suite. As such, we use a builder class to track each
-    test case, and calculate all metadata before writing it out.
+    Junit is impossible to stream out in order, it requires attributes
+    counting the total number of tests, failures, skips, and errors in the
+    root element and in each test suite. As such, each test case is
+    serialized as soon as it is logged and spooled to a temporary file,
+    while only the counts of each test suite are kept in memory. The suites
+    are assembled from the spooled test cases once all metadata is known.
+    All of this happens on a separate thread.
 
     For tests with multiple results (like from a TAP test), we record the
     test as a suite with the project_name.test_name. This allows us to track
@@ -794,12 +944,30 @@ class JunitBuilder(TestLogger):
 
     def __init__(self, filename: str) -> None:
         self.filename = filename
-        self.root = et.Element(
-            'testsuites', tests='0', errors='0', failures='0')
-        self.suites: T.Dict[str, et.Element] = {}
+        self.spool = tempfile.TemporaryFile()
+        self.spool_size = 0
+        self.writer = LogWriter(os.path.basename(filename))
+        # Complete suites, from the Junit XML written by the tests themselves
+        self.test_suites: T.List[T.Tuple[int, int]] = []
+        self.suites: T.Dict[str, JunitSuite] = {}
+
+    def spool_element(self, element: et.Element, chunks: T.List[T.Tuple[int, int]]) -> None:
+        data = et.tostring(element, encoding='utf-8')
+        self.spool.write(data)
+        if chunks and sum(chunks[-1]) == self.spool_size:
+            chunks[-1] = (chunks[-1][0], chunks[-1][1] + len(data))
+        else:
+            chunks.append((self.spool_size, len(data)))
+        self.spool_size += len(data)
 
     def log(self, harness: 'TestHarness', test: 'TestRun') -> None:
         """Log a single test case."""
+        repeat = harness.options.repeat
+        self.writer.submit(lambda: self._log(test, repeat))
+
+    def _log(self, test: 'TestRun', repeat: int) -> None:
+        # Runs on the writer thread, the result is not modified anymore
+        # once it has been logged.
         if test.junit is not None:
             for suite in test.junit.findall('.//testsuite'):
                 # Assume that we don't need to merge anything here...
@@ -814,7 +982,7 @@ class JunitBuilder(TestLogger):
                     del case.attrib['file']
                 for case in suite.findall('.//testcase[@line]'):
                     del case.attrib['line']
-                self.root.append(suite)
+                self.spool_element(suite, self.test_suites)
             return
 
         # In this case we have a test binary with multiple results.
@@ -822,24 +990,16 @@ class JunitBuilder(TestLogger):
         # separately
         if test.results:
             suitename = f'{test.project}.{test.name}'
-            assert suitename not in self.suites or harness.options.repeat > 1, 'duplicate suite'
-
-            suite = self.suites[suitename] = et.Element(
-                'testsuite',
-                name=suitename,
-                tests=str(len(test.results)),
-                errors=str(sum(1 for r in test.results if r.result in
-                               {TestResult.INTERRUPT, TestResult.ERROR})),
-                failures=str(sum(1 for r in test.results if r.result in
-                                 {TestResult.FAIL, TestResult.UNEXPECTEDPASS, TestResult.TIMEOUT})),
-                skipped=str(sum(1 for r in test.results if r.result is TestResult.SKIP)),
-                time=str(test.duration),
-            )
+            assert suitename not in self.suites or repeat > 1, 'duplicate suite'
 
+            junit_suite = self.suites[suitename] = JunitSuite(suitename, test.duration)
+            if test.resources is not None:
+                self.spool_element(self.properties(test.resources), junit_suite.chunks)
             for subtest in test.results:
+                junit_suite.count(subtest.result)
                 # Both name and classname are required. Use the suite name as
                 # the class name, so that e.g. GitLab groups testcases correctly.
-                testcase = et.SubElement(suite, 'testcase', name=str(subtest), classname=suitename)
+                testcase = et.Element('testcase', name=str(subtest), classname=suitename)
                 if subtest.result is TestResult.SKIP:
                     et.SubElement(testcase, 'skipped')
                 elif subtest.result is TestResult.ERROR:
@@ -857,50 +1017,106 @@ class JunitBuilder(TestLogger):
                     fail.text = 'Test did not finish before configured timeout.'
                 if subtest.explanation:
                     et.SubElement(testcase, 'system-out').text = subtest.explanation
+                self.spool_element(testcase, junit_suite.chunks)
             if test.stdo:
-                out = et.SubElement(suite, 'system-out')
+                out = et.Element('system-out')
                 out.text = replace_unencodable_xml_chars(test.stdo.rstrip())
+                self.spool_element(out, junit_suite.chunks)
             if test.stde:
-                err = et.SubElement(suite, 'system-err')
+                err = et.Element('system-err')
                 err.text = replace_unencodable_xml_chars(test.stde.rstrip())
+                self.spool_element(err, junit_suite.chunks)
         else:
             if test.project not in self.suites:
-                suite = self.suites[test.project] = et.Element(
-                    'testsuite', name=test.project, tests='1', errors='0',
-                    failures='0', skipped='0', time=str(test.duration))
+                junit_suite = self.suites[test.project] = JunitSuite(test.project, test.duration)
             else:
-                suite = self.suites[test.project]
-                suite.attrib['tests'] = str(int(suite.attrib['tests']) + 1)
-
-            testcase = et.SubElement(suite, 'testcase', name=test.name,
-                                     classname=test.project, time=str(test.duration))
+                junit_suite = self.suites[test.project]
+
+            testcase = et.Element('testcase', name=test.name,
+                                  classname=test.project, time=str(test.duration))
+            if test.resources is not None:
+                testcase.append(self.properties(test.resources))
+            # Other results are not reflected in the counts of exit-code tests
+            if test.res in {TestResult.SKIP, TestResult.ERROR, TestResult.FAIL}:
+                junit_suite.count(test.res)
+            else:
+                junit_suite.count(TestResult.OK)
             if test.res is TestResult.SKIP:
                 et.SubElement(testcase, 'skipped')
-                suite.attrib['skipped'] = str(int(suite.attrib['skipped']) + 1)
             elif test.res is TestResult.ERROR:
                 et.SubElement(testcase, 'error')
-                suite.attrib['errors'] = str(int(suite.attrib['errors']) + 1)
             elif test.res is TestResult.FAIL:
                 et.SubElement(testcase, 'failure')
-                suite.attrib['failures'] = str(int(suite.attrib['failures']) + 1)
             if test.stdo:
                 out = et.SubElement(testcase, 'system-out')
                 out.text = replace_unencodable_xml_chars(test.stdo.rstrip())
             if test.stde:
                 err = et.SubElement(testcase, 'system-err')
                 err.text = replace_unencodable_xml_chars(test.stde.rstrip())
+            self.spool_element(testcase, junit_suite.chunks)
+
+    @staticmethod
+    def properties(values: T.Dict[str, T.Any]) -> et.Element:
+        properties = et.Element('properties')
+        for name, value in values.items():
+            et.SubElement(properties, 'property', name=name, value=str(value))
+        return properties
 
     async def finish(self, harness: 'TestHarness') -> None:
+        self.writer.submit(self._write_xml)
+
+    def _write_xml(self) -> None:
         """Calculate total test counts and write out the xml result."""
-        for suite in self.suites.values():
-            self.root.append(suite)
-            # Skipped is really not allowed in the "testsuits" element
-            for attr in ['tests', 'errors', 'failures']:
-                self.root.attrib[attr] = str(int(self.root.attrib[attr]) + int(suite.attrib[attr]))
+        # Skipped is really not allowed in the "testsuits" element
+        totals = {'tests': 0, 'errors': 0, 'failures': 0}
+        for junit_suite in self.suites.values():
+            for attr in totals:
+                totals[attr] += junit_suite.attrib[attr]
+
+        def start_tag(tag: str, attrib: T.Dict[str, T.Any]) -> bytes:
+            attrs = ''.join(f' {k}={quoteattr(str(v))}' for k, v in attrib.items())
+            return f'<{tag}{attrs}>'.encode('utf-8')
+
+        def copy_chunks(chunks: T.List[T.Tuple[int, int]], f: T.BinaryIO) -> None:
+            for offset, size in chunks:
+                self.spool.seek(offset)
+                f.write(self.spool.read(size))
 
-        tree = et.ElementTree(self.root)
         with open(self.filename, 'wb') as f:
-            tree.write(f, encoding='utf-8', xml_declaration=True)
+            f.write(b"<?xml version='1.0' encoding='utf-8'?>\n")
+            f.write(start_tag('testsuites', totals))
+            copy_chunks(self.test_suites, f)
+            for junit_suite in self.suites.values():
+                f.write(start_tag('testsuite', junit_suite.attrib))
+                copy_chunks(junit_suite.chunks, f)
+                f.write(b'</testsuite>')
+            f.write(b'</testsuites>')
+
+    def close(self) -> None:
+        try:
+            self.writer.close()
+        finally:
+            self.spool.close()
+
+
+class JunitSuite:
+
+    """Counts and spooled test cases of a Junit test suite."""
+
+    def __init__(self, name: str, duration: T.Optional[float]) -> None:
+        self.attrib: T.Dict[str, T.Any] = {
+            'name': name, 'tests': 0, 'errors': 0, 'failures': 0, 'skipped': 0, 'time': duration,
+        }
+        self.chunks: T.List[T.Tuple[int, int]] = []
+
+    def count(self, result: TestResult) -> None:
+        self.attrib['tests'] += 1
+        if result in {TestResult.INTERRUPT, TestResult.ERROR}:
+            self.attrib['errors'] += 1
+        elif result in {TestResult.FAIL, TestResult.UNEXPECTEDPASS, TestResult.TIMEOUT}:
+            self.attrib['failures'] += 1
+        elif result is TestResult.SKIP:
+            self.attrib['skipped'] += 1
 
 
 class TestRun:
@@ -923,8 +1139,12 @@ class TestRun:
         self.duration: T.Optional[float] = None
         self.stdo = ''
         self.stde = ''
+        self.stdo_file: T.Optional[str] = None
+        self.stde_file: T.Optional[str] = None
+        self.resources: T.Optional[T.Dict[str, T.Union[int, float]]] = None
         self.additional_error = ''
         self.cmd: T.Optional[T.List[str]] = None
+        self._cmdline: T.Optional[str] = None
         self.env = test_env
         self.should_fail = test.should_fail
         self.project = test.project_name
@@ -937,6 +1157,7 @@ class TestRun:
         self.res = TestResult.RUNNING
         self.starttime = time.time()
         self.cmd = cmd
+        self._cmdline = None
 
     @property
     def num(self) -> int:
@@ -986,9 +1207,11 @@ class TestRun:
     def cmdline(self) -> T.Optional[str]:
         if not self.cmd:
             return None
-        test_only_env = set(self.env.items()) - set(os.environ.items())
-        return env_tuple_to_str(test_only_env) + \
-            ' '.join(sh_quote(x) for x in self.cmd)
+        if self._cmdline is None:
+            test_only_env = set(self.env.items()) - set(os.environ.items())
+            self._cmdline = env_tuple_to_str(test_only_env) + \
+                ' '.join(sh_quote(x) for x in self.cmd)
+        return self._cmdline
 
     def complete_skip(self) -> None:
         self.starttime = time.time()
@@ -1176,10 +1399,55 @@ def decode(stream: T.Union[None, bytes]) -> str:
     except UnicodeDecodeError:
         return stream.decode('iso-8859-1', errors='ignore')
 
+class OutputCollector:
+
+    """Collect the output of a test while keeping memory usage bounded.
+
+    Only the last max_size characters are kept in memory. Once the output
+    grows beyond that, all of it is spooled to spool_file, if given.
+    """
+
+    def __init__(self, max_size: int, spool_file: T.Optional[str] = None) -> None:
+        self.max_size = max_size
+        self.spool_file = spool_file
+        self.file: T.Optional[T.TextIO] = None
+        self.lines: T.Deque[str] = deque()
+        self.size = 0
+        self.total_size = 0
+
+    def append(self, line: str) -> None:
+        self.lines.append(line)
+        self.size += len(line)
+        self.total_size += len(line)
+        if self.file:
+            self.file.write(line)
+        if not self.max_size or self.size <= self.max_size:
+            return
+        if not self.file and self.spool_file:
+            os.makedirs(os.path.dirname(self.spool_file), exist_ok=True)
+            self.file = open(self.spool_file, 'w', encoding='utf-8', errors='surrogateescape')
+            self.file.writelines(self.lines)
+        while self.size > self.max_size and len(self.lines) > 1:
+            self.size -= len(self.lines.popleft())
+
+    def close(self) -> None:
+        if self.file:
+            self.file.close()
+
+    def getvalue(self) -> str:
+        text = ''.join(self.lines)
+        omitted = self.total_size - self.size
+        if omitted:
+            where = f', see {self.spool_file}' if self.file else ''
+            text = f'[{omitted} characters of output omitted{where}]\n' + text
+        return text
+
 async def read_decode(reader: asyncio.StreamReader,
                       queue: T.Optional['asyncio.Queue[T.Optional[str]]'],
-                      console_mode: ConsoleUser) -> str:
-    stdo_lines = []
+                      console_mode: ConsoleUser,
+                      output: T.Optional[OutputCollector] = None) -> str:
+    if output is None:
+        output = OutputCollector(0)
     try:
         while not reader.at_eof():
             # Prefer splitting by line, as that produces nicer output
@@ -1191,15 +1459,16 @@ async def read_decode(reader: asyncio.StreamReader,
                 line_bytes = await reader.readexactly(e.consumed)
             if line_bytes:
                 line = decode(line_bytes)
-                stdo_lines.append(line)
+                output.append(line)
                 if console_mode is ConsoleUser.STDOUT:
                     print(line, end='', flush=True)
                 if queue:
                     await queue.put(line)
-        return ''.join(stdo_lines)
+        return output.getvalue()
     except asyncio.CancelledError:
-        return ''.join(stdo_lines)
+        return output.getvalue()
     finally:
+        output.close()
         if queue:
             await queue.put(None)
 
@@ -1268,8 +1537,175 @@ async def complete_all(futures: T.Iterable[asyncio.Future],
     check_futures(futures)
 
 
+class TestResources:
+
+    """Admission control for tests that need more than one CPU or a lot of memory.
+
+    Tests are admitted in the order they ask for resources, so that a test
+    which needs many CPUs is not overtaken forever by smaller tests. A test
+    that asks for more than is available gets everything instead, which
+    means that it runs alone.
+    """
+
+    def __init__(self, cpus: int, memory: T.Optional[int]) -> None:
+        self.total_cpus = cpus
+        self.total_memory = memory
+        self.cpus = cpus
+        self.memory = memory or 0
+        self.waiters: T.Deque[T.Tuple[int, int, asyncio.Future]] = deque()
+
+    def clamp(self, cpus: int, memory: int) -> T.Tuple[int, int]:
+        cpus = max(1, min(cpus, self.total_cpus))
+        memory = 0 if self.total_memory is None else min(memory, self.total_memory)
+        return cpus, memory
+
+    def fits(self, cpus: int, memory: int) -> bool:
+        return cpus <= self.cpus and memory <= self.memory
+
+    async def acquire(self, cpus: int, memory: int) -> None:
+        if not self.waiters and self.fits(cpus, memory):
+            self.cpus -= cpus
+            self.memory -= memory
+            return
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.append((cpus, memory, future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The resources were granted just before the cancellation
+                self.release(cpus, memory)
+            else:
+                self.wake_up()
+            raise
+
+    def release(self, cpus: int, memory: int) -> None:
+        self.cpus += cpus
+        self.memory += memory
+        self.wake_up()
+
+    def wake_up(self) -> None:
+        while self.waiters:
+            cpus, memory, future = self.waiters[0]
+            if future.cancelled():
+                self.waiters.popleft()
+                continue
+            if not self.fits(cpus, memory):
+                break
+            self.waiters.popleft()
+            self.cpus -= cpus
+            self.memory -= memory
+            future.set_result(None)
+
+
+def get_resource_usage(rusage: T.Any) -> T.Dict[str, T.Union[int, float]]:
+    '''Convert the resource usage returned by os.wait4() for the logs.'''
+    max_rss = rusage.ru_maxrss
+    if sys.platform == 'darwin':
+        # Reported in bytes instead of KiB
+        max_rss //= 1024
+    return {
+        'user_time': rusage.ru_utime,
+        'system_time': rusage.ru_stime,
+        'max_rss': max_rss,
+        'block_input': rusage.ru_inblock,
+        'block_output': rusage.ru_oublock,
+        'voluntary_context_switches': rusage.ru_nvcsw,
+        'involuntary_context_switches': rusage.ru_nivcsw,
+    }
+
+class TestProcess:
+
+    """A test process that is reaped with os.wait4(), which also returns the
+    resources used by the process and the children it waited for.
+
+    asyncio reaps its subprocesses itself and drops their resource usage,
+    so the process is started with subprocess.Popen and its pipes are
+    connected to the event loop. Only what TestSubprocess needs from
+    asyncio.subprocess.Process is provided.
+    """
+
+    def __init__(self, popen: subprocess.Popen, loop: asyncio.AbstractEventLoop) -> None:
+        self._popen = popen
+        self._loop = loop
+        self._transports: T.List[asyncio.BaseTransport] = []
+        self._exited: asyncio.Future[int] = loop.create_future()
+        self.pid = popen.pid
+        self.returncode: T.Optional[int] = None
+        self.rusage: T.Optional[T.Any] = None
+        self.stdout: T.Optional[asyncio.StreamReader] = None
+        self.stderr: T.Optional[asyncio.StreamReader] = None
+
+    @classmethod
+    async def create(cls, args: T.List[str], **kwargs: T.Any) -> 'TestProcess':
+        p = cls(subprocess.Popen(args, **kwargs), asyncio.get_running_loop())
+        try:
+            if p._popen.stdout:
+                p.stdout = await p._connect(p._popen.stdout)
+            if p._popen.stderr:
+                p.stderr = await p._connect(p._popen.stderr)
+        finally:
+            p._watch()
+        return p
+
+    async def _connect(self, pipe: T.IO[bytes]) -> asyncio.StreamReader:
+        reader = asyncio.StreamReader()
+        transport, _ = await self._loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), pipe)
+        self._transports.append(transport)
+        return reader
+
+    def _watch(self) -> None:
+        # A pidfd becomes readable when the process exits, which avoids
+        # a thread blocked in os.wait4() for every test.
+        try:
+            pidfd = os.pidfd_open(self.pid)
+        except (AttributeError, OSError):
+            threading.Thread(target=self._wait_thread, daemon=True).start()
+        else:
+            self._loop.add_reader(pidfd, self._pidfd_ready, pidfd)
+
+    def _pidfd_ready(self, pidfd: int) -> None:
+        self._loop.remove_reader(pidfd)
+        os.close(pidfd)
+        self._set_exited(*self._wait4())
+
+    def _wait_thread(self) -> None:
+        result = self._wait4()
+        # The event loop may be gone if meson test was interrupted
+        with suppress(RuntimeError):
+            self._loop.call_soon_threadsafe(self._set_exited, *result)
+
+    def _wait4(self) -> T.Tuple[int, T.Optional[T.Any]]:
+        try:
+            _, status, rusage = os.wait4(self.pid, 0)
+        except ChildProcessError:
+            # Reaped by someone else, like asyncio does report it as 255
+            return 255, None
+        if os.WIFSIGNALED(status):
+            return -os.WTERMSIG(status), rusage
+        return os.WEXITSTATUS(status), rusage
+
+    def _set_exited(self, returncode: int, rusage: T.Optional[T.Any]) -> None:
+        self.returncode = self._popen.returncode = returncode
+        self.rusage = rusage
+        if not self._exited.done():
+            self._exited.set_result(returncode)
+
+    async def wait(self) -> int:
+        return await asyncio.shield(self._exited)
+
+    def kill(self) -> None:
+        # Popen.kill() could reap the process behind our back
+        if self.returncode is None:
+            os.kill(self.pid, signal.SIGKILL)
+
+    def close(self) -> None:
+        for transport in self._transports:
+            transport.close()
+
+
 class TestSubprocess:
-    def __init__(self, p: asyncio.subprocess.Process,
+    def __init__(self, p: T.Union[asyncio.subprocess.Process, TestProcess],
                  stdout: T.Optional[int], stderr: T.Optional[int],
                  postwait_fn: T.Callable[[], None] = None):
         self._process = p
@@ -1282,22 +1718,31 @@ class TestSubprocess:
         self.queue: T.Optional[asyncio.Queue[T.Optional[str]]] = None
 
     def stdout_lines(self) -> T.AsyncIterator[str]:
-        self.queue = asyncio.Queue()
+        # Bounded, so that reading the output waits for the parser
+        self.queue = asyncio.Queue(maxsize=1000)
         return queue_iter(self.queue)
 
     def communicate(self,
                     test: 'TestRun',
-                    console_mode: ConsoleUser) -> T.Tuple[T.Optional[T.Awaitable[str]],
-                                                          T.Optional[T.Awaitable[str]]]:
+                    console_mode: ConsoleUser,
+                    max_size: int = 0,
+                    spool_base: T.Optional[str] = None) -> T.Tuple[T.Optional[T.Awaitable[str]],
+                                                                   T.Optional[T.Awaitable[str]]]:
         async def collect_stdo(test: 'TestRun',
                                reader: asyncio.StreamReader,
                                console_mode: ConsoleUser) -> None:
-            test.stdo = await read_decode(reader, self.queue, console_mode)
+            output = OutputCollector(max_size, spool_base and spool_base + '.stdout.txt')
+            test.stdo = await read_decode(reader, self.queue, console_mode, output)
+            if output.file:
+                test.stdo_file = output.spool_file
 
         async def collect_stde(test: 'TestRun',
                                reader: asyncio.StreamReader,
                                console_mode: ConsoleUser) -> None:
-            test.stde = await read_decode(reader, None, console_mode)
+            output = OutputCollector(max_size, spool_base and spool_base + '.stderr.txt')
+            test.stde = await read_decode(reader, None, console_mode, output)
+            if output.file:
+                test.stde_file = output.spool_file
 
         # asyncio.ensure_future ensures that printing can
         # run in the background, even before it is awaited
@@ -1378,6 +1823,10 @@ class TestSubprocess:
                 self.postwait_fn()
 
         test.returncode = p.returncode or 0
+        if isinstance(p, TestProcess):
+            p.close()
+            if p.rusage is not None:
+                test.resources = get_resource_usage(p.rusage)
 
 class SingleTestRunner:
 
@@ -1481,6 +1930,14 @@ class SingleTestRunner:
     def visible_name(self) -> str:
         return self.runobj.name
 
+    @property
+    def cpus(self) -> int:
+        return self.test.cpus
+
+    @property
+    def memory(self) -> int:
+        return self.test.memory
+
     @property
     def timeout(self) -> T.Optional[int]:
         return self.runobj.timeout
@@ -1507,28 +1964,40 @@ class SingleTestRunner:
             signal.signal(signal.SIGINT, signal.SIG_IGN)
 
         def preexec_fn() -> None:
-            if self.options.interactive:
-                # Restore the SIGINT handler for the child process to
-                # ensure it can handle it.
-                signal.signal(signal.SIGINT, signal.SIG_DFL)
-            else:
-                # We don't want setsid() in gdb because gdb needs the
-                # terminal in order to handle ^C and not show tcsetpgrp()
-                # errors avoid not being able to use the terminal.
-                os.setsid()
+            # Restore the SIGINT handler for the child process to
+            # ensure it can handle it.
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
 
         def postwait_fn() -> None:
             if self.options.interactive:
                 # Let us accept ^C again
                 signal.signal(signal.SIGINT, previous_sigint_handler)
 
-        p = await asyncio.create_subprocess_exec(*args,
-                                                 stdin=stdin,
-                                                 stdout=stdout,
-                                                 stderr=stderr,
-                                                 env=env,
-                                                 cwd=cwd,
-                                                 preexec_fn=preexec_fn if not is_windows() else None)
+        # We don't want setsid() in gdb because gdb needs the terminal in
+        # order to handle ^C and not show tcsetpgrp() errors avoid not being
+        # able to use the terminal. Otherwise, do not run any Python code in
+        # the child: without a preexec_fn, Python can use vfork(), which is
+        # much faster than fork() with a large parent process.
+        interactive = self.options.interactive and not is_windows()
+        p: T.Union[asyncio.subprocess.Process, TestProcess]
+        if hasattr(os, 'wait4'):
+            p = await TestProcess.create(args,
+                                         stdin=stdin,
+                                         stdout=stdout,
+                                         stderr=stderr,
+                                         env=env,
+                                         cwd=cwd,
+                                         start_new_session=not self.options.interactive,
+                                         preexec_fn=preexec_fn if interactive else None)
+        else:
+            p = await asyncio.create_subprocess_exec(*args,
+                                                     stdin=stdin,
+                                                     stdout=stdout,
+                                                     stderr=stderr,
+                                                     env=env,
+                                                     cwd=cwd,
+                                                     start_new_session=not self.options.interactive and not is_windows(),
+                                                     preexec_fn=preexec_fn if interactive else None)
         return TestSubprocess(p, stdout=stdout, stderr=stderr,
                               postwait_fn=postwait_fn if not is_windows() else None)
 
@@ -1564,7 +2033,9 @@ class SingleTestRunner:
         else:
             parse_task = None
 
-        stdo_task, stde_task = p.communicate(self.runobj, self.console_mode)
+        stdo_task, stde_task = p.communicate(self.runobj, self.console_mode,
+                                             self.options.max_output_size * 1024 * 1024,
+                                             harness.get_output_spool_base(self.runobj))
         await p.wait(self.runobj)
 
         if parse_task:
@@ -1595,6 +2066,15 @@ class TestHarness:
         self.loggers.append(self.console_logger)
         self.need_console = False
         self.ninja: T.List[str] = None
+        self.duration_history: T.Dict[str, float] = {}
+        self.previous_failures: T.Optional[T.Set[str]] = None
+        self.output_counter = itertools.count(1)
+        self.predicted_duration: T.Optional[float] = None
+        self.actual_duration: T.Optional[float] = None
+        self.harness_time: T.Optional[float] = None
+        self.test_time = 0.0
+        self.resource_usage: T.List[T.Tuple[str, T.Dict[str, T.Union[int, float]]]] = []
+        self.setup_cache: T.Dict[T.Optional[str], T.Tuple[argparse.Namespace, T.Dict[str, str]]] = {}
 
         self.logfile_base: T.Optional[str] = None
         if self.options.logbase and not self.options.interactive:
@@ -1652,9 +2132,11 @@ class TestHarness:
                     if ret.returncode != 0:
                         raise TestException(f'Could not configure {self.options.wd!r}')
 
-            self.build_data = build.load(os.getcwd())
+            # Only the test setups are needed to run tests, the whole build
+            # is only loaded when the targets are needed
+            default_setup, self.test_setups = build.load_test_setups(os.getcwd())
             if not self.options.setup:
-                self.options.setup = self.build_data.test_setup_default_name
+                self.options.setup = default_setup
             if self.options.benchmark:
                 self.tests = self.load_tests('meson_benchmark_setup.dat')
             else:
@@ -1683,14 +2165,14 @@ class TestHarness:
 
     def get_test_setup(self, test: T.Optional[TestSerialisation]) -> build.TestSetup:
         if ':' in self.options.setup:
-            if self.options.setup not in self.build_data.test_setups:
+            if self.options.setup not in self.test_setups:
                 sys.exit(f"Unknown test setup '{self.options.setup}'.")
-            return self.build_data.test_setups[self.options.setup]
+            return self.test_setups[self.options.setup]
         else:
             full_name = test.project_name + ":" + self.options.setup
-            if full_name not in self.build_data.test_setups:
+            if full_name not in self.test_setups:
                 sys.exit(f"Test setup '{self.options.setup}' not found from project '{test.project_name}'.")
-            return self.build_data.test_setups[full_name]
+            return self.test_setups[full_name]
 
     def merge_setup_options(self, options: argparse.Namespace, test: TestSerialisation) -> T.Dict[str, str]:
         current = self.get_test_setup(test)
@@ -1709,14 +2191,26 @@ class TestHarness:
             sys.exit('Conflict: both test setup and command line specify an exe wrapper.')
         return current.env.get_env(os.environ.copy())
 
+    def get_setup_options(self, test: TestSerialisation) -> T.Tuple[argparse.Namespace, T.Dict[str, str]]:
+        # The options and environment only depend on the test setup, compute
+        # them once for all tests of a project instead of for every test.
+        key = None
+        if self.options.setup:
+            key = self.options.setup if ':' in self.options.setup else test.project_name
+        if key not in self.setup_cache:
+            options = deepcopy(self.options)
+            if self.options.setup:
+                env = self.merge_setup_options(options, test)
+            else:
+                env = os.environ.copy()
+            self.setup_cache[key] = (options, env)
+        return self.setup_cache[key]
+
     def get_test_runner(self, test: TestSerialisation, iteration: int) -> SingleTestRunner:
         name = self.get_pretty_suite(test)
-        options = deepcopy(self.options)
-        if self.options.setup:
-            env = self.merge_setup_options(options, test)
-        else:
-            env = os.environ.copy()
-        test_env = test.env.get_env(env)
+        options, setup_env = self.get_setup_options(test)
+        env = setup_env.copy()
+        test_env = test.env.get_env(setup_env)
         env.update(test_env)
         if (test.is_cross_built and test.needs_exe_wrapper and
                 test.exe_wrapper and test.exe_wrapper.found()):
@@ -1742,6 +2236,12 @@ class TestHarness:
 
         if result.res.is_bad():
             self.collected_failures.append(result)
+        if result.resources is not None and self.options.report_top > 0:
+            self.resource_usage.append((result.name, result.resources))
+        if result.duration is not None:
+            self.test_time += result.duration
+            if result.res is not TestResult.INTERRUPT:
+                self.duration_history[result.name] = result.duration
         for l in self.loggers:
             l.log(self, result)
 
@@ -1786,6 +2286,26 @@ class TestHarness:
                 right += '   ' + details
         return prefix + left + middle + right
 
+    def format_report_top(self) -> str:
+        if not self.resource_usage:
+            return 'The resource usage of tests is not available on this platform.'
+        count = self.options.report_top
+        lines: T.List[str] = []
+
+        def report(title: str, key: T.Callable[[T.Dict[str, T.Any]], T.Union[int, float]],
+                   fmt: T.Callable[[T.Union[int, float]], str]) -> None:
+            lines.append(title)
+            for name, resources in heapq.nlargest(count, self.resource_usage, key=lambda x: key(x[1])):
+                lines.append(f'{fmt(key(resources)):>12}  {name}')
+
+        report(f'Top {count} tests by CPU time (user + system):',
+               lambda r: r['user_time'] + r['system_time'], lambda v: f'{v:.2f}s')
+        report(f'Top {count} tests by peak memory (max RSS):',
+               lambda r: r['max_rss'], lambda v: f'{v / 1024:.1f} MiB')
+        report(f'Top {count} tests by block I/O (input + output operations):',
+               lambda r: r['block_input'] + r['block_output'], str)
+        return '\n'.join(lines)
+
     def summary(self) -> str:
         return textwrap.dedent('''
             Ok:                 {:<4}
@@ -1821,9 +2341,10 @@ class TestHarness:
         startdir = os.getcwd()
         try:
             os.chdir(self.options.wd)
+            self.load_duration_history()
             runners: T.List[SingleTestRunner] = []
             for i in range(self.options.repeat):
-                runners.extend(self.get_test_runner(test, i) for test in tests)
+                runners.extend(self.schedule_runners([self.get_test_runner(test, i) for test in tests]))
                 if i == 0:
                     self.duration_max_len = max(len(str(int(runner.timeout or 99)))
                                                 for runner in runners)
@@ -1832,11 +2353,92 @@ class TestHarness:
                                             for runner in runners)
 
             self.test_count = len(runners)
-            self.run_tests(runners)
+            self.predicted_duration = self.predict_duration(runners)
+            try:
+                self.run_tests(runners)
+            finally:
+                self.save_duration_history()
         finally:
             os.chdir(startdir)
         return self.total_failure_count()
 
+    def get_duration_history_file(self) -> str:
+        if self.options.benchmark:
+            return os.path.join('meson-private', 'benchmark_durations.json')
+        return os.path.join('meson-private', 'test_durations.json')
+
+    def load_duration_history(self) -> None:
+        try:
+            with open(self.get_duration_history_file(), encoding='utf-8') as f:
+                history = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(history, dict):
+            self.duration_history = {k: float(v) for k, v in history.items()
+                                     if isinstance(v, (int, float))}
+
+    def save_duration_history(self) -> None:
+        filename = self.get_duration_history_file()
+        tempfilename = filename + '~'
+        try:
+            with open(tempfilename, 'w', encoding='utf-8') as f:
+                json.dump(self.duration_history, f, sort_keys=True)
+            os.replace(tempfilename, filename)
+        except OSError:
+            pass
+
+    def get_expected_duration(self, runner: SingleTestRunner) -> float:
+        # Tests that never ran could take arbitrarily long, start them early
+        return self.duration_history.get(runner.visible_name, math.inf)
+
+    def schedule_runners(self, runners: T.List[SingleTestRunner]) -> T.List[SingleTestRunner]:
+        '''Start the tests that took longest in previous runs first.
+
+        With a fixed number of processes, starting a long test last makes the
+        whole run take as long as that test after all others are done. The
+        order of tests with a different priority is kept, and non-parallel
+        tests still separate the tests that were defined before them from
+        those that were defined after them. With --failed-first, tests that
+        failed in the previous run still come before all others.
+        '''
+        if self.options.schedule == 'definition':
+            return runners
+
+        failed = self.get_previous_failures() if self.options.failed_first else set()
+
+        def sort_key(runner: SingleTestRunner) -> T.Tuple[bool, int, float]:
+            return (runner.visible_name not in failed, -runner.test.priority,
+                    -self.get_expected_duration(runner))
+
+        scheduled: T.List[SingleTestRunner] = []
+        group: T.List[SingleTestRunner] = []
+        for runner in runners:
+            if runner.is_parallel:
+                group.append(runner)
+                continue
+            scheduled.extend(sorted(group, key=sort_key))
+            scheduled.append(runner)
+            group = []
+        scheduled.extend(sorted(group, key=sort_key))
+        return scheduled
+
+    def predict_duration(self, runners: T.List[SingleTestRunner]) -> T.Optional[float]:
+        '''Simulate the test run using the durations of previous runs.'''
+        workers = [0.0] * self.options.num_processes
+        for runner in runners:
+            duration = self.get_expected_duration(runner)
+            if duration == math.inf:
+                return None
+            if runner.is_parallel:
+                # A test using several CPUs starts once enough workers are free
+                cpus = max(1, min(runner.cpus, len(workers)))
+                end = max(heapq.heappop(workers) for _ in range(cpus)) + duration
+                for _ in range(cpus):
+                    heapq.heappush(workers, end)
+            else:
+                workers = [max(workers) + duration] * len(workers)
+        return max(workers)
+
     @staticmethod
     def split_suite_string(suite: str) -> T.Tuple[str, str]:
         if ':' in suite:
@@ -1960,16 +2562,184 @@ class TestHarness:
             print('No suitable tests defined.', file=errorfile)
             return []
 
+        if self.options.affected_by:
+            tests = self.affected_tests(tests)
+            if not tests:
+                print('No tests affected by the changes.', file=errorfile)
+                return []
+
+        if self.options.last_failed:
+            failed = [t for t in tests if self.get_pretty_suite(t) in self.get_previous_failures()]
+            if failed:
+                tests = failed
+            else:
+                print('No tests failed in the previous run, running all tests.', file=errorfile)
+        elif self.options.failed_first:
+            tests = sorted(tests, key=lambda t: self.get_pretty_suite(t) not in self.get_previous_failures())
+
+        if self.options.shard:
+            tests = self.shard_tests(tests)
+
         return tests
 
+    def get_previous_failures(self) -> T.Set[str]:
+        '''Return the names of the tests that failed in the previous run,
+        according to its JSON log.'''
+        if self.previous_failures is not None:
+            return self.previous_failures
+        self.previous_failures = set()
+        logfile_base = self.logfile_base or os.path.join(self.options.wd, 'meson-logs', 'testlog')
+        try:
+            with open(logfile_base + '.json', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    result = json.loads(line)
+                    if TestResult(result['result']).is_bad():
+                        self.previous_failures.add(result['name'])
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            mlog.warning(f'Could not read the log of the previous run: {e}')
+        return self.previous_failures
+
+    def get_changed_files(self, srcdir: str) -> T.Set[str]:
+        changed: T.Set[str] = set()
+        for value in self.options.affected_by:
+            for path in (os.path.abspath(value), os.path.join(srcdir, value)):
+                if os.path.exists(path):
+                    changed.add(os.path.realpath(path))
+                    break
+            else:
+                try:
+                    toplevel = subprocess.run(['git', 'rev-parse', '--show-toplevel'], cwd=srcdir,
+                                              capture_output=True, check=True, encoding='utf-8').stdout.strip()
+                    diff = subprocess.run(['git', 'diff', '--name-only', '-z', value, '--'], cwd=srcdir,
+                                          capture_output=True, check=True, encoding='utf-8').stdout
+                except (OSError, subprocess.CalledProcessError):
+                    raise TestException(f'{value!r} is neither a file nor a git revision')
+                changed.update(os.path.realpath(os.path.join(toplevel, f)) for f in diff.split('\0') if f)
+        return changed
+
+    def affected_tests(self, tests: T.List[TestSerialisation]) -> T.List[TestSerialisation]:
+        '''Select the tests whose inputs changed.
+
+        A target is affected if one of its sources or of the headers
+        recorded in the Ninja deps log changed, or if a target it uses is
+        affected. A test is affected if it uses an affected target, or if
+        its command line refers to a changed file. Changes to the build
+        definition, or a build directory that was never built, select all
+        tests.
+        '''
+        wd = self.options.wd
+        build_data = build.load(wd)
+        srcdir = build_data.environment.get_source_dir()
+        changed = self.get_changed_files(srcdir)
+
+        cdata = build_data.environment.coredata
+        def_files = load_info_file(get_infodir(wd), kind='buildsystem_files')
+        def_files += cdata.config_files + cdata.cross_files
+        if any(os.path.realpath(os.path.join(srcdir, d)) in changed for d in def_files):
+            mlog.log('Build definition changed, running all tests')
+            return tests
+
+        inputs = load_ninja_deps(self.ninja or environment.detect_ninja(), wd)
+        if inputs is None:
+            mlog.warning('Dependencies of the sources are not known yet, running all tests')
+            return tests
+
+        # Objects are placed in the private directory of their target, other
+        # outputs such as those of custom targets are listed by the target.
+        owners: T.Dict[str, str] = {}
+        for tid, target in build_data.get_targets().items():
+            subdir = target.get_subdir()
+            owners[os.path.normpath(os.path.join(subdir, target.get_filename()) + '.p')] = tid
+            for output in target.get_outputs():
+                owners[os.path.normpath(os.path.join(subdir, output))] = tid
+        recorded: T.Dict[str, T.Set[str]] = {}
+        for output, files in inputs.items():
+            tid = owners.get(output) or owners.get(os.path.dirname(output))
+            if tid is not None:
+                recorded.setdefault(tid, set()).update(files)
+
+        dependents: T.Dict[str, T.Set[str]] = {}
+        affected: T.Set[str] = set()
+        for tid, target in build_data.get_targets().items():
+            files, deps = get_target_inputs(target, srcdir, wd)
+            files.update(recorded.get(tid, ()))
+            if not files.isdisjoint(changed):
+                affected.add(tid)
+            for d in deps:
+                dependents.setdefault(d, set()).add(tid)
+
+        todo = list(affected)
+        while todo:
+            for tid in dependents.get(todo.pop(), ()):
+                if tid not in affected:
+                    affected.add(tid)
+                    todo.append(tid)
+
+        def is_affected(test: TestSerialisation) -> bool:
+            if not affected.isdisjoint(test.depends):
+                return True
+            args = test.fname + test.cmd_args
+            return any(os.path.realpath(os.path.join(test.workdir or wd, a)) in changed for a in args)
+
+        return [t for t in tests if is_affected(t)]
+
+    def shard_tests(self, tests: T.List[TestSerialisation]) -> T.List[TestSerialisation]:
+        '''Select the tests of the requested shard.
+
+        All shards must agree on the partitioning without communicating, so
+        it only depends on the test names and on the log given with
+        --shard-history. Tests found in the log are distributed longest first
+        to the shard with the least work so far; the others are distributed
+        by a hash of their name.
+        '''
+        index, count = self.options.shard
+        history: T.Dict[str, float] = {}
+        if self.options.shard_history:
+            try:
+                with open(self.options.shard_history, encoding='utf-8') as f:
+                    for line in f:
+                        if line.strip():
+                            result = json.loads(line)
+                            duration = result.get('duration') or 0.0
+                            history[result['name']] = max(history.get(result['name'], 0.0), duration)
+            except (OSError, ValueError, KeyError) as e:
+                raise TestException(f'Could not read test log {self.options.shard_history!r}: {e}')
+
+        names = sorted({self.get_pretty_suite(t) for t in tests})
+        loads = [0.0] * count
+        shards: T.Dict[str, int] = {}
+        for name in sorted((n for n in names if n in history), key=lambda n: (-history[n], n)):
+            shard = min(range(count), key=lambda i: (loads[i], i))
+            loads[shard] += history[name]
+            shards[name] = shard
+        for name in names:
+            if name not in shards:
+                shards[name] = zlib.crc32(name.encode('utf-8')) % count
+        return [t for t in tests if shards[self.get_pretty_suite(t)] == index - 1]
+
     def flush_logfiles(self) -> None:
         for l in self.loggers:
             l.flush()
 
+    def get_output_spool_base(self, test: TestRun) -> T.Optional[str]:
+        '''Return where the full output of a test is written if it is too
+        long to be kept in memory.'''
+        if not self.logfile_base:
+            return None
+        name = re.sub(r'[^\w.-]+', '_', test.name)
+        return os.path.join(self.logfile_base + '-output', f'{next(self.output_counter)}-{name}')
+
     def open_logfiles(self) -> None:
         if not self.logfile_base:
             return
 
+        # Full output of tests from a previous run
+        shutil.rmtree(self.logfile_base + '-output', ignore_errors=True)
+
         self.loggers.append(JunitBuilder(self.logfile_base + '.junit.xml'))
         self.loggers.append(JsonLogfileBuilder(self.logfile_base + '.json'))
         self.loggers.append(TextLogfileBuilder(self.logfile_base + '.txt', errors='surrogateescape'))
@@ -2018,7 +2788,7 @@ class TestHarness:
             l.start_test(self, test)
 
     async def _run_tests(self, runners: T.List[SingleTestRunner]) -> None:
-        semaphore = asyncio.Semaphore(self.options.num_processes)
+        resources = TestResources(self.options.num_processes, self.options.max_memory)
         futures: T.Deque[asyncio.Future] = deque()
         running_tests: T.Dict[asyncio.Future, str] = {}
         interrupted = False
@@ -2026,7 +2796,9 @@ class TestHarness:
         loop = asyncio.get_running_loop()
 
         async def run_test(test: SingleTestRunner) -> None:
-            async with semaphore:
+            cpus, memory = resources.clamp(test.cpus, test.memory)
+            await resources.acquire(cpus, memory)
+            try:
                 if interrupted or (self.options.repeat > 1 and self.fail_count):
                     return
                 res = await test.run(self)
@@ -2034,6 +2806,8 @@ class TestHarness:
                 maxfail = self.options.maxfail
                 if maxfail and self.fail_count >= maxfail and res.res.is_bad():
                     cancel_all_tests()
+            finally:
+                resources.release(cpus, memory)
 
         def test_done(f: asyncio.Future) -> None:
             if not f.cancelled():
@@ -2087,6 +2861,8 @@ class TestHarness:
         for l in self.loggers:
             l.start(self)
 
+        starttime = loop.time()
+        start_cpu_time = time.process_time()
         if sys.platform != 'win32':
             if os.getpgid(0) == os.getpid():
                 loop.add_signal_handler(signal.SIGINT, sigint_handler)
@@ -2108,6 +2884,9 @@ class TestHarness:
 
             await complete_all(futures)
         finally:
+            self.actual_duration = loop.time() - starttime
+            # The CPU time of child processes is not included
+            self.harness_time = time.process_time() - start_cpu_time
             if sys.platform != 'win32':
                 loop.remove_signal_handler(signal.SIGINT)
                 loop.remove_signal_handler(signal.SIGTERM)
@@ -2120,6 +2899,62 @@ def list_tests(th: TestHarness) -> bool:
         print(th.get_pretty_suite(t))
     return not tests
 
+def get_target_inputs(target: T.Union[build.BuildTarget, build.CustomTarget], srcdir: str, builddir: str) -> T.Tuple[T.Set[str], T.Set[str]]:
+    '''Return the files and the ids of the targets that a target is built from.'''
+    files: T.Set[str] = set()
+    deps: T.Set[str] = set()
+
+    def add(obj: T.Any) -> None:
+        if isinstance(obj, File):
+            files.add(os.path.realpath(obj.absolute_path(srcdir, builddir)))
+        elif isinstance(obj, str):
+            files.add(os.path.realpath(os.path.join(srcdir, target.subdir, obj)))
+        elif isinstance(obj, build.Target):
+            deps.add(obj.get_id())
+        elif isinstance(obj, (build.CustomTargetIndex, build.ExtractedObjects)):
+            deps.add(obj.target.get_id())
+        elif isinstance(obj, build.GeneratedList):
+            add(obj.generator.exe)
+            for o in itertools.chain(obj.infilelist, obj.depends, obj.depend_files, obj.generator.depends):
+                add(o)
+        elif isinstance(obj, ExternalProgram):
+            path = obj.get_path()
+            if path and os.path.isabs(path):
+                files.add(os.path.realpath(path))
+
+    for attr in ['sources', 'generated', 'objects', 'link_targets', 'link_whole_targets',
+                 'link_depends', 'depend_files', 'extra_files', 'dependencies',
+                 'extra_depends', 'command']:
+        for obj in getattr(target, attr, []):
+            add(obj)
+    if isinstance(target, build.BuildTarget) and target.structured_sources:
+        for obj in target.structured_sources.as_list():
+            add(obj)
+    return files, deps
+
+def load_ninja_deps(ninja: T.Optional[T.List[str]], wd: str) -> T.Optional[T.Dict[str, T.Set[str]]]:
+    '''Return the headers and other implicit inputs that Ninja recorded in
+    its deps log, by output relative to the build directory, or None if
+    nothing was built yet.'''
+    if not ninja or not os.path.exists(os.path.join(wd, '.ninja_deps')):
+        return None
+    proc = subprocess.run(ninja + ['-C', wd, '-t', 'deps'], capture_output=True,
+                          encoding='utf-8', errors='surrogateescape')
+    if proc.returncode != 0:
+        return None
+    inputs: T.Dict[str, T.Set[str]] = {}
+    current: T.Optional[T.Set[str]] = None
+    for line in proc.stdout.splitlines():
+        if not line.strip():
+            current = None
+        elif line[0].isspace():
+            if current is not None:
+                current.add(os.path.realpath(os.path.join(wd, line.strip())))
+        else:
+            output = os.path.normpath(line.split(': #deps', 1)[0])
+            current = inputs.setdefault(output, set())
+    return inputs
+
 def rebuild_deps(ninja: T.List[str], wd: str, tests: T.List[TestSerialisation]) -> bool:
     def convert_path_to_target(path: str) -> str:
         path = os.path.relpath(path, wd)
@@ -2150,7 +2985,62 @@ def rebuild_deps(ninja: T.List[str], wd: str, tests: T.List[TestSerialisation])
 
     return True
 
+def merge_junit_logs(filenames: T.List[str]) -> et.ElementTree:
+    root = et.Element('testsuites', tests='0', errors='0', failures='0')
+    suites: T.Dict[str, et.Element] = {}
+    for filename in filenames:
+        for suite in et.parse(filename).getroot().findall('testsuite'):
+            name = suite.attrib.get('name', '')
+            if name not in suites:
+                suites[name] = suite
+                root.append(suite)
+                continue
+            # Exit code tests of a project share a suite across shards
+            merged = suites[name]
+            for attr in ['tests', 'errors', 'failures', 'skipped']:
+                merged.attrib[attr] = str(int(merged.attrib.get(attr, '0')) + int(suite.attrib.get(attr, '0')))
+            merged.attrib['time'] = str(float(merged.attrib.get('time', '0')) + float(suite.attrib.get('time', '0')))
+            merged.extend(suite)
+    for suite in suites.values():
+        for attr in ['tests', 'errors', 'failures']:
+            root.attrib[attr] = str(int(root.attrib[attr]) + int(suite.attrib.get(attr, '0')))
+    return et.ElementTree(root)
+
+def merge_logs(options: argparse.Namespace) -> int:
+    '''Merge the logs of several shards into the logs of one test run.'''
+    lines: T.List[str] = []
+    junit_logs: T.List[str] = []
+    for filename in options.merge_logs:
+        try:
+            with open(filename, encoding='utf-8') as f:
+                lines.extend(line.rstrip('\n') + '\n' for line in f if line.strip())
+        except OSError as e:
+            print(f'Could not read test log: {e}')
+            return 1
+        base, ext = os.path.splitext(filename)
+        if ext == '.json' and os.path.isfile(base + '.junit.xml'):
+            junit_logs.append(base + '.junit.xml')
+
+    logfile_base = os.path.join(options.wd, 'meson-logs', options.logbase)
+    os.makedirs(os.path.dirname(logfile_base), exist_ok=True)
+    try:
+        junit = merge_junit_logs(junit_logs) if junit_logs else None
+    except et.ParseError as e:
+        print(f'Could not read JUnit log: {e}')
+        return 1
+    with open(logfile_base + '.json', 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+    print(f'Merged JSON log written to {logfile_base}.json')
+    if junit is not None:
+        with open(logfile_base + '.junit.xml', 'wb') as f:
+            junit.write(f, encoding='utf-8', xml_declaration=True)
+        print(f'Merged JUnit log written to {logfile_base}.junit.xml')
+    return 0
+
 def run(options: argparse.Namespace) -> int:
+    if options.merge_logs:
+        return merge_logs(options)
+
     if options.benchmark or options.interactive:
         options.num_processes = 1
 
@@ -2178,12 +3068,15 @@ def run(options: argparse.Namespace) -> int:
             print(f'Could not find requested program: {check_bin!r}')
             return 1
 
-    b = build.load(options.wd)
-    need_vsenv = T.cast('bool', b.environment.coredata.get_option(OptionKey('vsenv')))
+    try:
+        cdata = coredata.load(options.wd)
+    except FileNotFoundError:
+        raise MesonException(f'Directory {options.wd!r} does not seem to be a Meson build directory.')
+    need_vsenv = T.cast('bool', cdata.get_option(OptionKey('vsenv')))
     setup_vsenv(need_vsenv)
 
     if not options.no_rebuild:
-        backend = b.environment.coredata.get_option(OptionKey('backend'))
+        backend = cdata.get_option(OptionKey('backend'))
         if backend == 'none':
             # nothing to build...
             options.no_rebuild = True
@@ -76,14 +76,14 @@ class OptionInterpreter:
             'feature': self.feature_parser,
         }
 
-    def process(self, option_file: str) -> None:
+    def process(self, option_file: str, ast_cache_dir: T.Optional[str] = None) -> None:
         try:
             with open(option_file, encoding='utf-8') as f:
                 code = f.read()
         except UnicodeDecodeError as e:
             raise mesonlib.MesonException(f'Malformed option file {option_file!r} failed to parse as unicode: {e}')
         try:
-            ast = mparser.Parser(code, option_file).parse()
+            ast = mparser.parse_cached(code, option_file, ast_cache_dir)
         except mesonlib.MesonException as me:
             me.file = option_file
             raise me
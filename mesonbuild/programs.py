@@ -22,6 +22,9 @@ if T.TYPE_CHECKING:
     from .environment import Environment
     from .interpreter import Interpreter
 
+    # command, mtime, size
+    ProgramVersionCacheKey = T.Tuple[T.Tuple[str, ...], int, int]
+
 
 class ExternalProgram(mesonlib.HoldableObject):
 
@@ -91,7 +94,28 @@ class ExternalProgram(mesonlib.HoldableObject):
         '''Human friendly description of the command'''
         return ' '.join(self.command)
 
+    def _version_cache_key(self) -> T.Optional[ProgramVersionCacheKey]:
+        # The version of a program only changes when the program itself
+        # does, so the result of a probe can be kept across regenerations
+        # for as long as the file on disk stays the same.
+        if self.path is None:
+            return None
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (tuple(self.get_command()), st.st_mtime_ns, st.st_size)
+
     def get_version(self, interpreter: T.Optional['Interpreter'] = None) -> str:
+        if not self.cached_version and interpreter:
+            key = self._version_cache_key()
+            version_cache = interpreter.coredata.program_version_cache
+            if key is not None and key in version_cache:
+                mlog.debug(f'Using cached version of {self.name}: {version_cache[key]}')
+                # Keep regenerating when the program changes, as running it
+                # would have done.
+                interpreter.add_build_def_file(self.get_path())
+                self.cached_version = version_cache[key]
         if not self.cached_version:
             raw_cmd = self.get_command() + ['--version']
             if interpreter:
@@ -113,6 +137,10 @@ class ExternalProgram(mesonlib.HoldableObject):
             if not match:
                 raise mesonlib.MesonException(f'Could not find a version number in output of {raw_cmd!r}')
             self.cached_version = match.group(1)
+            if interpreter:
+                key = self._version_cache_key()
+                if key is not None:
+                    interpreter.coredata.program_version_cache[key] = self.cached_version
         return self.cached_version
 
     @classmethod
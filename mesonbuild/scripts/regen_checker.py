@@ -7,23 +7,23 @@ import sys, os
 import pickle, subprocess
 import typing as T
 from ..coredata import CoreData
-from ..backend.backends import RegenInfo
+from ..backend.backends import RegenInfo, get_regen_digest
 from ..mesonlib import OptionKey
 
 # This could also be used for XCode.
 
 def need_regen(regeninfo: RegenInfo, regen_timestamp: float) -> bool:
+    # Files without a digest were written by an older version of Meson, or
+    # are not build definition files, regenerate whenever they are touched.
+    digests: T.Dict[str, str] = getattr(regeninfo, 'digests', {})
     for i in regeninfo.depfiles:
         curfile = os.path.join(regeninfo.build_dir, i)
         curtime = os.stat(curfile).st_mtime
         if curtime > regen_timestamp:
-            return True
-    # The timestamp file gets automatically deleted by MSBuild during a 'Clean' build.
-    # We must make sure to recreate it, even if we do not regenerate the solution.
-    # Otherwise, Visual Studio will always consider the REGEN project out of date.
+            digest = digests.get(i)
+            if digest is None or digest != get_regen_digest(curfile):
+                return True
     print("Everything is up-to-date, regeneration of build files is not needed.")
-    from ..backend.vs2010backend import Vs2010Backend
-    Vs2010Backend.touch_regen_timestamp(regeninfo.build_dir)
     return False
 
 def regen(regeninfo: RegenInfo, meson_command: T.List[str], backend: str) -> None:
@@ -46,9 +46,24 @@ def run(args: T.List[str]) -> int:
         assert isinstance(coredata, CoreData)
     backend = coredata.get_option(OptionKey('backend'))
     assert isinstance(backend, str)
+    # The build directory may have been moved since it was configured
+    regeninfo.build_dir = os.path.dirname(os.path.abspath(private_dir))
     regen_timestamp = os.stat(dumpfile).st_mtime
     if need_regen(regeninfo, regen_timestamp):
         regen(regeninfo, coredata.meson_command, backend)
+        return 0
+    # Only compare digests of files touched since the last check next time
+    os.utime(dumpfile)
+    if backend == 'ninja':
+        # Ninja runs us to rebuild build.ninja, it must be newer than its
+        # dependencies afterwards or Ninja would run us again.
+        os.utime(os.path.join(regeninfo.build_dir, 'build.ninja'))
+    else:
+        # The timestamp file gets automatically deleted by MSBuild during a 'Clean' build.
+        # We must make sure to recreate it, even if we do not regenerate the solution.
+        # Otherwise, Visual Studio will always consider the REGEN project out of date.
+        from ..backend.vs2010backend import Vs2010Backend
+        Vs2010Backend.touch_regen_timestamp(regeninfo.build_dir)
     return 0
 
 if __name__ == '__main__':
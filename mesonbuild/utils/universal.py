@@ -22,6 +22,7 @@ import typing as T
 import textwrap
 import pickle
 import errno
+import gc
 import json
 
 from mesonbuild import mlog
@@ -133,7 +134,9 @@ __all__ = [
     'listify_array_value',
     'partition',
     'path_is_in_root',
+    'pickle_dump_sections',
     'pickle_load',
+    'pickle_load_section',
     'Popen_safe',
     'Popen_safe_logged',
     'quiet_git',
@@ -935,6 +938,10 @@ def version_compare_many(vstr1: str, conditions: T.Union[str, T.Iterable[str]])
 
 # determine if the minimum version satisfying the condition |condition| exceeds
 # the minimum version for a feature |minimum|
+#
+# This is called for every use of a feature that is checked with FeatureNew or
+# FeatureDeprecated, with few distinct arguments, so the results are cached.
+@lru_cache(maxsize=None)
 def version_compare_condition_with_min(condition: str, minimum: str) -> bool:
     if condition.startswith('>='):
         cmpop = operator.le
@@ -2194,6 +2201,7 @@ _BUILTIN_NAMES = {
     'layout',
     'optimization',
     'prefer_static',
+    'regen_skip_unchanged',
     'stdsplit',
     'strip',
     'unity',
@@ -2201,6 +2209,7 @@ _BUILTIN_NAMES = {
     'warning_level',
     'werror',
     'wrap_mode',
+    'wrap_prefetch',
     'force_fallback_for',
     'pkg_config_path',
     'cmake_prefix_path',
@@ -2406,12 +2415,31 @@ class OptionKey:
         return self.type is OptionType.BASE
 
 
+def _unpickle(f: T.BinaryIO) -> T.Any:
+    # Unpickling creates many objects at once, the garbage collector would
+    # repeatedly traverse all of them for nothing.
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return pickle.load(f)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def _check_pickle_version(version: str, extra_msg: str) -> None:
+    from ..coredata import version as coredata_version
+    from ..coredata import major_versions_differ, MesonVersionMismatchException
+    if major_versions_differ(version, coredata_version):
+        raise MesonVersionMismatchException(version, coredata_version, extra_msg)
+
+
 def pickle_load(filename: str, object_name: str, object_type: T.Type[_PL], suggest_reconfigure: bool = True) -> _PL:
     load_fail_msg = f'{object_name} file {filename!r} is corrupted.'
     extra_msg = ' Consider reconfiguring the directory with "meson setup --reconfigure".' if suggest_reconfigure else ''
     try:
         with open(filename, 'rb') as f:
-            obj = pickle.load(f)
+            obj = _unpickle(f)
     except (pickle.UnpicklingError, EOFError):
         raise MesonException(load_fail_msg + extra_msg)
     except (TypeError, ModuleNotFoundError, AttributeError):
@@ -2432,10 +2460,65 @@ def pickle_load(filename: str, object_name: str, object_type: T.Type[_PL], sugge
     else:
         version = T.cast('_EnvPickleLoadable', obj).environment.coredata.version
 
+    _check_pickle_version(version, extra_msg)
+    return obj
+
+
+# Files written by pickle_dump_sections() start with this, the number is the
+# version of their layout.
+_SECTIONS_MAGIC = b'MESON-SECTIONS-1\n'
+
+def pickle_dump_sections(filename: str, sections: T.Dict[str, T.Any]) -> None:
+    """Pickle objects separately into one file.
+
+    Any of them can then be loaded by pickle_load_section() without
+    unpickling the others. The sections are followed by an index with the
+    version of Meson and the offset of each section, and the offset of that
+    index ends the file.
+    """
     from ..coredata import version as coredata_version
-    from ..coredata import major_versions_differ, MesonVersionMismatchException
-    if major_versions_differ(version, coredata_version):
-        raise MesonVersionMismatchException(version, coredata_version, extra_msg)
+    with open(filename, 'wb') as f:
+        f.write(_SECTIONS_MAGIC)
+        offsets: T.Dict[str, int] = {}
+        for name, obj in sections.items():
+            offsets[name] = f.tell()
+            pickle.dump(obj, f)
+        index = f.tell()
+        pickle.dump({'version': coredata_version, 'sections': offsets}, f)
+        f.write(index.to_bytes(8, 'little'))
+
+
+def pickle_load_section(filename: str, section: str, object_name: str, object_type: T.Type[_T],
+                        suggest_reconfigure: bool = True) -> _T:
+    """Load one of the objects of a file written by pickle_dump_sections()."""
+    load_fail_msg = f'{object_name} file {filename!r} is corrupted.'
+    extra_msg = ' Consider reconfiguring the directory with "meson setup --reconfigure".' if suggest_reconfigure else ''
+    with open(filename, 'rb') as f:
+        try:
+            if f.read(len(_SECTIONS_MAGIC)) != _SECTIONS_MAGIC:
+                # Written by a version of Meson that pickled a single object,
+                # report a version mismatch if it is one.
+                f.seek(0)
+                old = _unpickle(f)
+                if hasattr(old, 'version'):
+                    _check_pickle_version(old.version, extra_msg)
+                raise MesonException(load_fail_msg + extra_msg)
+            f.seek(-8, os.SEEK_END)
+            f.seek(int.from_bytes(f.read(8), 'little'))
+            index = _unpickle(f)
+            _check_pickle_version(index['version'], extra_msg)
+            f.seek(index['sections'][section])
+            obj = _unpickle(f)
+        except (pickle.UnpicklingError, EOFError, KeyError, OSError, ValueError):
+            raise MesonException(load_fail_msg + extra_msg)
+        except (TypeError, ModuleNotFoundError, AttributeError):
+            raise MesonException(
+                f"{object_name} file {filename!r} references functions or classes that don't "
+                "exist. This probably means that it was generated with an old "
+                "version of meson." + extra_msg)
+
+    if not isinstance(obj, object_type):
+        raise MesonException(load_fail_msg + extra_msg)
     return obj
 
 
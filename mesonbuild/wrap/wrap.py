@@ -5,6 +5,8 @@ from __future__ import annotations
 
 from .. import mlog
 import contextlib
+import copy
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 import urllib.request
 import urllib.error
@@ -49,6 +51,8 @@ except ImportError:
     has_ssl = False
 
 REQ_TIMEOUT = 30.0
+# Subprojects downloaded at the same time by Resolver.prefetch()
+PREFETCH_JOBS = 8
 WHITELIST_SUBDOMAIN = 'wrapdb.mesonbuild.com'
 
 ALL_TYPES = ['file', 'git', 'hg', 'svn']
@@ -401,6 +405,49 @@ class Resolver:
                 return wrap_name
         return None
 
+    def prefetch(self) -> None:
+        """Download all subprojects of this project that are not there yet.
+
+        Wraps are otherwise only downloaded, one at a time, when the
+        interpreter needs them. Here they are downloaded, verified and
+        extracted in parallel, so that resolve() finds them ready. Errors
+        are only logged: the subproject may not be needed, and resolve()
+        reports them again if it is.
+        """
+        wraps: T.Dict[str, PackageDefinition] = {}
+        for wrap in self.wraps.values():
+            # Redirected wraps point into other subprojects, that must be
+            # resolved first, and submodules are handled by resolve().
+            if wrap.has_wrap and not wrap.redirected and \
+                    not os.path.exists(os.path.join(self.subdir_root, wrap.directory)):
+                wraps.setdefault(wrap.directory, wrap)
+        if not wraps:
+            return
+
+        def fetch(wrap: PackageDefinition) -> T.Optional[str]:
+            # Only the download steps of resolve() are run: they keep their
+            # state in the wrap, directory and dirname attributes, which each
+            # thread sets on its own copy of the resolver, and they don't
+            # modify the tables of wraps shared by the copies.
+            resolver = copy.copy(self)
+            resolver.silent = True
+            resolver.wrap = wrap
+            resolver.directory = wrap.directory
+            resolver.dirname = os.path.join(self.subdir_root, wrap.directory)
+            try:
+                resolver._get_sources(wrap.name)
+                wrap.update_hash_cache(resolver.dirname)
+            except (MesonException, OSError, subprocess.CalledProcessError) as e:
+                return str(e)
+            return None
+
+        mlog.log('Downloading', mlog.bold(str(len(wraps))), 'subprojects in parallel')
+        with mlog.no_logging(), ThreadPoolExecutor(PREFETCH_JOBS) as executor:
+            errors = list(executor.map(fetch, wraps.values()))
+        for wrap, error in zip(wraps.values(), errors):
+            if error is not None:
+                mlog.log('Could not download subproject ', mlog.bold(wrap.name), ': ', error, sep='')
+
     def resolve(self, packagename: str, force_method: T.Optional[Method] = None) -> T.Tuple[str, Method]:
         wrap = self.wraps.get(packagename)
         if wrap is None:
@@ -467,34 +514,7 @@ class Resolver:
             if not os.path.isdir(self.dirname):
                 raise WrapException('Path already exists but is not a directory')
         else:
-            # Check first if we have the extracted directory in our cache. This can
-            # happen for example when MESON_PACKAGE_CACHE_DIR=/usr/share/cargo/registry
-            # on distros that ships Rust source code.
-            # TODO: We don't currently clone git repositories into the cache
-            # directory, but we should to avoid cloning multiple times the same
-            # repository. In that case, we could do something smarter than
-            # copy_tree() here.
-            cached_directory = os.path.join(self.cachedir, self.directory)
-            if os.path.isdir(cached_directory):
-                self.copy_tree(cached_directory, self.dirname)
-            elif self.wrap.type == 'file':
-                self._get_file(packagename)
-            else:
-                self.check_can_download()
-                if self.wrap.type == 'git':
-                    self._get_git(packagename)
-                elif self.wrap.type == "hg":
-                    self._get_hg()
-                elif self.wrap.type == "svn":
-                    self._get_svn()
-                else:
-                    raise WrapException(f'Unknown wrap type {self.wrap.type!r}')
-            try:
-                self.apply_patch(packagename)
-                self.apply_diff_files()
-            except Exception:
-                windows_proof_rmtree(self.dirname)
-                raise
+            self._get_sources(packagename)
 
         if not has_buildfile():
             raise WrapException(f'Subproject exists but has no {methods_map[method]} file.')
@@ -505,6 +525,37 @@ class Resolver:
         self.wrap.update_hash_cache(self.dirname)
         return rel_path, method
 
+    def _get_sources(self, packagename: str) -> None:
+        """Download, extract and patch the wrap into self.dirname."""
+        # Check first if we have the extracted directory in our cache. This can
+        # happen for example when MESON_PACKAGE_CACHE_DIR=/usr/share/cargo/registry
+        # on distros that ships Rust source code.
+        # TODO: We don't currently clone git repositories into the cache
+        # directory, but we should to avoid cloning multiple times the same
+        # repository. In that case, we could do something smarter than
+        # copy_tree() here.
+        cached_directory = os.path.join(self.cachedir, self.directory)
+        if os.path.isdir(cached_directory):
+            self.copy_tree(cached_directory, self.dirname)
+        elif self.wrap.type == 'file':
+            self._get_file(packagename)
+        else:
+            self.check_can_download()
+            if self.wrap.type == 'git':
+                self._get_git(packagename)
+            elif self.wrap.type == "hg":
+                self._get_hg()
+            elif self.wrap.type == "svn":
+                self._get_svn()
+            else:
+                raise WrapException(f'Unknown wrap type {self.wrap.type!r}')
+        try:
+            self.apply_patch(packagename)
+            self.apply_diff_files()
+        except Exception:
+            windows_proof_rmtree(self.dirname)
+            raise
+
     def check_can_download(self) -> None:
         # Don't download subproject data based on wrap file if requested.
         # Git submodules are ok (see above)!
@@ -0,0 +1,5 @@
+#include "lib.h"
+
+int main(void) {
+    return lib_func();
+}
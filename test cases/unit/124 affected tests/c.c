@@ -0,0 +1,5 @@
+#include "gen.h"
+
+int main(void) {
+    return VALUE;
+}
@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+
+# Writes a header from data.txt, which is only known from the depfile
+import os, sys
+
+data = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data.txt')
+with open(data, encoding='utf-8') as f:
+    value = f.read().strip()
+with open(sys.argv[1], 'w', encoding='utf-8') as f:
+    f.write(f'#define VALUE {value}\n')
+with open(sys.argv[2], 'w', encoding='utf-8') as f:
+    f.write(f'{sys.argv[1]}: {data}\n')
@@ -0,0 +1,5 @@
+#include "lib.h"
+
+int lib_func(void) {
+    return 0;
+}
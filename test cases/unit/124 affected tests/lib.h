@@ -0,0 +1 @@
+int lib_func(void);
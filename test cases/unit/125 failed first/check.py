@@ -0,0 +1,6 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+
+sys.exit(1 if os.environ.get('FAILING_TEST') == sys.argv[1] else 0)
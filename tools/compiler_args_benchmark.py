@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2026 The Meson development team
+
+'''Measure how fast compiler arguments are added to a CompilerArgs list.
+
+For each requested size, include directories, defines, libraries and a
+repeated flag are added one at a time, followed by linker arguments
+appended directly, as the backends do. The best time of all runs is
+reported. When the time per argument stays the same as the size grows,
+adding arguments takes linear time.
+
+To compare two versions of Meson, run this script once with each of them:
+
+    ./tools/compiler_args_benchmark.py --source /path/to/old/meson
+    ./tools/compiler_args_benchmark.py
+'''
+
+import argparse
+import os
+import sys
+import time
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n', 1)[0])
+    parser.add_argument('--source', default=ROOT,
+                        help='Meson source tree to benchmark (default: this one)')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 2000, 4000, 8000],
+                        help='numbers of arguments of each kind to add (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='number of times to build each list (default: %(default)s)')
+    options = parser.parse_args()
+
+    sys.path.insert(0, os.path.abspath(options.source))
+    from mesonbuild.compilers.c import ClangCCompiler
+    from mesonbuild.mesonlib import MachineChoice
+
+    cc = ClangCCompiler([], [], 'fake', MachineChoice.HOST, False, mock.Mock())
+
+    def add_args(n: int) -> None:
+        a = cc.compiler_args()
+        for i in range(n):
+            a.extend([f'-I/inc/{i}', f'-DX{i}', f'-l{i}', '-pthread'])
+        for i in range(n):
+            a.append_direct(f'-Wl,-foo{i}')
+        list(a)
+
+    for n in options.sizes:
+        times = []
+        for _ in range(options.repeat):
+            start = time.perf_counter()
+            add_args(n)
+            times.append(time.perf_counter() - start)
+        best = min(times)
+        print(f'{5 * n} args: {best * 1000:.1f} ms, {best / (5 * n) * 1e6:.2f} us per arg')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2026 The Meson development team
+
+'''Measure how fast the interpreter evaluates build files.
+
+For each benchmark a project is generated whose meson.build runs a foreach
+loop with the requested number of iterations, and it is configured. The
+time it takes to configure an empty project using the same languages is
+subtracted, so that the numbers only cover the evaluation of the loop.
+Only the targets benchmark uses a language, the numbers of that one also
+include generating the backend for the targets.
+
+CPU time is measured where it is available, as it is less sensitive to
+other processes running on the machine than wall time.
+
+To compare two versions of Meson, run this script once with each of them:
+
+    ./tools/interpreter_benchmark.py --meson /path/to/old/meson.py
+    ./tools/interpreter_benchmark.py --meson ./meson.py
+'''
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import typing as T
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# The body of the loop of each benchmark, `i` is the loop variable
+BENCHMARKS = {
+    'arithmetic': '''
+  x = i * 2 + 1
+  if x % 3 == 0 and not (x > 100 or x < 0)
+    total += x
+  elif x % 3 == 1
+    total = total - 1
+  else
+    total = -total
+  endif
+''',
+    'strings': '''
+  name = 'src@0@.c'.format(i)
+  if name.endswith('7.c')
+    names += name.to_upper()
+  endif
+  joined = '/'.join(['dir', name.split('.')[0]])
+  s = f'@joined@ @total@'
+''',
+    'containers': '''
+  l = [i, i + 1, [i, 'a'], 'b']
+  d = {'a': i, 'b': l}
+  total += d['a'] + l.length() + d.get('c', 1)
+  names += d.keys()
+''',
+    'functions': '''
+  assert(i >= 0, 'negative')
+  v = get_variable('total')
+  set_variable('other', v)
+  total += is_variable('nope') ? 1 : 2
+''',
+    'calls': '''
+  f = files('meson.build')
+  inc = include_directories('.')
+  dep = declare_dependency(compile_args : ['-DN=@0@'.format(i)], sources : f,
+                           include_directories : inc, version : '1.0')
+  env = environment({'N': '@0@'.format(i)}, method : 'prepend')
+''',
+    'targets': '''
+  executable('exe@0@'.format(i), files('main.c'), c_args : ['-DN=@0@'.format(i)],
+             include_directories : '.', install : false)
+''',
+}
+
+# The languages of the projects of the benchmarks using any
+LANGUAGES = {
+    'targets': ['c'],
+}
+
+def generate_project(srcdir: str, body: str, iterations: int, languages: T.List[str]) -> None:
+    os.makedirs(srcdir)
+    with open(os.path.join(srcdir, 'main.c'), 'w', encoding='utf-8') as f:
+        f.write('int main(void) { return 0; }\n')
+    with open(os.path.join(srcdir, 'meson.build'), 'w', encoding='utf-8') as f:
+        # A minimum version makes the checks for new features compare versions
+        f.write(f"project('benchmark', {languages!r}, meson_version : '>=1.0')\n")
+        if iterations:
+            f.write('total = 0\nnames = []\n')
+            f.write(f'foreach i : range({iterations})')
+            f.write(body)
+            f.write('endforeach\n')
+
+def cpu_time() -> float:
+    '''CPU time used by the child processes that exited so far, or the wall
+    time where that is not available.'''
+    if resource is None:
+        return time.perf_counter()
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+def configure(meson: T.List[str], srcdir: str, builddir: str) -> float:
+    start = cpu_time()
+    subprocess.run(meson + ['setup', srcdir, builddir], check=True, stdout=subprocess.DEVNULL)
+    elapsed = cpu_time() - start
+    shutil.rmtree(builddir)
+    return elapsed
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n', 1)[0])
+    parser.add_argument('--meson', default=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'meson.py'),
+                        help='meson.py to benchmark (default: the one of this source tree)')
+    parser.add_argument('--iterations', type=int, default=20000,
+                        help='number of iterations of each loop (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='number of times to configure each project, the best time is used (default: %(default)s)')
+    parser.add_argument('--keep', action='store_true',
+                        help='do not delete the generated projects')
+    parser.add_argument('benchmarks', nargs='*',
+                        help=f'benchmarks to run, out of {", ".join(BENCHMARKS)} (default: all of them)')
+    options = parser.parse_args()
+    for name in options.benchmarks:
+        if name not in BENCHMARKS:
+            parser.error(f'unknown benchmark {name!r}')
+
+    meson = [sys.executable, options.meson]
+    workdir = tempfile.mkdtemp(prefix='meson-benchmark-')
+    try:
+        builddir = os.path.join(workdir, 'build')
+        empty: T.Dict[T.Tuple[str, ...], float] = {}
+        for name in options.benchmarks or BENCHMARKS:
+            languages = LANGUAGES.get(name, [])
+            if tuple(languages) not in empty:
+                srcdir = os.path.join(workdir, '-'.join(['empty'] + languages))
+                generate_project(srcdir, '', 0, languages)
+                empty[tuple(languages)] = elapsed = min(configure(meson, srcdir, builddir) for _ in range(options.repeat))
+                print(f'configuring an empty project with languages [{", ".join(languages)}] takes {elapsed:.2f} s')
+            srcdir = os.path.join(workdir, name)
+            generate_project(srcdir, BENCHMARKS[name], options.iterations, languages)
+            elapsed = min(configure(meson, srcdir, builddir) for _ in range(options.repeat)) - empty[tuple(languages)]
+            print(f'{name}: {elapsed:.2f} s, {elapsed / options.iterations * 1e6:.1f} µs per iteration')
+    finally:
+        if options.keep:
+            print(f'Projects left in {workdir}')
+        else:
+            shutil.rmtree(workdir)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2026 The Meson development team
+
+'''Measure how fast the lexer tokenizes the build files of the test cases.
+
+Every meson.build, meson.options and meson_options.txt file below
+"test cases" is read once, then tokenized the requested number of times.
+The best time of all runs is reported, to reduce the noise of other
+processes running on the machine.
+
+To compare two versions of Meson, run this script once with each of them:
+
+    ./tools/lexer_benchmark.py --source /path/to/old/meson
+    ./tools/lexer_benchmark.py
+'''
+
+import argparse
+import os
+import sys
+import time
+import typing as T
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUILD_FILES = {'meson.build', 'meson.options', 'meson_options.txt'}
+
+def load_corpus(path: str) -> T.List[T.Tuple[str, str]]:
+    corpus = []
+    for dirpath, _, filenames in os.walk(path):
+        for f in sorted(filenames):
+            if f in BUILD_FILES:
+                fname = os.path.join(dirpath, f)
+                try:
+                    with open(fname, encoding='utf-8') as fp:
+                        corpus.append((fname, fp.read()))
+                except UnicodeDecodeError:
+                    pass
+    return corpus
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n', 1)[0])
+    parser.add_argument('--source', default=ROOT,
+                        help='Meson source tree to benchmark (default: this one)')
+    parser.add_argument('--corpus', default=os.path.join(ROOT, 'test cases'),
+                        help='directory with the build files to tokenize (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='number of times to tokenize the corpus (default: %(default)s)')
+    options = parser.parse_args()
+
+    sys.path.insert(0, os.path.abspath(options.source))
+    from mesonbuild import mlog, mparser
+
+    corpus = load_corpus(options.corpus)
+    times = []
+    tokens = 0
+    errors = 0
+    with mlog.no_logging():
+        for _ in range(options.repeat):
+            tokens = 0
+            errors = 0
+            start = time.perf_counter()
+            for fname, code in corpus:
+                try:
+                    for _ in mparser.Lexer(code).lex(fname):
+                        tokens += 1
+                except mparser.ParseException:
+                    errors += 1
+            times.append(time.perf_counter() - start)
+    best = min(times)
+    print(f'{len(corpus)} files ({errors} with lexer errors), {tokens} tokens')
+    print(f'best of {options.repeat}: {best * 1000:.1f} ms, {tokens / best / 1000:.0f}k tokens per second')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2026 The Meson development team
+
+'''Measure the overhead of meson test for each test it runs.
+
+A project with the requested number of trivial tests is generated, built,
+and its tests are run. The harness overhead is the wall time of meson test
+minus the time it takes to simply run the test program as many times,
+divided by the number of tests. With more than one process the tests
+overlap, so the overhead is only meaningful with -j 1.
+
+To compare two versions of Meson, run this script once with each of them:
+
+    ./tools/mtest_benchmark.py --meson /path/to/old/meson.py
+    ./tools/mtest_benchmark.py --meson ./meson.py
+'''
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+def generate_project(srcdir: str, tests: int) -> None:
+    with open(os.path.join(srcdir, 'meson.build'), 'w', encoding='utf-8') as f:
+        f.write("project('benchmark', 'c')\n\n")
+        f.write("exe = executable('trivial', 'trivial.c')\n")
+        f.write(f"foreach i : range({tests})\n")
+        f.write("  test('test@0@'.format(i), exe, suite : 'suite@0@'.format(i % 10))\n")
+        f.write("endforeach\n")
+    with open(os.path.join(srcdir, 'trivial.c'), 'w', encoding='utf-8') as f:
+        f.write('int main(void) { return 0; }\n')
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n', 1)[0])
+    parser.add_argument('--meson', default=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'meson.py'),
+                        help='meson.py to benchmark (default: the one of this source tree)')
+    parser.add_argument('--tests', type=int, default=10000,
+                        help='number of tests (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='number of times to run the tests (default: %(default)s)')
+    parser.add_argument('--keep', action='store_true',
+                        help='do not delete the generated project')
+    parser.add_argument('test_args', nargs='*', default=['-j', '1'],
+                        help='extra arguments for meson test (default: -j 1)')
+    options = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='meson-benchmark-')
+    try:
+        srcdir = os.path.join(workdir, 'src')
+        builddir = os.path.join(workdir, 'build')
+        os.mkdir(srcdir)
+        generate_project(srcdir, options.tests)
+        meson = [sys.executable, options.meson]
+        subprocess.run(meson + ['setup', srcdir, builddir], check=True, stdout=subprocess.DEVNULL)
+        subprocess.run(meson + ['compile', '-C', builddir], check=True, stdout=subprocess.DEVNULL)
+
+        exe = os.path.join(builddir, 'trivial')
+        start = time.perf_counter()
+        for _ in range(options.tests):
+            subprocess.run([exe], check=True)
+        test_time = time.perf_counter() - start
+        print(f'running the test program {options.tests} times takes {test_time:.2f} s')
+
+        for i in range(options.repeat):
+            cmd = meson + ['test', '-C', builddir, '--no-rebuild', *options.test_args]
+            start = time.perf_counter()
+            returncode = subprocess.call(cmd, stdout=subprocess.DEVNULL)
+            elapsed = time.perf_counter() - start
+            if returncode != 0:
+                raise SystemExit(f'{" ".join(cmd)} failed with exit code {returncode}')
+            with open(os.path.join(builddir, 'meson-logs', 'testlog.json'), encoding='utf-8') as f:
+                count = sum(1 for _ in f)
+            overhead = (elapsed - test_time) / count * 1000
+            print(f'run {i + 1}: {count} tests in {elapsed:.2f} s, '
+                  f'harness overhead {overhead:.2f} ms per test')
+    finally:
+        if options.keep:
+            print(f'Project left in {workdir}')
+        else:
+            shutil.rmtree(workdir)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
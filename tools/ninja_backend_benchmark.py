@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2026 The Meson development team
+
+'''Measure how long configuring a large synthetic project takes, and how
+much memory it needs.
+
+A project with the requested number of C sources is generated, spread over
+subdirs with a few static libraries each, and configured with the Ninja
+backend. Nothing is compiled, so the numbers are dominated by the
+interpreter and the generation of build.ninja.
+
+To compare two versions of Meson, run this script once with each of them:
+
+    ./tools/ninja_backend_benchmark.py --meson /path/to/old/meson.py
+    ./tools/ninja_backend_benchmark.py --meson ./meson.py
+
+Peak memory usage is only reported on platforms with os.wait4().
+'''
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import typing as T
+
+def generate_project(srcdir: str, sources: int, subdirs: int, targets: int) -> None:
+    per_target = max(1, sources // (subdirs * targets))
+    with open(os.path.join(srcdir, 'meson.build'), 'w', encoding='utf-8') as f:
+        f.write("project('benchmark', 'c')\n\n")
+        f.write("inc = include_directories('include')\n")
+        f.write("add_project_arguments('-DBENCHMARK=1', language: 'c')\n\n")
+        for d in range(subdirs):
+            f.write(f"subdir('dir{d}')\n")
+    os.mkdir(os.path.join(srcdir, 'include'))
+    with open(os.path.join(srcdir, 'include', 'common.h'), 'w', encoding='utf-8') as f:
+        f.write('#pragma once\n')
+    for d in range(subdirs):
+        subdir = os.path.join(srcdir, f'dir{d}')
+        os.mkdir(subdir)
+        with open(os.path.join(subdir, 'meson.build'), 'w', encoding='utf-8') as f:
+            for t in range(targets):
+                files = ', '.join(f"'t{t}_{s}.c'" for s in range(per_target))
+                f.write(f"static_library('d{d}_t{t}', {files},\n"
+                        "  include_directories: inc,\n"
+                        f"  c_args: ['-DTARGET={t}'])\n")
+        for t in range(targets):
+            for s in range(per_target):
+                with open(os.path.join(subdir, f't{t}_{s}.c'), 'w', encoding='utf-8') as f:
+                    f.write(f'#include <common.h>\nint d{d}_t{t}_f{s}(void) {{ return {s}; }}\n')
+
+def run(cmd: T.List[str]) -> T.Tuple[float, T.Optional[int]]:
+    '''Run a command, and return its wall time and peak RSS in KiB.'''
+    start = time.perf_counter()
+    if hasattr(os, 'wait4'):
+        pid = os.posix_spawn(cmd[0], cmd, os.environ,
+                             file_actions=[(os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0)])
+        _, status, rusage = os.wait4(pid, 0)
+        returncode = os.waitstatus_to_exitcode(status)
+        maxrss: T.Optional[int] = rusage.ru_maxrss
+        if sys.platform == 'darwin':
+            # Reported in bytes instead of KiB
+            maxrss //= 1024
+    else:
+        import subprocess
+        returncode = subprocess.call(cmd, stdout=subprocess.DEVNULL)
+        maxrss = None
+    elapsed = time.perf_counter() - start
+    if returncode != 0:
+        raise SystemExit(f'{" ".join(cmd)} failed with exit code {returncode}')
+    return elapsed, maxrss
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n', 1)[0])
+    parser.add_argument('--meson', default=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'meson.py'),
+                        help='meson.py to benchmark (default: the one of this source tree)')
+    parser.add_argument('--sources', type=int, default=100000,
+                        help='number of source files (default: %(default)s)')
+    parser.add_argument('--subdirs', type=int, default=500,
+                        help='number of subdirs (default: %(default)s)')
+    parser.add_argument('--targets', type=int, default=4,
+                        help='number of targets per subdir (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='number of times to configure the project (default: %(default)s)')
+    parser.add_argument('--keep', action='store_true',
+                        help='do not delete the generated project')
+    parser.add_argument('setup_args', nargs='*',
+                        help='extra arguments for meson setup')
+    options = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='meson-benchmark-')
+    try:
+        srcdir = os.path.join(workdir, 'src')
+        os.mkdir(srcdir)
+        generate_project(srcdir, options.sources, options.subdirs, options.targets)
+        for i in range(options.repeat):
+            builddir = os.path.join(workdir, f'build{i}')
+            cmd = [sys.executable, options.meson, 'setup', *options.setup_args, srcdir, builddir]
+            elapsed, maxrss = run(cmd)
+            size = os.path.getsize(os.path.join(builddir, 'build.ninja'))
+            rss = f'{maxrss / 1024:.1f} MiB' if maxrss is not None else 'unknown'
+            print(f'run {i + 1}: {elapsed:.2f} s, peak RSS {rss}, build.ninja {size / 1024 / 1024:.1f} MiB')
+    finally:
+        if options.keep:
+            print(f'Project left in {workdir}')
+        else:
+            shutil.rmtree(workdir)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2026 The Meson development team
+
+'''Measure how fast the data of a build directory is loaded.
+
+A project with the requested number of executables, each with a test, is
+generated and configured. Then the build data is loaded in the ways the
+Meson commands load it, and compared to loading the same Build object
+from a file written with a single generic pickle.dump(), with the garbage
+collector enabled, as Meson used to. The best time of all runs is reported.
+
+To compare two versions of Meson, run this script once with each of them:
+
+    ./tools/serialization_benchmark.py --source /path/to/old/meson
+    ./tools/serialization_benchmark.py
+'''
+
+import argparse
+import os
+import pickle
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import typing as T
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def generate_project(srcdir: str, targets: int) -> None:
+    os.makedirs(srcdir)
+    with open(os.path.join(srcdir, 'meson.build'), 'w', encoding='utf-8') as f:
+        f.write("project('benchmark', 'c')\n\n")
+        f.write(f"foreach i : range({targets})\n")
+        f.write("  exe = executable('exe@0@'.format(i), 'main.c', c_args : ['-DN=@0@'.format(i)])\n")
+        f.write("  test('test@0@'.format(i), exe)\n")
+        f.write("endforeach\n")
+    with open(os.path.join(srcdir, 'main.c'), 'w', encoding='utf-8') as f:
+        f.write('int main(void) { return 0; }\n')
+
+def best_time(func: T.Callable[[], object], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n', 1)[0])
+    parser.add_argument('--source', default=ROOT,
+                        help='Meson source tree to benchmark (default: this one)')
+    parser.add_argument('--targets', type=int, default=2000,
+                        help='number of executables of the project (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='number of times to load the data (default: %(default)s)')
+    parser.add_argument('--keep', action='store_true',
+                        help='do not delete the generated project')
+    options = parser.parse_args()
+
+    source = os.path.abspath(options.source)
+    sys.path.insert(0, source)
+    from mesonbuild import build, coredata
+
+    workdir = tempfile.mkdtemp(prefix='meson-benchmark-')
+    try:
+        srcdir = os.path.join(workdir, 'src')
+        builddir = os.path.join(workdir, 'build')
+        generate_project(srcdir, options.targets)
+        subprocess.run([sys.executable, os.path.join(source, 'meson.py'), 'setup', srcdir, builddir],
+                       check=True, stdout=subprocess.DEVNULL)
+
+        # The same Build object, written with a single generic pickle
+        b = build.load(builddir)
+        b.environment.coredata = None
+        plain = os.path.join(workdir, 'build-pickle.dat')
+        with open(plain, 'wb') as f:
+            pickle.dump(b, f)
+        del b
+
+        def load_plain() -> None:
+            with open(plain, 'rb') as f:
+                pickle.load(f)
+
+        build_dat = os.path.join(builddir, 'meson-private', 'build.dat')
+        print(f'build.dat: {os.path.getsize(build_dat) / 1e6:.2f} MB, '
+              f'single pickle: {os.path.getsize(plain) / 1e6:.2f} MB')
+        results = [
+            ('single pickle.load()', load_plain),
+            ('build.load()', lambda: build.load(builddir)),
+            ('coredata.load()', lambda: coredata.load(builddir)),
+        ]
+        if hasattr(build, 'load_test_setups'):
+            results.append(('build.load_test_setups()', lambda: build.load_test_setups(builddir)))
+        for name, func in results:
+            print(f'{name}: {best_time(func, options.repeat) * 1000:.1f} ms')
+    finally:
+        if options.keep:
+            print(f'Project left in {workdir}')
+        else:
+            shutil.rmtree(workdir)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
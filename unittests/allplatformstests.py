@@ -12,6 +12,7 @@ import platform
 import pickle
 import zipfile, tarfile
 import sys
+import xml.etree.ElementTree
 from unittest import mock, SkipTest, skipIf, skipUnless
 from contextlib import contextmanager
 from glob import glob
@@ -651,6 +652,162 @@ class AllPlatformTests(BasePlatformTests):
         self.build()
         self.run_tests()
 
+    def test_test_schedule_duration(self):
+        testdir = os.path.join(self.unit_test_dir, '123 test scheduling')
+        self.init(testdir)
+        self.build()
+
+        def start_order() -> T.List[str]:
+            with open(os.path.join(self.logdir, 'testlog.json'), encoding='utf-8') as f:
+                results = [json.loads(line) for line in f]
+            return [r['name'] for r in sorted(results, key=lambda r: r['starttime'])]
+
+        # Without history, tests are started in order of definition
+        out = self._run(self.mtest_command + ['-j', '1'])
+        self.assertNotIn('Predicted duration', out)
+        self.assertEqual(start_order(), ['short', 'long', 'medium'])
+        self.assertPathExists(os.path.join(self.privatedir, 'test_durations.json'))
+
+        out = self._run(self.mtest_command + ['-j', '2'])
+        self.assertIn('Predicted duration', out)
+        self.assertEqual(start_order(), ['long', 'medium', 'short'])
+
+        self._run(self.mtest_command + ['-j', '2', '--schedule=definition'])
+        self.assertEqual(start_order(), ['short', 'long', 'medium'])
+
+    def test_test_shard(self):
+        testdir = os.path.join(self.common_test_dir, '217 test priorities')
+        self.init(testdir)
+        self.build()
+        names = {'priority 0', 'priority neg 10', 'priority 1000', 'priority 50'}
+
+        shards = [set(self._run(self.mtest_command + ['--no-rebuild', '--list', f'--shard={k}/3'],
+                                stderr=False).splitlines())
+                  for k in range(1, 4)]
+        self.assertEqual(set.union(*shards), names)
+        self.assertEqual(sum(len(s) for s in shards), len(names))
+
+        # Shards are balanced using the durations of a previous run
+        history = os.path.join(self.builddir, 'history.json')
+        with open(history, 'w', encoding='utf-8') as f:
+            for name, duration in [('priority 0', 10), ('priority neg 10', 1),
+                                   ('priority 1000', 1), ('priority 50', 8)]:
+                f.write(json.dumps({'name': name, 'duration': duration}) + '\n')
+        out = self._run(self.mtest_command + ['--no-rebuild', '--list', '--shard=1/2',
+                                              f'--shard-history={history}'], stderr=False)
+        self.assertEqual(out.splitlines(), ['priority 0'])
+
+        # The logs of all shards are merged into one report
+        logs = []
+        for k in range(1, 4):
+            self._run(self.mtest_command + [f'--shard={k}/3', f'--logbase=shard{k}'])
+            logs.append(os.path.join(self.logdir, f'shard{k}.json'))
+        self._run(self.mtest_command + ['--merge-logs'] + logs)
+        with open(os.path.join(self.logdir, 'testlog.json'), encoding='utf-8') as f:
+            self.assertEqual({json.loads(line)['name'] for line in f}, names)
+        junit = xml.etree.ElementTree.parse(os.path.join(self.logdir, 'testlog.junit.xml')).getroot()
+        self.assertEqual(junit.attrib['tests'], '4')
+        self.assertEqual(len(junit.findall('.//testcase')), 4)
+
+    def test_test_affected_by(self):
+        if self.backend is not Backend.ninja:
+            raise SkipTest(f'Header dependencies are only known with Ninja, not {self.backend.name}')
+        testdir = os.path.join(self.unit_test_dir, '124 affected tests')
+        srcdir = os.path.join(self.builddir, 'src')
+        shutil.copytree(testdir, srcdir)
+        git_init(srcdir)
+        self.new_builddir()
+        self.init(srcdir)
+
+        def affected(*args: str) -> T.List[str]:
+            out = self._run(self.mtest_command + ['--no-rebuild', '--list'] +
+                            [f'--affected-by={a}' for a in args], stderr=False)
+            return [l for l in out.splitlines() if not l.startswith(('WARNING', 'Build definition'))]
+
+        # Header dependencies are only known after a build
+        self.assertEqual(affected('lib.h'), ['a', 'b', 'c', 'script'])
+        self.build()
+        self.assertEqual(affected('lib.h'), ['a'])
+        self.assertEqual(affected('b.c'), ['b'])
+        self.assertEqual(affected(os.path.join(srcdir, 'check.py'), 'b.c'), ['b', 'script'])
+        self.assertEqual(affected('meson.build'), ['a', 'b', 'c', 'script'])
+        # Recorded in the depfile of a custom target
+        self.assertEqual(affected('data.txt'), ['c'])
+
+        out = self._run(self.mtest_command + ['--no-rebuild', '--affected-by=HEAD'])
+        self.assertIn('No tests affected by the changes.', out)
+        with open(os.path.join(srcdir, 'lib.c'), 'a', encoding='utf-8') as f:
+            f.write('\n')
+        self.assertEqual(affected('HEAD'), ['a'])
+
+    def test_test_failed_first(self):
+        testdir = os.path.join(self.unit_test_dir, '125 failed first')
+        self.init(testdir)
+        self.build()
+
+        def listed(*args: str) -> T.List[str]:
+            return self._run(self.mtest_command + ['--list'] + list(args), stderr=False).splitlines()
+
+        with mock.patch.dict(os.environ, {'FAILING_TEST': 'b'}):
+            self.assertFailedTestCount(1, self.mtest_command)
+        self.assertEqual(listed('--last-failed'), ['b'])
+        self.assertEqual(listed('--failed-first'), ['b', 'a', 'c'])
+
+        # Once the failure is fixed, all tests are run again
+        out = self._run(self.mtest_command + ['--last-failed'])
+        self.assertIn('Ok:                 1', out)
+        out = self._run(self.mtest_command + ['--last-failed'])
+        self.assertIn('No tests failed in the previous run', out)
+        self.assertIn('Ok:                 3', out)
+
+    def test_test_resources(self):
+        testdir = os.path.join(self.unit_test_dir, '125 failed first')
+        self.init(testdir)
+        self.build()
+
+        out = self._run(self.mtest_command + ['--report-top=2'])
+        with open(os.path.join(self.logdir, 'testlog.json'), encoding='utf-8') as f:
+            results = [json.loads(line) for line in f]
+        if not hasattr(os, 'wait4'):
+            self.assertIn('not available on this platform', out)
+            self.assertTrue(all('resources' not in r for r in results))
+            return
+
+        for r in results:
+            self.assertGreater(r['resources']['user_time'] + r['resources']['system_time'], 0)
+            self.assertGreater(r['resources']['max_rss'], 0)
+        self.assertIn('Top 2 tests by CPU time (user + system):', out)
+        self.assertIn('Top 2 tests by peak memory (max RSS):', out)
+        top = out.split('Top 2 tests by CPU time (user + system):\n', 1)[1].splitlines()[:3]
+        self.assertRegex(top[0], r'^ +[0-9.]+s  [abc]$')
+        self.assertRegex(top[1], r'^ +[0-9.]+s  [abc]$')
+        self.assertTrue(top[2].startswith('Top 2'))
+
+        junit = xml.etree.ElementTree.parse(os.path.join(self.logdir, 'testlog.junit.xml'))
+        for testcase in junit.iter('testcase'):
+            names = {p.get('name') for p in testcase.iter('property')}
+            self.assertIn('max_rss', names)
+            self.assertIn('user_time', names)
+
+    def test_test_bulk(self):
+        testdir = os.path.join(self.unit_test_dir, '125 failed first')
+        self.init(testdir)
+        self.build()
+
+        with mock.patch.dict(os.environ, {'FAILING_TEST': 'b'}):
+            with self.assertRaises(subprocess.CalledProcessError) as cm:
+                self._run(self.mtest_command + ['--bulk', '-j', '1'])
+        out = cm.exception.stdout
+        # Results of passing tests are batched, failures are printed as usual
+        self.assertRegex(out, r'1/3 a +OK')
+        self.assertRegex(out, r'2/3 b +FAIL')
+        self.assertRegex(out, r'3/3 c +OK')
+        self.assertIn('Fail:               1', out)
+        self.assertRegex(out, r'Time spent in tests: [0-9.]+s, harness overhead: [0-9.]+s of CPU time')
+
+        out = self._run(self.mtest_command + ['--bulk'])
+        self.assertIn('Ok:                 3', out)
+
     def test_testrepeat(self):
         testdir = os.path.join(self.common_test_dir, '206 tap tests')
         self.init(testdir)
@@ -725,6 +882,16 @@ class AllPlatformTests(BasePlatformTests):
             line_number += 1
         self.assertEqual(i, 100001)
 
+        # Output beyond the limit is only written to a separate file
+        self._run(self.mtest_command + ['--max-output-size=1'])
+        with open(os.path.join(self.logdir, 'testlog.json'), encoding='utf-8') as f:
+            result = next(r for r in map(json.loads, f) if r['name'] == 'dump-test')
+        self.assertLessEqual(len(result['stdout']), 1024 * 1024 + 200)
+        self.assertRegex(result['stdout'], r'^\[\d+ characters of output omitted')
+        self.assertIn('# Iteration 100000 to stdout', result['stdout'])
+        with open(result['stdout_file'], encoding='utf-8') as f:
+            self.assertEqual(sum(1 for line in f if '# Iteration' in line), 100000)
+
 
     def test_testsetups(self):
         if not shutil.which('valgrind'):
@@ -3272,6 +3439,8 @@ class AllPlatformTests(BasePlatformTests):
             ('workdir', (str, None)),
             ('priority', int),
             ('extra_paths', list),
+            ('cpus', int),
+            ('memory', int),
         ]
 
         buildoptions_keylist = [
@@ -3880,6 +4049,166 @@ class AllPlatformTests(BasePlatformTests):
         out = self.build()
         self.assertNotIn('Project configured', out)
 
+    def test_regen_skip_unchanged(self):
+        if self.backend is not Backend.ninja:
+            raise SkipTest(f'{self.backend.name!r} backend can\'t skip regeneration')
+        testdir = os.path.join(self.builddir, 'srctree')
+        shutil.copytree(os.path.join(self.common_test_dir, '1 trivial'), testdir)
+        builddir = os.path.join(self.builddir, '_build')
+        self.change_builddir(builddir)
+        meson_build = os.path.join(testdir, 'meson.build')
+
+        self.init(testdir, extra_args=['-Dregen_skip_unchanged=true'])
+        self.build()
+
+        # Touching the file or changing comments and blank lines does not
+        # regenerate
+        self.utime(meson_build)
+        out = self.build()
+        self.assertNotIn('The Meson build system', out)
+        self.assertIn('regeneration of build files is not needed', out)
+        with open(meson_build, 'a', encoding='utf-8') as f:
+            f.write('\n\n# Just a comment\n')
+        out = self.build()
+        self.assertNotIn('The Meson build system', out)
+        self.assertBuildIsNoop()
+
+        # A real change does
+        with open(meson_build, 'a', encoding='utf-8') as f:
+            f.write("message('changed')\n")
+        self.assertReconfiguredBuildIsNoop()
+
+    def test_backend_subninja(self):
+        if self.backend is not Backend.ninja:
+            raise SkipTest(f'{self.backend.name!r} backend does not use subninja files')
+        testdir = os.path.join(self.common_test_dir, '112 subdir subproject')
+        self.init(testdir, extra_args=['-Dbackend_subninja=true'])
+        shards = [os.path.join(self.privatedir, 'ninja', 'prog', 'build.ninja'),
+                  os.path.join(self.privatedir, 'ninja', 'subprojects', 'sub', 'build.ninja')]
+        with open(os.path.join(self.builddir, 'build.ninja'), encoding='utf-8') as f:
+            contents = f.read()
+        for s in shards:
+            self.assertPathExists(s)
+            self.assertIn('subninja ' + os.path.relpath(s, self.builddir).replace(os.sep, '/'), contents)
+        self.build()
+        self.run_tests()
+
+        # Unchanged subninja files are not rewritten
+        mtimes = [os.stat(s).st_mtime_ns for s in shards]
+        self.init(testdir, extra_args=['--reconfigure'])
+        self.assertBuildIsNoop()
+        self.assertEqual(mtimes, [os.stat(s).st_mtime_ns for s in shards])
+
+        self.setconf('-Dbackend_subninja=false')
+        self.build()
+        for s in shards:
+            self.assertPathDoesNotExist(s)
+
+    def test_ast_cache(self):
+        testdir = self.copy_srcdir(os.path.join(self.common_test_dir, '1 trivial'))
+        meson_build = os.path.join(testdir, 'meson.build')
+        cachedir = os.path.join(self.privatedir, 'ast-cache')
+        self.init(testdir)
+        self.assertEqual(len(os.listdir(cachedir)), 1)
+
+        # Cached ASTs are only used while the file is unchanged
+        with open(meson_build, 'a', encoding='utf-8') as f:
+            f.write("message('changed build file')\n")
+        out = self.init(testdir, extra_args=['--reconfigure'])
+        self.assertIn('changed build file', out)
+        self.assertEqual(len(os.listdir(cachedir)), 1)
+
+        # Files that trigger warnings while being parsed are not cached, so
+        # the warnings are printed on every reconfiguration
+        with open(meson_build, 'a', encoding='utf-8') as f:
+            f.write("return = 1\n")
+        for _ in range(2):
+            out = self.init(testdir, extra_args=['--reconfigure'])
+            self.assertIn("Identifier 'return' will become a reserved keyword", out)
+
+        # Entries of files that are not used anymore are removed by --clearcache
+        stale = os.path.join(cachedir, 'stale')
+        open(stale, 'wb').close()
+        self.init(testdir, extra_args=['--reconfigure'])
+        self.assertPathExists(stale)
+        self.init(testdir, extra_args=['--reconfigure', '--clearcache'])
+        self.assertPathDoesNotExist(stale)
+        os.makedirs(cachedir, exist_ok=True)
+        open(stale, 'wb').close()
+        self.setconf('--clearcache')
+        self.assertPathDoesNotExist(stale)
+
+    def test_ninja_shared_compile_args(self):
+        if self.backend is not Backend.ninja:
+            raise SkipTest(f'{self.backend.name!r} backend does not write build.ninja')
+        testdir = os.path.join(self.common_test_dir, '131 override options')
+        self.init(testdir)
+        with open(os.path.join(self.builddir, 'build.ninja'), encoding='utf-8') as f:
+            contents = f.read()
+        # The arguments common to all sources of a target are only written once
+        m = re.search(r'^(ARGS_c_notunity\w*) = (.*)$', contents, re.MULTILINE)
+        self.assertIsNotNone(m, msg=contents)
+        var, args = m.groups()
+        self.assertEqual(contents.count(args), 1)
+        self.assertEqual(contents.count(f' ARGS = ${var}\n'), 2)
+        # Ninja expands them for each source
+        compdb = self.get_compdb()
+        for f in ('three.c', 'four.c'):
+            cmd = [c['command'] for c in compdb if c['file'].endswith(f)][0]
+            self.assertIn(args.replace('$ ', ' '), cmd)
+        self.build()
+
+    def test_regen_reuses_program_versions(self):
+        testdir = os.path.join(self.builddir, 'srctree')
+        os.makedirs(testdir)
+        counter = os.path.join(self.builddir, 'probes.txt')
+        tool = os.path.join(testdir, 'tool.py')
+        tool_template = textwrap.dedent('''\
+            #!/usr/bin/env python3
+            with open({!r}, 'a') as f:
+                f.write('x')
+            print('tool {}')
+            ''')
+        with open(tool, 'w', encoding='utf-8') as f:
+            f.write(tool_template.format(counter, '1.0'))
+        meson_build = os.path.join(testdir, 'meson.build')
+        with open(meson_build, 'w', encoding='utf-8') as f:
+            f.write(textwrap.dedent('''\
+                project('program versions')
+                prog = find_program('tool.py', version: '>=1.0')
+                message('tool version is ' + prog.version())
+                '''))
+        builddir = os.path.join(self.builddir, '_build')
+        self.change_builddir(builddir)
+
+        def probes() -> int:
+            with open(counter, encoding='utf-8') as f:
+                return len(f.read())
+
+        self.init(testdir)
+        self.assertEqual(probes(), 1)
+
+        # A real edit regenerates without probing the program again
+        with open(meson_build, 'a', encoding='utf-8') as f:
+            f.write("message('changed')\n")
+        out = self.build()
+        self.assertIn('The Meson build system', out)
+        self.assertIn('tool version is 1.0', out)
+        self.assertEqual(probes(), 1)
+
+        # Changing the program probes it again
+        with open(tool, 'w', encoding='utf-8') as f:
+            f.write(tool_template.format(counter, '2.0.1'))
+        out = self.build()
+        self.assertIn('tool version is 2.0.1', out)
+        self.assertEqual(probes(), 2)
+
+        # And so does clearing the cache
+        self.setconf('--clearcache')
+        out = self.build()
+        self.assertIn('tool version is 2.0.1', out)
+        self.assertEqual(probes(), 3)
+
     def _test_junit(self, case: str) -> None:
         try:
             import lxml.etree as et
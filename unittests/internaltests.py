@@ -13,6 +13,7 @@ import pickle
 import stat
 import subprocess
 import tempfile
+import textwrap
 import typing as T
 import unittest
 
@@ -124,6 +125,44 @@ class InternalTests(unittest.TestCase):
         a += ['-I.', '-I./tests2/']
         self.assertEqual(a, ['-I.', '-I./tests2/', '-I./tests/', '-I..'])
 
+    def test_compiler_args_class_scaling(self):
+        '''Adding arguments one at a time must not rescan the whole list each time.'''
+        from mesonbuild.arglist import CompilerArgs
+        cc = ClangCCompiler([], [], 'fake', MachineChoice.HOST, False, mock.Mock())
+        flush_pre_post = CompilerArgs.flush_pre_post
+        contains = CompilerArgs._contains
+        counts = {'rebuilds': 0, 'index builds': 0}
+
+        def counting_flush_pre_post(self: CompilerArgs) -> None:
+            container = self._container
+            flush_pre_post(self)
+            if self._container is not container:
+                counts['rebuilds'] += 1
+
+        def counting_contains(self: CompilerArgs, arg: str) -> bool:
+            if self._container_index is None:
+                counts['index builds'] += 1
+            return contains(self, arg)
+
+        def add_args(n: int) -> T.Dict[str, int]:
+            counts.update({k: 0 for k in counts})
+            a = cc.compiler_args()
+            for i in range(n):
+                a += [f'-I/inc/{i}', f'-DX{i}', f'-l{i}', '-pthread']
+            self.assertEqual(a._pre_post_index, set(a.pre) | set(a.post))
+            for i in range(n):
+                a.append_direct(f'-Wl,-foo{i}')
+            self.assertEqual(len(list(a)), 4 * n + 1)
+            return dict(counts)
+
+        with mock.patch.object(CompilerArgs, 'flush_pre_post', counting_flush_pre_post), \
+                mock.patch.object(CompilerArgs, '_contains', counting_contains):
+            small = add_args(100)
+            large = add_args(400)
+        # The list is rebuilt and indexed as many times for both sizes
+        self.assertEqual(small, {'rebuilds': 1, 'index builds': 1})
+        self.assertEqual(large, small)
+
     def test_compiler_args_class_d(self):
         d = DmdDCompiler([], 'fake', MachineChoice.HOST, 'info', 'arch')
         # check include order is kept when deduplicating
@@ -1678,6 +1717,7 @@ class InternalTests(unittest.TestCase):
         build = mock.Mock()
         build.environment = mock.Mock()
         build.environment.get_source_dir = mock.Mock(return_value='')
+        build.environment.get_scratch_dir = mock.Mock(return_value='')
         with mock.patch('mesonbuild.interpreter.Interpreter._redetect_machines', mock.Mock()), \
                 self.assertRaises(mesonbuild.mesonlib.MesonBugException):
             i = mesonbuild.interpreter.Interpreter(build)
@@ -1714,3 +1754,299 @@ class InternalTests(unittest.TestCase):
         for raw, expected in cases:
             with self.subTest(raw):
                 self.assertEqual(OptionKey.from_string(raw), expected)
+
+    def test_persistent_compiler_check_cache(self) -> None:
+        from mesonbuild.compilers.checkcache import CompilerCheckCache
+        from mesonbuild.compilers.compilers import CompileCheckMode, CompileResult
+        cc = GnuCCompiler(['gcc'], [], '1.0', False, MachineChoice.HOST, mock.Mock())
+        with tempfile.TemporaryDirectory() as d:
+            cache = CompilerCheckCache(d, 10 * 1024 * 1024)
+            key = cache.make_key(cc, 'int main(void) { return 0; }', ('-O2',), CompileCheckMode.COMPILE)
+            self.assertIsNone(cache.get(key))
+            cache.put(key, CompileResult('out', 'err', ['gcc', 'testfile.c'], 0))
+            res = cache.get(key)
+            self.assertIsNotNone(res)
+            self.assertTrue(res.cached)
+            self.assertEqual((res.stdout, res.stderr, res.command, res.returncode),
+                             ('out', 'err', ['gcc', 'testfile.c'], 0))
+
+            # Anything that can change the result must change the key
+            self.assertNotEqual(key, cache.make_key(cc, 'int main(void) { return 1; }', ('-O2',), CompileCheckMode.COMPILE))
+            self.assertNotEqual(key, cache.make_key(cc, 'int main(void) { return 0; }', (), CompileCheckMode.COMPILE))
+            self.assertNotEqual(key, cache.make_key(cc, 'int main(void) { return 0; }', ('-O2',), CompileCheckMode.LINK))
+            other = GnuCCompiler(['gcc'], [], '2.0', False, MachineChoice.HOST, mock.Mock())
+            self.assertNotEqual(key, cache.make_key(other, 'int main(void) { return 0; }', ('-O2',), CompileCheckMode.COMPILE))
+            # Files can change on disk, they are never cached
+            self.assertIsNone(cache.make_key(cc, mesonbuild.mesonlib.File.from_absolute_file('/a.c'), (), CompileCheckMode.COMPILE))
+
+            # Headers and libraries are found in search directories that are
+            # identified by their modification time
+            incdir = os.path.join(d, 'include')
+            os.mkdir(incdir)
+            for i, args in enumerate([(f'-I{incdir}',), ('-isystem', incdir), (f'-L{incdir}',)], start=1):
+                key = cache.make_key(cc, 'int main(void) { return 0; }', args, CompileCheckMode.LINK)
+                os.utime(incdir, ns=(i * 10**9, i * 10**9))
+                self.assertNotEqual(key, cache.make_key(cc, 'int main(void) { return 0; }', args, CompileCheckMode.LINK))
+
+            # --clearcache removes all entries, but not the files that the
+            # cache did not create
+            key = cache.make_key(cc, 'int main(void) { return 0; }', ('-O2',), CompileCheckMode.COMPILE)
+            stale = os.path.join(os.path.dirname(cache._path(key)), f'{key}.abc_123.tmp')
+            open(stale, 'w', encoding='utf-8').close()
+            others = [os.path.join(d, 'other.txt'), os.path.join(d, key[:2], 'other.json'),
+                      os.path.join(d, 'other', key + '.json')]
+            for f in others:
+                os.makedirs(os.path.dirname(f), exist_ok=True)
+                open(f, 'w', encoding='utf-8').close()
+            cache.clear()
+            self.assertIsNone(cache.get(key))
+            self.assertFalse(os.path.exists(stale))
+            for f in others:
+                self.assertTrue(os.path.exists(f), f)
+            cache.max_size = 0
+            cache.trim()
+            for f in others:
+                self.assertTrue(os.path.exists(f), f)
+
+        with tempfile.TemporaryDirectory() as d:
+            # Least recently used entries are evicted first
+            cache = CompilerCheckCache(d, 4096)
+            keys = [cache.make_key(cc, f'int x{i};', (), CompileCheckMode.COMPILE) for i in range(8)]
+            for i, k in enumerate(keys):
+                cache.put(k, CompileResult('x' * 1000, '', [], 0))
+                os.utime(cache._path(k), ns=(i * 10**9, i * 10**9))
+            cache.trim()
+            self.assertIsNone(cache.get(keys[0]))
+            self.assertIsNotNone(cache.get(keys[-1]))
+            cache.clear()
+            self.assertEqual(os.listdir(d), [])
+
+    def test_run_checks_output_order(self) -> None:
+        from mesonbuild.compilers.checkpool import run_checks
+        import time
+
+        def check(i: int) -> int:
+            # Make the first checks finish last
+            time.sleep((5 - i) * 0.01)
+            mesonbuild.mlog.debug(f'check {i}')
+            if i == 3:
+                raise MesonException('check 3 failed')
+            return i * 2
+
+        logfile = io.StringIO()
+        with mock.patch.object(mesonbuild.mlog._logger, 'log_file', logfile):
+            self.assertEqual(run_checks([lambda i=i: check(i) for i in range(3)]), [0, 2, 4])
+            self.assertEqual(logfile.getvalue().split(), ['check', '0', 'check', '1', 'check', '2'])
+
+            logfile.truncate(0)
+            logfile.seek(0)
+            with self.assertRaises(MesonException):
+                run_checks([lambda i=i: check(i) for i in range(5)])
+            self.assertEqual(logfile.getvalue().split(), ['check', '0', 'check', '1', 'check', '2', 'check', '3'])
+
+    def test_has_each_argument_bisects(self) -> None:
+        cc = ClangCCompiler([], [], 'fake', MachineChoice.HOST, False, mock.Mock())
+        supported = {'-Wall', '-Wextra', '-Wshadow', '-Wformat=2', '-Wcast-align'}
+        calls: T.List[T.List[str]] = []
+
+        def has_multi_arguments(args: T.List[str], env: T.Any) -> T.Tuple[bool, bool]:
+            calls.append(args)
+            return all(a in supported for a in args), False
+
+        args = ['-Wall', '-Wextra', '-Wshadow', '-Wformat=2', '-Wcast-align']
+        with mock.patch.object(cc, 'has_multi_arguments', has_multi_arguments):
+            self.assertEqual(cc.has_each_argument(args, mock.Mock()), [(True, False)] * 5)
+            self.assertEqual(calls, [args])
+
+            # A single unsupported argument is found in a logarithmic number of checks
+            calls.clear()
+            supported.update(f'-Wgood{i}' for i in range(10))
+            args = args + [f'-Wgood{i}' for i in range(10)] + ['-Wbogus']
+            self.assertEqual([r for r, _ in cc.has_each_argument(args, mock.Mock())],
+                             [True] * 15 + [False])
+            self.assertEqual(len(calls), 9)
+            self.assertEqual(cc.has_each_argument([], mock.Mock()), [])
+
+    def test_test_resources(self) -> None:
+        from mesonbuild.mtest import TestResources
+        import asyncio
+
+        async def run(tests: T.List[T.Tuple[str, int, int]]) -> T.List[str]:
+            resources = TestResources(4, 1000)
+            events: T.List[str] = []
+
+            async def run_test(name: str, cpus: int, memory: int) -> None:
+                cpus, memory = resources.clamp(cpus, memory)
+                await resources.acquire(cpus, memory)
+                try:
+                    events.append(f'start {name}')
+                    await asyncio.sleep(0.01)
+                    events.append(f'end {name}')
+                finally:
+                    resources.release(cpus, memory)
+
+            await asyncio.gather(*(run_test(*t) for t in tests))
+            self.assertEqual((resources.cpus, resources.memory), (4, 1000))
+            return events
+
+        # Two tests with 2 CPUs each fill the machine, the third one waits
+        events = asyncio.run(run([('a', 2, 0), ('b', 2, 0), ('c', 1, 0)]))
+        self.assertEqual(events[:2], ['start a', 'start b'])
+        self.assertLess(events.index('end a'), events.index('start c'))
+
+        # Memory is reserved too, and oversized requests run alone
+        events = asyncio.run(run([('a', 1, 600), ('b', 1, 600), ('c', 8, 5000)]))
+        self.assertEqual(events, ['start a', 'end a', 'start b', 'end b', 'start c', 'end c'])
+
+        # A test needing many CPUs is not overtaken by the tests after it
+        events = asyncio.run(run([('a', 1, 0), ('big', 4, 0), ('c', 1, 0)]))
+        self.assertEqual(events, ['start a', 'end a', 'start big', 'end big', 'start c', 'end c'])
+
+    def test_output_collector(self) -> None:
+        from mesonbuild.mtest import OutputCollector
+
+        with tempfile.TemporaryDirectory() as d:
+            spool = os.path.join(d, 'output', 'test.stdout.txt')
+            output = OutputCollector(100, spool)
+            lines = [f'line {i:3}\n' for i in range(200)]
+            for line in lines:
+                output.append(line)
+                self.assertLessEqual(output.size, 100)
+            output.close()
+
+            value = output.getvalue()
+            self.assertEqual(value.splitlines()[0], f'[{9 * 200 - output.size} characters of output omitted, see {spool}]')
+            self.assertTrue(value.endswith('line 199\n'))
+            with open(spool, encoding='utf-8') as f:
+                self.assertEqual(f.read(), ''.join(lines))
+
+        output = OutputCollector(0)
+        for line in lines:
+            output.append(line)
+        self.assertEqual(output.getvalue(), ''.join(lines))
+
+    def test_log_writer(self) -> None:
+        from mesonbuild.mtest import LogWriter
+
+        results: T.List[int] = []
+        writer = LogWriter('test')
+        for i in range(2000):
+            writer.submit(lambda i=i: results.append(i))
+        writer.close()
+        self.assertEqual(results, list(range(2000)))
+
+        def fail() -> None:
+            raise OSError('disk full')
+
+        writer = LogWriter('test')
+        writer.submit(fail)
+        writer.submit(lambda: results.append(-1))
+        with self.assertRaisesRegex(OSError, 'disk full'):
+            writer.close()
+        self.assertEqual(results[-1], 1999)
+
+    def test_lexer(self) -> None:
+        from mesonbuild.mparser import Lexer, ParseException
+
+        def lex(code: str) -> T.List[T.Tuple[str, int, int, str]]:
+            return [(t.tid, t.lineno, t.colno, t.value) for t in Lexer(code).lex('meson.build')]
+
+        code = textwrap.dedent('''\
+            foo = f'@x@' + '\\'' # comment
+            bar += [0x1F, 0b10,
+              010 >= 2 ? true : x.y()] \\
+              != {'a': 1}
+            ''')
+        code += "s = not '''a\nb'''"
+        self.assertEqual(lex(code), [
+            ('id', 1, 0, 'foo'), ('whitespace', 1, 3, ' '), ('assign', 1, 4, '='),
+            ('whitespace', 1, 5, ' '), ('fstring', 1, 6, '@x@'), ('whitespace', 1, 12, ' '),
+            ('plus', 1, 13, '+'), ('whitespace', 1, 14, ' '), ('string', 1, 15, "\\'"),
+            ('whitespace', 1, 19, ' '), ('comment', 1, 20, '# comment'), ('eol', 1, 29, '\n'),
+            ('id', 2, 0, 'bar'), ('whitespace', 2, 3, ' '), ('plusassign', 2, 4, '+='),
+            ('whitespace', 2, 6, ' '), ('lbracket', 2, 7, '['), ('number', 2, 8, '0x1F'),
+            ('comma', 2, 12, ','), ('whitespace', 2, 13, ' '), ('number', 2, 14, '0b10'),
+            ('comma', 2, 18, ','), ('whitespace', 2, 19, '\n'), ('whitespace', 3, 0, '  '),
+            ('number', 3, 2, '0'), ('number', 3, 3, '10'), ('whitespace', 3, 5, ' '),
+            ('ge', 3, 6, '>='), ('whitespace', 3, 8, ' '), ('number', 3, 9, '2'),
+            ('whitespace', 3, 10, ' '), ('questionmark', 3, 11, '?'), ('whitespace', 3, 12, ' '),
+            ('true', 3, 13, 'true'), ('whitespace', 3, 17, ' '), ('colon', 3, 18, ':'),
+            ('whitespace', 3, 19, ' '), ('id', 3, 20, 'x'), ('dot', 3, 21, '.'),
+            ('id', 3, 22, 'y'), ('lparen', 3, 23, '('), ('rparen', 3, 24, ')'),
+            ('rbracket', 3, 25, ']'), ('whitespace', 3, 26, ' '), ('whitespace', 3, 27, '\\\n'),
+            ('whitespace', 4, 0, '  '), ('nequal', 4, 2, '!='), ('whitespace', 4, 4, ' '),
+            ('lcurl', 4, 5, '{'), ('string', 4, 6, 'a'), ('colon', 4, 9, ':'),
+            ('whitespace', 4, 10, ' '), ('number', 4, 11, '1'), ('rcurl', 4, 12, '}'),
+            ('eol', 4, 13, '\n'),
+            ('id', 5, 0, 's'), ('whitespace', 5, 1, ' '), ('assign', 5, 2, '='),
+            ('whitespace', 5, 3, ' '), ('not', 5, 4, 'not'), ('whitespace', 5, 7, ' '),
+            ('multiline_string', 5, 8, 'a\nb'),
+        ])
+
+        with self.assertRaisesRegex(ParseException, 'Double quotes are not supported') as cm:
+            lex('x = 1\ny = "a"\n')
+        self.assertEqual((cm.exception.lineno, cm.exception.colno), (2, 4))
+        # The column is the one of the last token that was matched
+        with self.assertRaisesRegex(ParseException, 'lexer') as cm:
+            lex('x = 1\ny = $\n')
+        self.assertEqual((cm.exception.lineno, cm.exception.colno), (2, 3))
+
+    def test_object_class_tables(self) -> None:
+        from mesonbuild.interpreter.primitives import IntegerHolder, OptionString, OptionStringHolder
+        from mesonbuild.interpreterbase import MesonOperator
+
+        class MockInterpreter:
+            def __init__(self) -> None:
+                self.subproject = ''
+                self.environment = None
+
+        interp = MockInterpreter()
+        self.assertEqual(IntegerHolder(3, interp).operator_call(MesonOperator.PLUS, 4), 7)
+        self.assertEqual(IntegerHolder(3, interp).method_call('to_string', [], {'fill': 2}), '03')
+        with self.assertRaises(InvalidArguments):
+            IntegerHolder(3, interp).operator_call(MesonOperator.PLUS, 'a')
+        # Subclasses override the methods named in the tables of their base
+        # classes, and the tables of the base classes are merged
+        ret = OptionStringHolder(OptionString('a', 'opt'), interp).operator_call(MesonOperator.DIV, 'b')
+        self.assertEqual((ret, ret.optname), ('a/b', 'opt/b'))
+        self.assertIn(MesonOperator.NOT_EQUALS, OptionStringHolder.TRIVIAL_OPERATORS)
+        # The tables of each object take precedence over those of the class
+        holder = IntegerHolder(3, interp)
+        holder.trivial_operators[MesonOperator.PLUS] = (int, lambda x: 42)
+        self.assertEqual(holder.operator_call(MesonOperator.PLUS, 4), 42)
+        self.assertEqual(IntegerHolder(3, interp).operator_call(MesonOperator.PLUS, 4), 7)
+
+    def test_pickle_sections(self) -> None:
+        from mesonbuild.build import TestSetup
+        from mesonbuild.mesonlib import pickle_dump_sections, pickle_load_section
+        with tempfile.TemporaryDirectory() as d:
+            filename = os.path.join(d, 'data.dat')
+            pickle_dump_sections(filename, {'first': [1, 2], 'second': {'a': 'b'}})
+            self.assertEqual(pickle_load_section(filename, 'second', 'Test data', dict), {'a': 'b'})
+            self.assertEqual(pickle_load_section(filename, 'first', 'Test data', list), [1, 2])
+            with self.assertRaisesRegex(MesonException, 'is corrupted'):
+                pickle_load_section(filename, 'third', 'Test data', list)
+            with self.assertRaisesRegex(MesonException, 'is corrupted'):
+                pickle_load_section(filename, 'first', 'Test data', dict)
+
+            # Truncated files
+            with open(filename, 'rb') as f:
+                data = f.read()
+            for size in (len(data) - 1, 20, 3):
+                with open(filename, 'wb') as f:
+                    f.write(data[:size])
+                with self.assertRaisesRegex(MesonException, 'is corrupted'):
+                    pickle_load_section(filename, 'first', 'Test data', list)
+
+            # Files that hold a single pickled object
+            obj = TestSetup([], False, 1, None, [])
+            obj.version = '0.47.0'
+            with open(filename, 'wb') as f:
+                pickle.dump(obj, f)
+            with self.assertRaises(coredata.MesonVersionMismatchException):
+                pickle_load_section(filename, 'first', 'Test data', list)
+            obj.version = coredata.version
+            with open(filename, 'wb') as f:
+                pickle.dump(obj, f)
+            with self.assertRaisesRegex(MesonException, 'is corrupted'):
+                pickle_load_section(filename, 'first', 'Test data', list)
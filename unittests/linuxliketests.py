@@ -1112,6 +1112,37 @@ class LinuxlikeTests(BasePlatformTests):
         link_args = ['-L' + libpath.as_posix(), '-lrelativepath']
         self.assertEqual(relative_path_dep.get_link_args(), link_args)
 
+    @skipIfNoPkgconfig
+    def test_pkgconfig_persistent_cache(self):
+        pkg_dir = os.path.join(self.builddir, 'pkgconfig')
+        os.mkdir(pkg_dir)
+        pcfile = os.path.join(pkg_dir, 'cached.pc')
+
+        def write_pc(version: str) -> None:
+            with open(pcfile, 'w', encoding='utf-8') as f:
+                f.write(f'Name: cached\nDescription: cached\nVersion: {version}\nCflags: -DCACHED\n')
+
+        def get_version() -> T.Optional[str]:
+            # New process, only the persistent cache is left
+            PkgConfigCLI.call_cache.clear()
+            env = get_fake_env(self.builddir, self.builddir, self.prefix)
+            env.coredata.set_options({OptionKey('pkg_config_path'): pkg_dir}, subproject='')
+            return PkgConfigCLI(env, MachineChoice.HOST, silent=True).version('cached')
+
+        write_pc('1.0')
+        cachedir = os.path.join(self.builddir, 'cache')
+        with mock.patch.dict(os.environ, {'MESON_PKG_CONFIG_CACHE_DIR': cachedir}):
+            self.assertEqual(get_version(), '1.0')
+            with mock.patch('mesonbuild.dependencies.pkgconfig.Popen_safe_logged') as popen:
+                self.assertEqual(get_version(), '1.0')
+                popen.assert_not_called()
+            # Changing a .pc file invalidates the cache
+            write_pc('2.0')
+            st = os.stat(pcfile)
+            os.utime(pcfile, ns=(st.st_atime_ns, st.st_mtime_ns + 1000000000))
+            self.assertEqual(get_version(), '2.0')
+        PkgConfigCLI.call_cache.clear()
+
     @skipIfNoPkgconfig
     def test_pkgconfig_duplicate_path_entries(self):
         testdir = os.path.join(self.unit_test_dir, '111 pkgconfig duplicate path entries')
@@ -1522,6 +1553,37 @@ class LinuxlikeTests(BasePlatformTests):
         # TODO should someday be explicit about build platform only here
         self.init(testdir, override_envvars=env)
 
+    def test_cross_compute_int_single_compile(self):
+        '''
+        When cross compiling, compute_int() reads the value back from an
+        object file instead of searching for it, one compile per check.
+        '''
+        testdir = os.path.join(self.common_test_dir, '134 compute int')
+        crossfile = tempfile.NamedTemporaryFile(mode='w', encoding='utf-8')
+        crossfile.write(textwrap.dedent(f'''\
+            [binaries]
+            c = '{shutil.which('cc')}'
+            cpp = '{shutil.which('c++')}'
+
+            [properties]
+            needs_exe_wrapper = true
+
+            [host_machine]
+            system = 'linux'
+            cpu_family = 'x86_64'
+            cpu = 'x86_64'
+            endian = 'little'
+            '''))
+        crossfile.flush()
+        self.meson_cross_files = [crossfile.name]
+        self.init(testdir)
+        log = self.get_meson_log_raw()
+        self.assertIn('Extracted value of INT_MAX from object file: 2147483647', log)
+        self.assertIn('Extracted value of INT_MIN from object file: -2147483648', log)
+        # 9 checks and the compiler sanity checks; searching for the values
+        # used to take well over a hundred compilations
+        self.assertLess(len(self.get_meson_log_compiler_checks()), 20)
+
     @skipIfNoPkgconfig
     def test_static_link(self):
         if is_cygwin():
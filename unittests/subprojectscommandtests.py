@@ -9,7 +9,7 @@ from pathlib import Path
 import typing as T
 
 from mesonbuild.mesonlib import (
-    version_compare, git, search_version
+    version_compare, git, search_version, is_windows
 )
 
 
@@ -298,3 +298,54 @@ class SubprojectsCommandTests(BasePlatformTests):
         self.assertFalse(Path(self.subprojects_dir / 'sub_file').exists())
         self.assertFalse(Path(self.subprojects_dir / 'sub_git').exists())
         self.assertFalse(Path(self.subprojects_dir / 'redirect.wrap').exists())
+
+    def test_setup_wrap_prefetch(self):
+        self._git_create_remote_repo('sub1')
+        self._wrap_create_git('sub1')
+        self._git_create_remote_repo('sub2')
+        self._wrap_create_git('sub2')
+        with open(str(self.project_dir / 'meson.build'), 'w', encoding='utf-8') as f:
+            f.write("project('dummy')\nsubproject('sub1')\n")
+
+        # Without prefetch only the subproject that is used gets downloaded
+        self._run(self.setup_command + [str(self.root_dir / 'build1'), str(self.project_dir)])
+        self.assertTrue((self.subprojects_dir / 'sub1').is_dir())
+        self.assertFalse((self.subprojects_dir / 'sub2').exists())
+
+        self._subprojects_cmd(['purge', '--confirm'])
+        out = self._run(self.setup_command + ['-Dwrap_prefetch=true', str(self.root_dir / 'build2'), str(self.project_dir)])
+        self.assertIn('Downloading 2 subprojects in parallel', out)
+        self.assertTrue((self.subprojects_dir / 'sub1').is_dir())
+        self.assertTrue((self.subprojects_dir / 'sub2').is_dir())
+
+        # A subproject that cannot be downloaded is reported, but it does not
+        # fail the setup as long as it is not used.
+        self._wrap_create_git('sub3')
+        self._subprojects_cmd(['purge', '--confirm'])
+        out = self._run(self.setup_command + ['-Dwrap_prefetch=true', str(self.root_dir / 'build3'), str(self.project_dir)])
+        self.assertIn('Downloading 3 subprojects in parallel', out)
+        self.assertIn('Could not download subproject sub3: ', out)
+        self.assertTrue((self.subprojects_dir / 'sub1').is_dir())
+        self.assertTrue((self.subprojects_dir / 'sub2').is_dir())
+        self.assertFalse((self.subprojects_dir / 'sub3').exists())
+
+        # Mercurial is run directly, its failures must not fail the setup either
+        if not is_windows():
+            bindir = self.root_dir / 'bin'
+            bindir.mkdir()
+            hg = bindir / 'hg'
+            hg.write_text('#!/bin/sh\nexit 1\n', encoding='utf-8')
+            hg.chmod(0o755)
+            with open(str(self.subprojects_dir / 'sub4.wrap'), 'w', encoding='utf-8') as f:
+                f.write(textwrap.dedent(
+                    f'''
+                    [wrap-hg]
+                    url={self.root_dir / 'sub4'}
+                    revision=tip
+                    '''))
+            self._subprojects_cmd(['purge', '--confirm'])
+            out = self._run(self.setup_command + ['-Dwrap_prefetch=true', str(self.root_dir / 'build4'), str(self.project_dir)],
+                            override_envvars={'PATH': f'{bindir}{os.pathsep}{os.environ["PATH"]}'})
+            self.assertIn('Downloading 4 subprojects in parallel', out)
+            self.assertIn('Could not download subproject sub4: ', out)
+            self.assertTrue((self.subprojects_dir / 'sub1').is_dir())